@@ -0,0 +1,84 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Harness
+
+Timing and memory measurement shared by every benchmark, plus the
+registry the suite adds its benchmarks to.
+"""
+
+import gc
+import time
+import tracemalloc
+
+# name → Benchmark, filled in by the @benchmark decorator
+REGISTRY = {}
+
+class Benchmark:
+    """One named hot path and how many times to run it per measurement"""
+
+    def __init__(self, name, prepare, iterations):
+        """
+        Args:
+            name: Unique benchmark name used in the results file
+            prepare: prepare(world) → zero-argument callable doing one operation
+            iterations: Operations to time (scaled by the runner)
+        """
+        self.name = name
+        self.prepare = prepare
+        self.iterations = iterations
+
+def benchmark(name, iterations):
+    """Decorator registering prepare(world) as a benchmark"""
+    def register(prepare):
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark '{name}' is registered twice")
+        REGISTRY[name] = Benchmark(name, prepare, iterations)
+        return prepare
+    return register
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def measure(operation, iterations, warmup=1):
+    """
+    Time operation and record its peak memory
+
+    Each call is timed separately so latency percentiles are real per-op
+    numbers. Peak memory comes from one extra call under tracemalloc, so
+    tracing doesn't slow down the timed calls.
+
+    Returns: Dictionary with ops_per_sec, p50_ms, p99_ms, mean_ms,
+             peak_memory_kb and iterations
+    """
+    for call in range(warmup):
+        operation()
+    gc.collect()
+    timings = []
+    clock = time.perf_counter_ns
+    for call in range(iterations):
+        start = clock()
+        operation()
+        timings.append(clock() - start)
+    total_ns = sum(timings)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / (total_ns / 1e9), 3) if total_ns else 0.0,
+        "mean_ms": round(total_ns / iterations / 1e6, 6),
+        "p50_ms": round(percentile(timings, 0.50) / 1e6, 6),
+        "p99_ms": round(percentile(timings, 0.99) / 1e6, 6),
+        "peak_memory_kb": round(peak / 1024, 1)
+    }
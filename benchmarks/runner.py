@@ -0,0 +1,167 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Runner
+
+Runs the benchmark suite against a generated world and compares results.
+
+Usage:
+    python -m benchmarks.runner run --scale small --output bench_results.json
+    python -m benchmarks.runner compare baseline.json bench_results.json --threshold 0.10
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+import datetime
+
+# Allow "python benchmarks/runner.py" as well as "python -m benchmarks.runner"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import world_generator
+from benchmarks.harness import REGISTRY, measure
+import benchmarks.suite
+
+# World sizes; "full" matches the production-sized numbers we care about
+SCALES = {
+    "tiny": {"quests": 1000, "items": 100, "characters": 100, "iteration_factor": 0.05},
+    "small": {"quests": 20000, "items": 2000, "characters": 2000, "iteration_factor": 0.25},
+    "full": {"quests": 200000, "items": 20000, "characters": 100000, "iteration_factor": 1.0}
+}
+
+class World:
+    """Paths and loaded data for one generated world"""
+
+    def __init__(self, root, scale, seed):
+        """Generate the world files under root and load the catalogs"""
+        settings = SCALES[scale]
+        self.root = root
+        paths = world_generator.generate_world(
+            root, settings["quests"], settings["items"], settings["characters"], seed
+        )
+        self.quests_file = paths["quests"]
+        self.items_file = paths["items"]
+        self.save_directory = paths["save_games"]
+        self.quests = game_data.load_quests(self.quests_file, use_cache=False)
+        self.items = game_data.load_items(self.items_file, use_cache=False)
+        self.character_names = [f"Hero{number:06d}" for number in range(settings["characters"])]
+
+# ============================================================================
+# RUN
+# ============================================================================
+
+def run_benchmarks(scale="small", seed=163, only=None, world_directory=None):
+    """
+    Generate a world and run every (or only the named) benchmark
+
+    Returns: Results dictionary ready to be written as JSON
+    """
+    names = sorted(REGISTRY)
+    if only:
+        unknown = [name for name in only if name not in REGISTRY]
+        if unknown:
+            raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+        names = [name for name in names if name in only]
+
+    root = world_directory or tempfile.mkdtemp(prefix="quest_bench_")
+    try:
+        world = World(root, scale, seed)
+        factor = SCALES[scale]["iteration_factor"]
+        results = {}
+        for name in names:
+            bench = REGISTRY[name]
+            operation = bench.prepare(world)
+            iterations = max(1, int(bench.iterations * factor))
+            results[name] = measure(operation, iterations)
+            print(f"{name:45} {results[name]['ops_per_sec']:>14,.1f} ops/s   p50 {results[name]['p50_ms']:.4f} ms   p99 {results[name]['p99_ms']:.4f} ms")
+    finally:
+        if world_directory is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "meta": {
+            "scale": scale,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds")
+        },
+        "results": results
+    }
+
+# ============================================================================
+# COMPARE
+# ============================================================================
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Find benchmarks that got slower than the baseline by more than threshold
+
+    A benchmark regresses if its ops/sec fell, or its p99 latency rose, by
+    more than threshold (0.10 = 10%).
+
+    Returns: List of (name, metric, baseline_value, current_value) regressions
+    """
+    regressions = []
+    for name, current_result in sorted(current["results"].items()):
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            continue
+        if current_result["ops_per_sec"] < baseline_result["ops_per_sec"] * (1 - threshold):
+            regressions.append((name, "ops_per_sec", baseline_result["ops_per_sec"], current_result["ops_per_sec"]))
+        if current_result["p99_ms"] > baseline_result["p99_ms"] * (1 + threshold):
+            regressions.append((name, "p99_ms", baseline_result["p99_ms"], current_result["p99_ms"]))
+    return regressions
+
+def load_results(filename):
+    """Read a results JSON file"""
+    with open(filename) as file:
+        return json.load(file)
+
+def main(argv=None):
+    """Command line entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Quest Chronicles benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write JSON results")
+    run_parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    run_parser.add_argument("--seed", type=int, default=163)
+    run_parser.add_argument("--only", nargs="*", help="benchmark names to run (default: all)")
+    run_parser.add_argument("--output", default="bench_results.json")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    commands.add_parser("list", help="list benchmark names")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for name in sorted(REGISTRY):
+            print(name)
+        return 0
+    if args.command == "run":
+        results = run_benchmarks(args.scale, args.seed, args.only)
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    if baseline["meta"].get("scale") != current["meta"].get("scale"):
+        print(f"Warning: comparing scale '{current['meta'].get('scale')}' against baseline scale '{baseline['meta'].get('scale')}'")
+    regressions = compare_results(baseline, current, args.threshold)
+    for name, metric, baseline_value, current_value in regressions:
+        print(f"REGRESSION {name}: {metric} {baseline_value} → {current_value}")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Suite
+
+One benchmark per subsystem hot path. Each prepare(world) function does
+its setup up front and returns the single operation to be timed.
+"""
+
+import io
+import os
+import random
+import builtins
+import contextlib
+
+import game_data
+import character_manager
+import character_pool
+import save_pack
+import inventory_system
+import quest_handler
+import combat_system
+from benchmarks.harness import benchmark
+
+# ============================================================================
+# GAME DATA
+# ============================================================================
+
+@benchmark("game_data.load_quests", iterations=3)
+def bench_load_quests(world):
+    """Parse the generated quest file from text"""
+    return lambda: game_data.load_quests(world.quests_file, use_cache=False)
+
+@benchmark("game_data.load_quests_cached", iterations=10)
+def bench_load_quests_cached(world):
+    """Load quests through a warm compiled cache"""
+    game_data.load_quests(world.quests_file)
+    return lambda: game_data.load_quests(world.quests_file)
+
+@benchmark("game_data.load_items", iterations=10)
+def bench_load_items(world):
+    """Parse the generated item file from text"""
+    return lambda: game_data.load_items(world.items_file, use_cache=False)
+
+# ============================================================================
+# CHARACTER PERSISTENCE
+# ============================================================================
+
+def _round_trip(world, save_format):
+    """Save a character in save_format and load it straight back"""
+    save_directory = os.path.join(world.root, f"round_trip_{save_format}")
+    character = character_manager.load_character(world.character_names[0], world.save_directory)
+    character["name"] = "RoundTrip"
+
+    def round_trip():
+        character_manager.save_character(character, save_directory, save_format)
+        character_manager.load_character("RoundTrip", save_directory)
+    return round_trip
+
+@benchmark("character_manager.save_load_round_trip", iterations=500)
+def bench_save_load_round_trip(world):
+    """Text save/load round trip"""
+    return _round_trip(world, "text")
+
+@benchmark("character_manager.save_load_round_trip_binary", iterations=500)
+def bench_save_load_round_trip_binary(world):
+    """Binary save/load round trip"""
+    return _round_trip(world, "binary")
+
+@benchmark("character_manager.load_character_cached", iterations=5000)
+def bench_load_character_cached(world):
+    """Load the same unchanged character repeatedly (cache hits)"""
+    name = world.character_names[0]
+    return lambda: character_manager.load_character(name, world.save_directory)
+
+@benchmark("character_manager.journaled_action", iterations=5000)
+def bench_journaled_action(world):
+    """Persist one gold change through the journal instead of a full save"""
+    save_directory = os.path.join(world.root, "journal_saves")
+    character = character_manager.load_character(world.character_names[0], world.save_directory)
+    character["name"] = "Journaled"
+    character_manager.enable_journal(character, save_directory, background=False)
+    return lambda: character_manager.add_gold(character, 1)
+
+@benchmark("character_manager.peek_character", iterations=2000)
+def bench_peek_character(world):
+    """Read a character's summary fields without parsing the whole save"""
+    names = world.character_names
+    position = iter(range(10 ** 9))
+    return lambda: character_manager.peek_character(names[next(position) % len(names)], world.save_directory)
+
+@benchmark("character_manager.rebuild_manifest", iterations=3)
+def bench_rebuild_manifest(world):
+    """Summarize every save in the generated save directory from scratch"""
+    return lambda: character_manager.rebuild_manifest(world.save_directory)
+
+@benchmark("character_manager.list_saved_characters", iterations=5)
+def bench_list_saved_characters(world):
+    """List every save in the generated save directory"""
+    return lambda: character_manager.list_saved_characters(world.save_directory)
+
+@benchmark("character_manager.list_character_summaries", iterations=5)
+def bench_list_character_summaries(world):
+    """Filter saved characters by class and level from the manifest"""
+    def list_summaries():
+        character_manager._manifest_cache.clear()
+        character_manager.list_character_summaries(world.save_directory, "Mage", 10, 20)
+    return list_summaries
+
+@benchmark("character_manager.load_characters_bulk", iterations=3)
+def bench_load_characters_bulk(world):
+    """Load every generated character with the thread-pool bulk loader"""
+    def load_all():
+        character_manager.character_cache.clear()
+        character_manager.load_characters(world.character_names, world.save_directory)
+    return load_all
+
+@benchmark("character_manager.load_characters_serial", iterations=3)
+def bench_load_characters_serial(world):
+    """Load every generated character one load_character call at a time"""
+    def load_all():
+        character_manager.character_cache.clear()
+        for name in world.character_names:
+            character_manager.load_character(name, world.save_directory)
+    return load_all
+
+@benchmark("save_pack.load_character", iterations=5000)
+def bench_pack_load_character(world):
+    """Load one character out of a pack of every generated save"""
+    pack_path = os.path.join(world.root, "saves.pack")
+    if not os.path.exists(pack_path):
+        save_pack.pack_save_directory(world.save_directory, pack_path)
+    pack = save_pack.PackStorage(pack_path)
+    names = world.character_names
+    position = iter(range(10 ** 9))
+    return lambda: character_manager.load_character(names[next(position) % len(names)], storage=pack)
+
+# ============================================================================
+# CHARACTER POOL
+# ============================================================================
+
+def _all_characters(world):
+    """Every generated character, loaded once"""
+    return list(character_manager.load_characters(world.character_names, world.save_directory).succeeded.values())
+
+@benchmark("character_pool.heal_and_pay_everyone", iterations=20)
+def bench_pool_heal_and_pay_everyone(world):
+    """Heal every character and grant everyone XP as column operations"""
+    pool = character_pool.CharacterPool(_all_characters(world))
+    def heal_and_pay():
+        pool.heal_character(25)
+        pool.gain_experience(10)
+    return heal_and_pay
+
+@benchmark("character_pool.heal_and_pay_loop", iterations=20)
+def bench_pool_heal_and_pay_loop(world):
+    """The same event as a loop over the character dictionaries"""
+    characters = _all_characters(world)
+    def heal_and_pay():
+        for character in characters:
+            character_manager.heal_character(character, 25)
+            if character["health"] > 0:
+                character_manager.gain_experience(character, 10, announce=False)
+    return heal_and_pay
+
+# ============================================================================
+# QUESTS
+# ============================================================================
+
+@benchmark("quest_handler.get_available_quests", iterations=5)
+def bench_get_available_quests(world):
+    """Find available quests for a mid-level character in the big catalog"""
+    character = character_manager.create_character("QuestBench", "Rogue")
+    character["level"] = 10
+    return lambda: quest_handler.get_available_quests(character, world.quests)
+
+# ============================================================================
+# INVENTORY
+# ============================================================================
+
+@benchmark("inventory_system.full_inventory_ops", iterations=20000)
+def bench_full_inventory_ops(world):
+    """add/has/count/remove on an inventory one slot short of full"""
+    character = character_manager.create_character("InventoryBench", "Cleric")
+    item_ids = list(world.items)
+    character["inventory"] = [item_ids[slot % len(item_ids)] for slot in range(inventory_system.MAX_INVENTORY_SIZE - 1)]
+    new_item = item_ids[-1]
+
+    def inventory_ops():
+        inventory_system.add_item_to_inventory(character, new_item)
+        inventory_system.has_item(character, new_item)
+        inventory_system.count_item(character, new_item)
+        inventory_system.remove_item_from_inventory(character, new_item)
+    return inventory_ops
+
+# ============================================================================
+# COMBAT
+# ============================================================================
+
+@benchmark("combat_system.headless_battle", iterations=2000)
+def bench_headless_battle(world):
+    """
+    Fight a goblin to the end with scripted input and no console output
+
+    The player always picks a basic attack, and random is seeded so every
+    run fights the same battles.
+    """
+    random.seed(163)
+
+    def battle():
+        character = character_manager.create_character("CombatBench", "Warrior")
+        enemy = combat_system.create_enemy("goblin")
+        original_input = builtins.input
+        builtins.input = lambda prompt="": "1"
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                combat_system.SimpleBattle(character, enemy).start_battle()
+        finally:
+            builtins.input = original_input
+    return battle
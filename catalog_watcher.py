@@ -0,0 +1,205 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Watcher Module
+
+This module hot-reloads quest and item data while the game is running.
+It polls the data files with os.stat and, when one changes, re-parses only
+the blocks whose text changed, updating the live dictionaries in place.
+"""
+
+import os
+import hashlib
+import threading
+from collections import namedtuple
+
+import game_data
+from custom_exceptions import (
+    GameError,
+    InvalidDataFormatError,
+    MissingDataFileError,
+    CorruptedDataError
+)
+
+# IDs affected by one reload of one data file
+CatalogChanges = namedtuple("CatalogChanges", ["added", "removed", "changed"])
+
+# ============================================================================
+# WATCHED FILES
+# ============================================================================
+
+class WatchedFile:
+    """
+    One data file plus the live dictionary it feeds
+
+    Remembers the file's (size, mtime) and a digest of every block's text
+    so a reload can tell which records actually changed.
+    """
+
+    def __init__(self, filename, schema, records):
+        """Store what to watch; nothing is read until reload()"""
+        self.filename = filename
+        self.schema = schema
+        self.records = records
+        self.signature = None
+        self.block_digests = {}
+
+    def has_changed(self):
+        """
+        Check the file's size and mtime against the last reload
+
+        A missing file counts as unchanged so a half-finished deploy
+        doesn't empty the live catalog.
+        """
+        try:
+            file_stat = os.stat(self.filename)
+        except OSError:
+            return False
+        return (file_stat.st_size, file_stat.st_mtime_ns) != self.signature
+
+    def reload(self):
+        """
+        Re-read the file and apply only the blocks that changed
+
+        Everything is parsed before the live dictionary is touched, so a
+        bad edit raises and leaves the old data in place (the next poll
+        tries again).
+
+        Returns: CatalogChanges with sorted lists of ids
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        try:
+            file_stat = os.stat(self.filename)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"{self.schema.record_name.title()} file not found at: {self.filename}")
+        id_prefix = self.schema.id_key
+        new_digests = {}
+        updates = {}
+        try:
+            with open(self.filename, 'r') as file:
+                for block in game_data.iter_blocks(file):
+                    block_text = "\n".join(block)
+                    digest = hashlib.blake2b(block_text.encode(), digest_size=16).digest()
+                    record_id = _find_record_id(block, id_prefix)
+                    if record_id is not None and self.block_digests.get(record_id) == digest:
+                        if record_id in new_digests:
+                            raise InvalidDataFormatError(f"Duplicate {self.schema.record_name} id found: {record_id}")
+                        new_digests[record_id] = digest
+                        continue
+                    record_id, record_data = self.schema.build(block)
+                    if record_id in new_digests:
+                        raise InvalidDataFormatError(f"Duplicate {self.schema.record_name} id found: {record_id}")
+                    new_digests[record_id] = digest
+                    updates[record_id] = record_data
+        except IOError as e:
+            raise CorruptedDataError(f"Could not read {self.schema.record_name} file: {e}")
+
+        added = [record_id for record_id in updates if record_id not in self.block_digests]
+        changed = [record_id for record_id in updates if record_id in self.block_digests]
+        removed = [record_id for record_id in self.block_digests if record_id not in new_digests]
+        for record_id in removed:
+            self.records.pop(record_id, None)
+        self.records.update(updates)
+        self.block_digests = new_digests
+        self.signature = (file_stat.st_size, file_stat.st_mtime_ns)
+        return CatalogChanges(sorted(added), sorted(removed), sorted(changed))
+
+def _find_record_id(block, id_prefix):
+    """Return the id declared in a block's lines, or None if there isn't one"""
+    for line in block:
+        key, separator, value = line.partition(":")
+        if separator and key.strip() == id_prefix:
+            return value.strip()
+    return None
+
+# ============================================================================
+# CATALOG WATCHER
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keeps all_quests/all_items in step with the data files
+
+    Pass in the dictionaries the rest of the game already holds (for
+    example main.all_quests and main.all_items) and they are filled now
+    and updated in place on every poll().
+    """
+
+    def __init__(self, quests_file="data/quests.txt", items_file="data/items.txt", all_quests=None, all_items=None):
+        """Load both files into the live dictionaries"""
+        if all_quests is None:
+            all_quests = {}
+        if all_items is None:
+            all_items = {}
+        self.all_quests = all_quests
+        self.all_items = all_items
+        self.watched = {
+            "quests": WatchedFile(quests_file, game_data.QUEST_SCHEMA, all_quests),
+            "items": WatchedFile(items_file, game_data.ITEM_SCHEMA, all_items)
+        }
+        self._stop_event = threading.Event()
+        self._thread = None
+        for watched_file in self.watched.values():
+            watched_file.records.clear()
+            watched_file.reload()
+
+    def poll(self):
+        """
+        Stat the data files and reload any that changed
+
+        Returns: Dictionary {"quests"|"items": CatalogChanges} holding only
+                 the files that were reloaded (empty if nothing changed)
+        Raises: InvalidDataFormatError, CorruptedDataError from a bad edit,
+                MissingDataFileError if a file vanishes mid-poll
+        """
+        changes = {}
+        for name, watched_file in self.watched.items():
+            if watched_file.has_changed():
+                changes[name] = watched_file.reload()
+        return changes
+
+    def start(self, interval=2.0, on_change=None, on_error=None):
+        """
+        Poll in a background thread every interval seconds
+
+        on_change(changes) is called after each poll that reloaded
+        something, and on_error(error) when a reload fails; polling
+        carries on either way.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval, on_change, on_error), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval, on_change, on_error):
+        """Background polling loop"""
+        while not self._stop_event.wait(interval):
+            try:
+                changes = self.poll()
+            except GameError as e:
+                # A bad edit, or a file deleted or renamed between the
+                # stat and the reload; the next poll tries again
+                if on_error:
+                    on_error(e)
+                continue
+            if changes and on_change:
+                on_change(changes)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== CATALOG WATCHER TEST ===")
+
+    watcher = CatalogWatcher()
+    print(f"Watching {len(watcher.all_quests)} quests and {len(watcher.all_items)} items")
+    print(f"Changes since start: {watcher.poll()}")
@@ -9,15 +9,51 @@ AI Usage: [Document any AI assistance used]
 This module handles character creation, loading, and saving.
 """
 
+import io
 import os
+import errno
+import struct
+import hashlib
+import time
+import threading
+from itertools import islice
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from game_records import Character
 from custom_exceptions import (
+    GameError,
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError
+    CharacterDeadError,
+    SaveLockTimeoutError
 )
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Keys written to every save, in file order: the summary fields come first
+# so peek_character can stop reading early, and the (possibly long) lists last
+SAVE_KEYS = ["name", "class", "level", "gold", "health", "max_health", "strength", "magic", "experience", "inventory", "active_quests", "completed_quests"]
+INT_SAVE_KEYS = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
+LIST_SAVE_KEYS = ["inventory", "active_quests", "completed_quests"]
+# Keys kept in the manifest / storage summaries for listing characters
+SUMMARY_KEYS = ("name", "class", "level", "gold")
+
+# Storage backend used when a call doesn't pass storage= (None means the
+# save directory, handled by the file functions in this module). See
+# save_storage for the backends and set_default_storage to change it.
+_default_storage = None
+
+# "text" is the original KEY:value format, "binary" the compact one below.
+# load_character reads either, whatever this is set to.
+SAVE_FORMATS = ("text", "binary")
+DEFAULT_SAVE_FORMAT = "text"
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -28,7 +64,7 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character (used like a dictionary) with:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
@@ -63,9 +99,9 @@ def create_character(name, character_class):
     char_stats["inventory"] = []
     char_stats["active_quests"] = []
     char_stats["completed_quests"] = []
-    return char_stats
+    return Character(char_stats)
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", save_format=None, fsync=False, storage=None):
     """
     Save character to file
     
@@ -85,6 +121,18 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    save_format="binary" writes the compact format instead (see
+    encode_binary_save). None uses DEFAULT_SAVE_FORMAT.
+    
+    The file is replaced atomically, so a crash mid-save leaves the old
+    save intact. fsync=True also flushes it to disk before returning.
+    For a journaled character (see enable_journal) this compacts its journal.
+    The write happens under the character's exclusive lock (see
+    lock_character).
+    
+    storage: A save_storage backend to save to instead of save_directory
+             (None uses the default set by set_default_storage)
+    
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
@@ -92,41 +140,43 @@ def save_character(character, save_directory="data/save_games"):
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
-    char_name = character["name"]
-    file_name = f"{char_name.lower().replace(" ", "_")}_save.txt"
-    full_path = os.path.join(save_directory, file_name)
+    storage = _resolve_storage(storage)
+    if storage is not None:
+        summary = {key: character[key] for key in SUMMARY_KEYS}
+        storage.put(get_save_key(character["name"]), encode_save(character, save_format), summary)
+        return True
+    journal = get_journal(character)
+    if journal is not None and journal.save_directory == save_directory:
+        journal.compact()
+        return True
+    data = encode_save(character, save_format)
 
-    try:
-        os.makedirs(save_directory, exist_ok=True)
-    except PermissionError:
-        raise PermissionError(f"Permission denied while attempting to create directory: {save_directory}")
-    order = ["name", "class", "level", "health", "max_health", "strength", "magic", "experience", "gold", "inventory", "active_quests", "completed_quests"]
-    output_lines = []
-    for key in order:
+    with lock_character(character["name"], save_directory):
+        # The path is worked out under the lock so a concurrent
+        # migrate_save_layout can't move the save out from under us
+        full_path = get_save_path(character["name"], save_directory)
         try:
-            value = character[key]
-        except KeyError as e:
-            raise KeyError(f"Character data is missing the required key {e}. Cannot save.")
-        if isinstance(value, list):
-            string_list = [str(item) for item in value]
-            value_str = ",".join(string_list)
-        else:
-            value_str = str(value)
-        output_lines.append(f"{key.upper()}:{value_str}")
-    try:
-        with open(full_path, 'w') as file:
-            file.write('\n'.join(output_lines))
-    except IOError as e:
-        raise IOError(f"Error writing save file to {full_path}: {e}")
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        except PermissionError:
+            raise PermissionError(f"Permission denied while attempting to create directory: {save_directory}")
+        character_cache.invalidate((save_directory, get_save_key(character["name"])))
+        try:
+            write_save_file(full_path, data, fsync)
+            discard_journal(full_path)
+            record_saves(save_directory, [character])
+        except IOError as e:
+            raise IOError(f"Error writing save file to {full_path}: {e}")
     return True
 
-def load_character(character_name, save_directory="data/save_games"):
+def load_character(character_name, save_directory="data/save_games", storage=None):
     """
     Load character from save file
     
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
+        storage: save_storage backend to load from instead (None uses the
+                 default set by set_default_storage)
     
     Returns: Character dictionary
     Raises: 
@@ -139,22 +189,1195 @@ def load_character(character_name, save_directory="data/save_games"):
     # Try to read file → SaveFileCorruptedError
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
-    LIST_KEYS = {"INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"}
-    INT_KEYS = {"LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"}
-    file_name = f"{character_name.lower().replace(" ", "_")}_save.txt"
-    full_path = os.path.join(save_directory, file_name)
+    # Text and binary saves are told apart by the binary header
+    # Unchanged saves come from character_cache without being re-read
+    # A save's journal (if any) is replayed on top of it
+    return _parse_save(character_name, _read_save(character_name, save_directory, _resolve_storage(storage)))
+
+def _read_save(character_name, save_directory, storage):
+    """
+    I/O half of load_character (safe to run in worker threads)
     
-    if not os.path.exists(full_path):
+    Save files are read under the character's shared lock (cache hits
+    skip it).
+    
+    Returns: Tuple (cached character or None, data, journal path or None,
+             cache key, file version)
+    Raises: CharacterNotFoundError, SaveFileCorruptedError,
+            SaveLockTimeoutError
+    """
+    if storage is not None:
+        try:
+            return None, storage.get(get_save_key(character_name)), None, None, None
+        except KeyError:
+            raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+    full_path, journal_path, cache_key, file_version = _save_version(character_name, save_directory)
+    # A cache hit is a snapshot and journal that were read together under
+    # the lock, so only misses need it
+    cached = character_cache.get(cache_key, file_version)
+    if cached is not None:
+        return cached, None, None, None, None
+
+    with lock_character(character_name, save_directory, exclusive=False):
+        full_path, journal_path, cache_key, file_version = _save_version(character_name, save_directory)
+        try:
+            with open(full_path, 'rb') as file:
+                data = file.read()
+        except IOError as e:
+            raise SaveFileCorruptedError(f"Error reading save file for {character_name}: {e}")
+    return None, data, journal_path, cache_key, file_version
+
+def _save_version(character_name, save_directory):
+    """
+    Locate a character's save and journal and stat them for the cache
+    
+    Returns: Tuple (save path, journal path or None, cache key, file version)
+    Raises: CharacterNotFoundError
+    """
+    full_path = find_save_path(character_name, save_directory)
+    journal_path = get_journal_path(full_path)
+    
+    try:
+        stat = os.stat(full_path)
+    except FileNotFoundError:
         raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+    try:
+        journal_stat = os.stat(journal_path)
+        file_version = (stat.st_mtime_ns, stat.st_size, journal_stat.st_mtime_ns, journal_stat.st_size)
+    except FileNotFoundError:
+        journal_path = None
+        file_version = (stat.st_mtime_ns, stat.st_size)
+    return full_path, journal_path, (save_directory, get_save_key(character_name)), file_version
+
+def _parse_save(character_name, read_result):
+    """
+    Parsing half of load_character, given what _read_save returned
+    
+    Returns: Character dictionary
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    cached, data, journal_path, cache_key, file_version = read_result
+    if cached is not None:
+        return cached
+    char_data = decode_save(data, character_name)
+    if journal_path is not None:
+        replay_journal(char_data, data, journal_path)
+    if cache_key is not None:
+        character_cache.put(cache_key, file_version, char_data)
+    return char_data
+
+def peek_character(character_name, save_directory="data/save_games", fields=SUMMARY_KEYS, storage=None):
+    """
+    Read only some fields of a saved character
+    
+    Reading stops as soon as every requested field is found, so asking for
+    the summary fields (the default) skips the inventory and quest lists.
+    A save with a journal is loaded in full so the values are current.
+    
+    Returns: Dictionary of field → value for each of fields
+    Raises: CharacterNotFoundError if the save doesn't exist,
+            SaveFileCorruptedError, InvalidSaveDataError if a field is
+            missing or malformed, ValueError for a field that isn't saved
+    """
+    unknown = [field for field in fields if field not in SAVE_KEYS]
+    if unknown:
+        raise ValueError(f"Not a saved field: {', '.join(unknown)}")
+    storage = _resolve_storage(storage)
+    if storage is not None:
+        try:
+            data = storage.get(get_save_key(character_name))
+        except KeyError:
+            raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+        values = _peek_file(io.BytesIO(data), fields, character_name)
+    else:
+        full_path = find_save_path(character_name, save_directory)
+        if os.path.exists(get_journal_path(full_path)):
+            character = load_character(character_name, save_directory)
+            values = {field: character[field] for field in fields if field in character}
+        else:
+            try:
+                with open(full_path, 'rb') as file:
+                    values = _peek_file(file, fields, character_name)
+            except FileNotFoundError:
+                raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+            except OSError as e:
+                raise SaveFileCorruptedError(f"Error reading save file for {character_name}: {e}")
+    for field in fields:
+        if field not in values:
+            raise InvalidSaveDataError(f"Missing required field: '{field}'")
+    return values
 
+def set_default_storage(storage):
+    """
+    Make storage the backend every save/load/list/delete call uses
+    
+    Pass None to go back to the save directory. Calls that pass their own
+    storage= still use that one.
+    
+    Returns: The previous default
+    """
+    global _default_storage
+    previous = _default_storage
+    _default_storage = storage
+    return previous
+
+def get_default_storage():
+    """The backend set by set_default_storage (None for the save directory)"""
+    return _default_storage
+
+def _resolve_storage(storage):
+    """Backend for a call: its own storage=, else the default"""
+    return storage if storage is not None else _default_storage
+
+def get_save_key(character_name):
+    """Key a character's save is stored under (its file name without SAVE_SUFFIX)"""
+    return character_name.lower().replace(" ", "_")
+
+def get_save_path(character_name, save_directory="data/save_games"):
+    """Path of the save file for character_name in the directory's layout"""
+    return _layout_save_path(get_save_key(character_name), save_directory, get_save_layout(save_directory))
+
+def find_save_path(character_name, save_directory="data/save_games"):
+    """
+    Path of character_name's existing save, in whichever layout it is in
+    
+    Only differs from get_save_path while a directory is part way through
+    migrate_save_layout.
+    
+    Returns: Path of the save (the get_save_path one if there is no save)
+    """
+    key = get_save_key(character_name)
+    layout = get_save_layout(save_directory)
+    full_path = _layout_save_path(key, save_directory, layout)
+    if os.path.exists(full_path):
+        return full_path
+    for other_layout in SAVE_LAYOUTS:
+        other_path = _layout_save_path(key, save_directory, other_layout)
+        if other_layout != layout and os.path.exists(other_path):
+            return other_path
+    return full_path
+
+def write_save_file(full_path, data, fsync=False):
+    """
+    Atomically replace full_path with data
+    
+    The bytes go to a temp file in the same directory, which is then
+    renamed over the save, so readers see either the old or the new save
+    and never a half-written one.
+    
+    Raises: OSError if the file can't be written
+    """
+    temp_path = f"{full_path}.{os.getpid()}.tmp"
     try:
-        with open(full_path, 'r') as file:
-            lines = file.readlines()
-    except IOError as e:
-        raise SaveFileCorruptedError(f"Error reading save file for {character_name}: {e}")
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, full_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if fsync:
+        sync_directory(os.path.dirname(full_path))
+
+def sync_directory(directory):
+    """fsync a directory so renames inside it survive a crash (no-op where unsupported)"""
+    try:
+        descriptor = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+def list_saved_characters(save_directory="data/save_games", storage=None):
+    """
+    Get list of all saved character names
+    
+    Returns: List of character names as they were saved (not the file names)
+    """
+    # TODO: Implement this function
+    # Return empty list if directory doesn't exist
+    # Extract character names from filenames
+    # Names come from the manifest (built on first use), so nothing is
+    # scanned and the names are the same whether or not it existed
+    storage = _resolve_storage(storage)
+    if storage is not None:
+        return storage.list()
+    if not os.path.exists(save_directory):
+        return []
+    return [summary["name"] for summary in read_manifest(save_directory).values()]
+
+def delete_character(character_name, save_directory="data/save_games", storage=None):
+    """
+    Delete a character's save file
+    
+    Returns: True if deleted successfully
+    Raises: CharacterNotFoundError if character doesn't exist
+    """
+    # TODO: Implement character deletion
+    # Verify file exists before attempting deletion
+    storage = _resolve_storage(storage)
+    if storage is not None:
+        if not storage.delete(get_save_key(character_name)):
+            raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+        return True
+    with lock_character(character_name, save_directory):
+        full_path = find_save_path(character_name, save_directory)
+        if not os.path.exists(full_path):
+            raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+        character_cache.invalidate((save_directory, get_save_key(character_name)))
+        try:
+            os.remove(full_path)
+            discard_journal(full_path)
+        except OSError as e:
+            raise OSError(f"Could not delete file at {full_path}. Details: {e}")
+        discard_lock_file(character_name, save_directory)
+        record_deletes(save_directory, [character_name])
+    return True
+
+# ============================================================================
+# BULK OPERATIONS
+# ============================================================================
+
+# Threads used by load_characters / save_characters / iter_all_characters
+BULK_WORKERS = 8
+# Saves each worker reads per job (fewer, bigger jobs keep pool overhead low)
+BULK_CHUNK_SIZE = 64
+# Errors collected per character instead of stopping a bulk operation
+BULK_ERRORS = (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError, SaveLockTimeoutError, KeyError, ValueError, OSError)
+
+class BatchResult:
+    """
+    Outcome of a bulk operation
+
+    succeeded: name → loaded character (loads) or True (saves)
+    failed: name → the exception raised for that character
+    """
+
+    def __init__(self):
+        self.succeeded = {}
+        self.failed = {}
+
+    @property
+    def ok(self):
+        """True if nothing failed"""
+        return not self.failed
+
+    def __len__(self):
+        return len(self.succeeded) + len(self.failed)
+
+    def __repr__(self):
+        return f"BatchResult(succeeded={len(self.succeeded)}, failed={len(self.failed)})"
+
+def _read_chunk(names, save_directory, storage):
+    """Worker-thread job: _read_save each name, keeping errors as results"""
+    reads = []
+    for name in names:
+        try:
+            reads.append((name, _read_save(name, save_directory, storage), None))
+        except BULK_ERRORS as e:
+            reads.append((name, None, e))
+    return reads
+
+def _read_ahead(names, save_directory, storage, workers, chunk_size):
+    """
+    Read the saves for names on a thread pool, a few chunks ahead of the caller
+    
+    Yields: (name, _read_save result, None) or (name, None, exception), in order
+    """
+    names = iter(names)
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(names, chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(_read_chunk, chunk, save_directory, storage))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+
+def load_characters(character_names, save_directory="data/save_games", storage=None, workers=BULK_WORKERS, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Load many characters, reading their files on a thread pool
+    
+    Files are read by worker threads, a few chunks ahead of this thread
+    parsing the ones already read, so disk waits overlap. A character that can't be loaded
+    is recorded in the result instead of stopping the batch.
+    
+    Returns: BatchResult with succeeded = name → character dictionary
+    """
+    storage = _resolve_storage(storage)
+    result = BatchResult()
+    for name, read_result, error in _read_ahead(character_names, save_directory, storage, workers, chunk_size):
+        try:
+            if error is not None:
+                raise error
+            result.succeeded[name] = _parse_save(name, read_result)
+        except BULK_ERRORS as e:
+            result.failed[name] = e
+    return result
+
+def save_characters(characters, save_directory="data/save_games", save_format=None, storage=None, workers=BULK_WORKERS, fsync=False):
+    """
+    Save many characters, writing their files on a thread pool
+    
+    Saves are encoded in this thread and written (atomically, as in
+    save_character) by worker threads; the manifest gets one append for
+    the whole batch. A character that can't be saved is recorded in the
+    result instead of stopping the batch.
+    
+    Returns: BatchResult with succeeded = name → True
+    """
+    storage = _resolve_storage(storage)
+    result = BatchResult()
+    pending = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for character in characters:
+            name = character.get("name")
+            try:
+                journal = get_journal(character) if storage is None else None
+                if journal is not None and journal.save_directory == save_directory:
+                    journal.compact()
+                    result.succeeded[name] = True
+                    continue
+                data = encode_save(character, save_format)
+                key = get_save_key(name)
+                if storage is not None:
+                    summary = {summary_key: character[summary_key] for summary_key in SUMMARY_KEYS}
+                    future = executor.submit(storage.put, key, data, summary)
+                else:
+                    future = executor.submit(_write_new_save, name, save_directory, data, fsync)
+            except (BULK_ERRORS + (AttributeError, TypeError)) as e:
+                result.failed[name] = e
+                continue
+            pending.append((character, future))
+
+        saved = []
+        for character, future in pending:
+            try:
+                future.result()
+            except BULK_ERRORS as e:
+                result.failed[character["name"]] = e
+                continue
+            result.succeeded[character["name"]] = True
+            saved.append(character)
+    if storage is None and saved:
+        record_saves(save_directory, saved)
+    return result
+
+def _write_new_save(character_name, save_directory, data, fsync):
+    """Worker-thread half of save_characters for one file"""
+    with lock_character(character_name, save_directory):
+        full_path = get_save_path(character_name, save_directory)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        character_cache.invalidate((save_directory, get_save_key(character_name)))
+        write_save_file(full_path, data, fsync)
+        discard_journal(full_path)
+
+def iter_all_characters(save_directory="data/save_games", storage=None, workers=BULK_WORKERS, result=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Load every saved character, reading ahead on a thread pool
+    
+    Saves that can't be loaded are skipped; pass a BatchResult as result
+    to find out which (its succeeded dictionary is left empty, so memory
+    stays flat however many saves there are).
+    
+    Yields: (save key, character dictionary)
+    """
+    storage = _resolve_storage(storage)
+    if storage is not None:
+        for key, data in storage.scan():
+            try:
+                yield key, decode_save(data, key)
+            except BULK_ERRORS as e:
+                if result is not None:
+                    result.failed[key] = e
+        return
+
+    keys = (key for key, full_path in iter_save_files(save_directory))
+    for key, read_result, error in _read_ahead(keys, save_directory, None, workers, chunk_size):
+        try:
+            if error is not None:
+                raise error
+            character = _parse_save(key, read_result)
+        except BULK_ERRORS as e:
+            if result is not None:
+                result.failed[key] = e
+            continue
+        yield key, character
+
+# ============================================================================
+# SAVE LOCKS
+# ============================================================================
+
+# Seconds to wait for another process to release a character's lock
+SAVE_LOCK_TIMEOUT = 10.0
+# Lock files live in this folder of the save directory (iter_save_files
+# skips it), so every process that can see the saves shares the locks
+LOCK_DIRECTORY = ".locks"
+# errno values for files a read-only save directory won't let us create
+READ_ONLY_ERRORS = (errno.EACCES, errno.EPERM, errno.EROFS)
+# Locks held by the current thread: (device, inode) → [descriptor, exclusive, depth]
+_held_locks = threading.local()
+
+def get_lock_path(character_name, save_directory="data/save_games"):
+    """Path of the lock file guarding a character's save (sharded like saves)"""
+    key = get_save_key(character_name)
+    return os.path.join(_shard_directory(key, os.path.join(save_directory, LOCK_DIRECTORY)), f"{key}.lock")
+
+def discard_lock_file(character_name, save_directory="data/save_games"):
+    """Delete a character's lock file (call with its exclusive lock held, after deleting the save)"""
+    try:
+        os.remove(get_lock_path(character_name, save_directory))
+    except FileNotFoundError:
+        pass
+
+def _open_lock_file(lock_path, save_directory, exclusive=True):
+    """
+    Open a lock file, creating it first for exclusive locks
+    
+    Lock files are opened read-only, which is all flock() needs, and the
+    lock folder gets the save directory's permissions, so every user who
+    can read the saves can take the locks. Shared locks never create the
+    file, so reading a read-only save directory writes nothing.
+    
+    Returns: File descriptor, or None for a shared lock whose file is
+             missing or can't be opened in a read-only directory
+    """
+    if not exclusive:
+        try:
+            return os.open(lock_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            if e.errno in READ_ONLY_ERRORS:
+                return None
+            raise
+    try:
+        return os.open(lock_path, os.O_RDONLY | os.O_CREAT, 0o666)
+    except FileNotFoundError:
+        shard = os.path.dirname(lock_path)
+        os.makedirs(shard, exist_ok=True)
+        mode = os.stat(save_directory).st_mode & 0o7777
+        # The lock folder and both shard levels
+        for lock_directory in (os.path.dirname(os.path.dirname(shard)), os.path.dirname(shard), shard):
+            try:
+                os.chmod(lock_directory, mode)
+            except OSError:
+                pass
+        return os.open(lock_path, os.O_RDONLY | os.O_CREAT, 0o666)
+
+def _flock(descriptor, operation, timeout, character_name):
+    """flock() with a timeout, polling with a growing delay"""
+    if timeout is None:
+        timeout = SAVE_LOCK_TIMEOUT
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        try:
+            fcntl.flock(descriptor, operation | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                raise SaveLockTimeoutError(f"The save for {character_name} is still locked after {timeout} seconds.")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+@contextmanager
+def lock_character(character_name, save_directory="data/save_games", exclusive=True, timeout=None):
+    """
+    Hold the advisory lock on a character's save
+    
+    Any number of readers (exclusive=False) can share the lock; a writer
+    holds it alone. Locks are fcntl locks on a file in the save
+    directory's LOCK_DIRECTORY (removed when the save is deleted), so
+    they work across processes and are released if a process dies. They are reentrant within a thread:
+    load_character and save_character inside a character_session reuse
+    the session's lock. Without fcntl (Windows) this does nothing.
+    
+    Asking for the exclusive lock while this thread holds the shared one
+    upgrades it, but flock() may drop the shared lock before granting the
+    exclusive one, so another writer can get in between. A load followed
+    by a save under a shared lock is therefore not atomic; use
+    character_session (or exclusive=True) for read-modify-write.
+    
+    Raises: SaveLockTimeoutError if the lock isn't free within timeout
+            seconds (None uses SAVE_LOCK_TIMEOUT)
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = get_lock_path(character_name, save_directory)
+    held = _held_locks.__dict__.setdefault("files", {})
+    while True:
+        descriptor = _open_lock_file(lock_path, save_directory, exclusive)
+        if descriptor is None:
+            # A shared lock with no lock file: nothing has written this save
+            # since locks existed, or the directory is read-only to us
+            yield
+            return
+        # Keyed by the file itself so every spelling of a directory matches
+        file_stat = os.fstat(descriptor)
+        lock_key = (file_stat.st_dev, file_stat.st_ino)
+        entry = held.get(lock_key)
+        if entry is not None:
+            break
+        try:
+            _flock(descriptor, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, timeout, character_name)
+        except BaseException:
+            os.close(descriptor)
+            raise
+        # Deleting a save removes its lock file under the lock, so make sure
+        # the file we waited on is still the one at lock_path
+        try:
+            current = os.stat(lock_path)
+            if (current.st_dev, current.st_ino) == lock_key:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(descriptor)
+
+    if entry is not None:
+        os.close(descriptor)
+        upgrade = exclusive and not entry[1]
+        if upgrade:
+            _flock(entry[0], fcntl.LOCK_EX, timeout, character_name)
+            entry[1] = True
+        entry[2] += 1
+        try:
+            yield
+        finally:
+            entry[2] -= 1
+            if upgrade:
+                fcntl.flock(entry[0], fcntl.LOCK_SH)
+                entry[1] = False
+        return
+
+    try:
+        held[lock_key] = [descriptor, exclusive, 1]
+        try:
+            yield
+        finally:
+            del held[lock_key]
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(descriptor)
+
+@contextmanager
+def character_session(character_name, save_directory="data/save_games", save_format=None, timeout=None):
+    """
+    Load a character under its exclusive lock and save it on exit
+    
+    Usage:
+        with character_session("Hero") as hero:
+            add_gold(hero, 50)
+    
+    Other processes' loads and saves of the character wait for the
+    session to end, so read-modify-write cycles in several worker
+    processes can't lose each other's updates. If the block raises,
+    nothing is saved.
+    
+    Yields: The loaded character
+    Raises: SaveLockTimeoutError, plus anything load_character raises
+    """
+    with lock_character(character_name, save_directory, timeout=timeout):
+        character = load_character(character_name, save_directory)
+        yield character
+        save_character(character, save_directory, save_format)
+
+# ============================================================================
+# LOADED CHARACTER CACHE
+# ============================================================================
+
+# Characters kept by load_character between calls
+CHARACTER_CACHE_SIZE = 256
+
+def _copy_character(character):
+    """Copy of a character dictionary whose lists can be changed safely"""
+    if isinstance(character, Character):
+        return character.copy()
+    return {key: value[:] if isinstance(value, list) else value for key, value in character.items()}
+
+class CharacterCache:
+    """
+    Bounded LRU cache of loaded characters
+    
+    Entries are keyed by (save directory, save key) and remember the
+    (st_mtime_ns, st_size) of the file they came from; an entry whose file
+    has changed since is treated as a miss. Callers always get their own
+    copy, so changing a loaded character never changes the cache.
+    """
+
+    def __init__(self, capacity=CHARACTER_CACHE_SIZE):
+        """capacity: Most characters kept (0 turns caching off)"""
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, file_version):
+        """
+        Cached character for key if its file is still at file_version
         
-    char_data = {}
+        Returns: Copy of the character, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != file_version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_character(entry[1])
+
+    def put(self, key, file_version, character):
+        """Remember character as loaded from file_version, evicting the oldest entries"""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (file_version, _copy_character(character))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Forget one character"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget every character and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, capacity):
+        """Change the capacity, evicting the oldest entries if it shrank"""
+        with self._lock:
+            self.capacity = capacity
+            while len(self._entries) > max(capacity, 0):
+                self._entries.popitem(last=False)
+
+    def info(self):
+        """Dictionary with hits, misses, size and capacity"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "capacity": self.capacity}
+
+    def __len__(self):
+        return len(self._entries)
+
+character_cache = CharacterCache()
+
+# ============================================================================
+# SAVE DIRECTORY LAYOUT
+# ============================================================================
+
+# "flat" keeps every save directly in the save directory. "sharded" puts
+# each save two directories down, named from a hash of its save key
+# (data/save_games/3f/a2/hero_save.txt), so no directory holds more than a
+# few dozen files even with millions of characters. A directory's layout
+# is recorded in its .layout file; without one it is flat.
+SAVE_SUFFIX = "_save.txt"
+SAVE_LAYOUTS = ("flat", "sharded")
+LAYOUT_FILE = ".layout"
+
+_layout_cache = {}
+
+def get_save_layout(save_directory="data/save_games"):
+    """Layout ("flat" or "sharded") of save_directory"""
+    layout_path = os.path.join(save_directory, LAYOUT_FILE)
+    try:
+        mtime_ns = os.stat(layout_path).st_mtime_ns
+    except FileNotFoundError:
+        return "flat"
+    cached = _layout_cache.get(layout_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    with open(layout_path, 'r') as file:
+        layout = file.read().strip()
+    if layout not in SAVE_LAYOUTS:
+        raise SaveFileCorruptedError(f"Unknown save layout '{layout}' in {layout_path}")
+    _layout_cache[layout_path] = (mtime_ns, layout)
+    return layout
+
+def _layout_save_path(key, save_directory, layout):
+    """Path of the save for key under a given layout"""
+    file_name = f"{key}{SAVE_SUFFIX}"
+    if layout == "flat":
+        return os.path.join(save_directory, file_name)
+    return os.path.join(_shard_directory(key, save_directory), file_name)
+
+def _shard_directory(key, directory):
+    """Two-level shard folder of directory that files for key go in"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=2).hexdigest()
+    return os.path.join(directory, digest[:2], digest[2:])
+
+def iter_save_files(save_directory="data/save_games"):
+    """
+    Every save file in save_directory, whatever layout each one is in
+    
+    Yields: (save key, full path) pairs
+    """
+    if not os.path.isdir(save_directory):
+        return
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX):
+                yield entry.name[:-len(SAVE_SUFFIX)], entry.path
+            elif len(entry.name) == 2 and entry.is_dir():
+                for shard_name in os.listdir(entry.path):
+                    shard_path = os.path.join(entry.path, shard_name)
+                    if not os.path.isdir(shard_path):
+                        continue
+                    for file_name in os.listdir(shard_path):
+                        if file_name.endswith(SAVE_SUFFIX):
+                            yield file_name[:-len(SAVE_SUFFIX)], os.path.join(shard_path, file_name)
+
+def migrate_save_layout(save_directory="data/save_games", layout="sharded"):
+    """
+    Move every save in save_directory into layout
+    
+    The new layout is recorded before anything moves, and find_save_path
+    looks in both layouts, so saves stay loadable throughout and an
+    interrupted migration can simply be run again. If a save exists in
+    both places, the one already in the new layout is kept. Each save is
+    moved under its exclusive lock, so saves made during the migration
+    aren't lost.
+    
+    Returns: Number of saves moved
+    Raises: ValueError for an unknown layout, SaveLockTimeoutError
+    """
+    if layout not in SAVE_LAYOUTS:
+        raise ValueError(f"Unknown save layout '{layout}'. Use one of: {', '.join(SAVE_LAYOUTS)}")
+    os.makedirs(save_directory, exist_ok=True)
+    write_save_file(os.path.join(save_directory, LAYOUT_FILE), layout.encode('utf-8'), fsync=True)
+    moved = 0
+    for key, full_path in list(iter_save_files(save_directory)):
+        new_path = _layout_save_path(key, save_directory, layout)
+        if new_path == full_path:
+            continue
+        # Saves work out their path under this lock, so once we hold it
+        # nothing can write to the old path behind us
+        with lock_character(key, save_directory):
+            if not os.path.exists(full_path):
+                continue
+            if os.path.exists(new_path):
+                os.remove(full_path)
+                discard_journal(full_path)
+                continue
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            if os.path.exists(get_journal_path(full_path)):
+                os.replace(get_journal_path(full_path), get_journal_path(new_path))
+            os.replace(full_path, new_path)
+            moved += 1
+    if layout == "flat":
+        _remove_empty_shards(save_directory)
+    sync_directory(save_directory)
+    return moved
+
+def _remove_empty_shards(save_directory):
+    """Delete shard directories left empty after moving back to flat"""
+    for name in os.listdir(save_directory):
+        level_one = os.path.join(save_directory, name)
+        if len(name) == 2 and os.path.isdir(level_one):
+            for shard_name in os.listdir(level_one):
+                shard_path = os.path.join(level_one, shard_name)
+                if os.path.isdir(shard_path) and not os.listdir(shard_path):
+                    os.rmdir(shard_path)
+            if not os.listdir(level_one):
+                os.rmdir(level_one)
+
+# ============================================================================
+# SAVE MANIFEST
+# ============================================================================
+
+# The manifest is an append-only log in the save directory with one line
+# per save or delete:
+#   PUT<TAB>key<TAB>name<TAB>class<TAB>level<TAB>gold<TAB>mtime_ns
+#   DEL<TAB>key
+# The last line for a key wins. Listing characters reads this one file
+# instead of opening every save. Saves made without save_character /
+# delete_character / SaveWriter (copied in by hand, say) need
+# rebuild_manifest(). Appends, compaction and rebuilds hold the manifest's
+# exclusive lock (see lock_character), so no append is lost to a rewrite.
+MANIFEST_FILE = ".manifest"
+# Rewrite the log once it holds this many lines per live entry
+MANIFEST_COMPACT_RATIO = 4
+# Appends re-check the log for compaction once it reaches the size where
+# it should next need compacting (at least this many bytes), so a server
+# that saves but never lists characters still keeps it bounded
+MANIFEST_CHECK_BYTES = 16 * 1024
+
+_manifest_cache = {}
+_manifest_lock = threading.Lock()
+# Manifest path → log size at which appends next check for compaction
+_manifest_next_check = {}
+
+def get_manifest_path(save_directory="data/save_games"):
+    """Path of the manifest for save_directory"""
+    return os.path.join(save_directory, MANIFEST_FILE)
+
+def _manifest_field(value):
+    """Manifest fields can't hold tabs or line breaks"""
+    return str(value).replace("\t", " ").replace("\n", " ").replace("\r", " ")
+
+def _summary_line(key, summary):
+    """PUT line for one summary"""
+    return "\t".join([
+        "PUT", key, _manifest_field(summary["name"]), _manifest_field(summary["class"]),
+        str(summary["level"]), str(summary["gold"]), str(summary["mtime_ns"])
+    ]) + "\n"
+
+def _summarize(character, full_path):
+    """Manifest summary of a character whose save is at full_path"""
+    mtime_ns = os.stat(full_path).st_mtime_ns
+    return {
+        "name": character["name"], "class": character["class"],
+        "level": character["level"], "gold": character["gold"],
+        "mtime_ns": mtime_ns, "mtime": mtime_ns / 1e9
+    }
+
+def _lock_manifest(save_directory, exclusive=True):
+    """Directory-wide lock serializing manifest appends and rewrites"""
+    return lock_character(MANIFEST_FILE, save_directory, exclusive)
+
+def _append_manifest(save_directory, lines):
+    """Append lines to the manifest in one write, building it first if missing"""
+    if not lines:
+        return
+    manifest_path = get_manifest_path(save_directory)
+    with _lock_manifest(save_directory):
+        if not os.path.exists(manifest_path):
+            rebuild_manifest(save_directory)
+            return
+        with open(manifest_path, 'a') as file:
+            file.write("".join(lines))
+            size = file.tell()
+        if size >= _manifest_next_check.get(manifest_path, MANIFEST_CHECK_BYTES):
+            _compact_manifest(save_directory)
+
+def record_saves(save_directory, characters):
+    """Record in the manifest that characters were just saved"""
+    record_keyed_saves(save_directory, [(character["name"], character) for character in characters])
+
+def record_keyed_saves(save_directory, saves):
+    """
+    Record in the manifest that saves were just written under given keys
+    
+    Args:
+        saves: (save key, character or summary) pairs; the entry goes under
+               the key the file was written with, whatever the summary's
+               name says
+    """
+    lines = []
+    for key, character in saves:
+        key = get_save_key(key)
+        lines.append(_summary_line(key, _summarize(character, get_save_path(key, save_directory))))
+    _append_manifest(save_directory, lines)
+
+def record_deletes(save_directory, character_names):
+    """Record in the manifest that characters' saves were deleted"""
+    _append_manifest(save_directory, [f"DEL\t{get_save_key(name)}\n" for name in character_names])
+
+def read_manifest(save_directory="data/save_games"):
+    """
+    Read the manifest, building it first if there isn't one
+    
+    The parsed manifest is cached until the file changes, and a log that
+    has grown well past its live entries is compacted.
+    
+    Returns: Dictionary of save key → summary dictionary with name, class,
+             level, gold, mtime (seconds) and mtime_ns
+    Raises: SaveFileCorruptedError if the manifest can't be read
+    """
+    manifest_path = get_manifest_path(save_directory)
+    if not os.path.exists(manifest_path):
+        try:
+            with _lock_manifest(save_directory):
+                if not os.path.exists(manifest_path):
+                    return rebuild_manifest(save_directory)
+        except OSError as e:
+            if e.errno not in READ_ONLY_ERRORS:
+                raise
+            # A read-only directory can't hold a manifest, so read the saves
+            return _scan_saves(save_directory)
+    try:
+        stat = os.stat(manifest_path)
+    except OSError as e:
+        raise SaveFileCorruptedError(f"Error reading save manifest {manifest_path}: {e}")
+    with _manifest_lock:
+        cached = _manifest_cache.get(manifest_path)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+
+    with _lock_manifest(save_directory, exclusive=False):
+        stat, line_count, summaries = _parse_manifest(manifest_path)
+    if _manifest_needs_compaction(line_count, summaries):
+        try:
+            with _lock_manifest(save_directory):
+                # Re-read under the exclusive lock so appends made since are kept
+                return _compact_manifest(save_directory)
+        except OSError as e:
+            if e.errno not in READ_ONLY_ERRORS:
+                raise
+    with _manifest_lock:
+        _manifest_cache[manifest_path] = ((stat.st_mtime_ns, stat.st_size), summaries)
+    return summaries
+
+def _compaction_line_limit(summaries):
+    """Line count past which a log with these live entries is compacted"""
+    return MANIFEST_COMPACT_RATIO * max(len(summaries), 256)
+
+def _manifest_needs_compaction(line_count, summaries):
+    """True once the log holds MANIFEST_COMPACT_RATIO lines per live entry"""
+    return line_count > _compaction_line_limit(summaries)
+
+def _compact_manifest(save_directory):
+    """
+    Re-read the manifest and rewrite it if it needs compacting
+    (called with the manifest's exclusive lock held)
+    
+    Returns: The manifest (see read_manifest)
+    """
+    manifest_path = get_manifest_path(save_directory)
+    stat, line_count, summaries = _parse_manifest(manifest_path)
+    if _manifest_needs_compaction(line_count, summaries):
+        _write_manifest(save_directory, summaries)
+        line_count = len(summaries)
+    else:
+        with _manifest_lock:
+            _manifest_cache[manifest_path] = ((stat.st_mtime_ns, stat.st_size), summaries)
+    # Estimate where the line limit falls from the average line length
+    size = os.path.getsize(manifest_path)
+    line_bytes = size / line_count if line_count else 64
+    _manifest_next_check[manifest_path] = max(int(line_bytes * (_compaction_line_limit(summaries) + 1)), MANIFEST_CHECK_BYTES)
+    return summaries
+
+def _parse_manifest(manifest_path):
+    """
+    Read and replay the manifest log (called with the manifest lock held)
+    
+    Returns: Tuple (os.stat result, number of lines, summaries by save key)
+    Raises: SaveFileCorruptedError
+    """
+    try:
+        stat = os.stat(manifest_path)
+        with open(manifest_path, 'r') as file:
+            lines = file.read().splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        raise SaveFileCorruptedError(f"Error reading save manifest {manifest_path}: {e}")
+
+    summaries = {}
     for line_num, line in enumerate(lines, 1):
+        fields = line.split("\t")
+        try:
+            if fields[0] == "PUT":
+                mtime_ns = int(fields[6])
+                summaries[fields[1]] = {
+                    "name": fields[2], "class": fields[3],
+                    "level": int(fields[4]), "gold": int(fields[5]),
+                    "mtime_ns": mtime_ns, "mtime": mtime_ns / 1e9
+                }
+            elif fields[0] == "DEL":
+                summaries.pop(fields[1], None)
+            elif line:
+                raise ValueError(f"unknown record {fields[0]}")
+        except (IndexError, ValueError) as e:
+            raise SaveFileCorruptedError(f"Corrupted save manifest line {line_num} in {manifest_path}: {e}")
+    return stat, len(lines), summaries
+
+def _write_manifest(save_directory, summaries):
+    """Replace the manifest with one PUT line per summary"""
+    manifest_path = get_manifest_path(save_directory)
+    data = "".join(_summary_line(key, summary) for key, summary in summaries.items())
+    write_save_file(manifest_path, data.encode('utf-8'))
+    stat = os.stat(manifest_path)
+    with _manifest_lock:
+        _manifest_cache[manifest_path] = ((stat.st_mtime_ns, stat.st_size), summaries)
+
+def rebuild_manifest(save_directory="data/save_games"):
+    """
+    Rebuild the manifest by reading every save in save_directory
+    
+    Saves that can't be read are left out (load_character will still
+    report what is wrong with them).
+    
+    Returns: The new manifest (see read_manifest)
+    """
+    if not os.path.isdir(save_directory):
+        return {}
+    with _lock_manifest(save_directory):
+        summaries = _scan_saves(save_directory)
+        _write_manifest(save_directory, summaries)
+    return summaries
+
+def _scan_saves(save_directory):
+    """Summaries of the readable saves in save_directory, read from the files (see rebuild_manifest)"""
+    summaries = {}
+    for key, full_path in iter_save_files(save_directory):
+        try:
+            with open(full_path, 'rb') as file:
+                character = _peek_file(file, SUMMARY_KEYS, key)
+            summary = _summarize(character, full_path)
+            summary["level"] = int(character.get("level", 0))
+            summary["gold"] = int(character.get("gold", 0))
+        except (OSError, KeyError, ValueError, SaveFileCorruptedError, InvalidSaveDataError):
+            continue
+        summaries[key] = summary
+    return summaries
+
+def list_character_summaries(save_directory="data/save_games", character_class=None, min_level=None, max_level=None, storage=None):
+    """
+    Summaries of saved characters for the load menu, from the manifest
+    (or from storage's own summaries / indexed query)
+    
+    A journaled character's summary is as of its last compaction.
+    
+    Args:
+        character_class: Only characters of this class
+        min_level / max_level: Only characters in this level range
+    
+    Returns: List of summary dictionaries (name, class, level, gold, mtime)
+    """
+    storage = _resolve_storage(storage)
+    if storage is not None and hasattr(storage, "query"):
+        return storage.query(character_class, min_level, max_level)
+    summaries = storage.summaries() if storage is not None else read_manifest(save_directory).values()
+    results = []
+    for summary in summaries:
+        if character_class is not None and summary["class"] != character_class:
+            continue
+        if min_level is not None and summary["level"] < min_level:
+            continue
+        if max_level is not None and summary["level"] > max_level:
+            continue
+        results.append(summary)
+    return results
+
+# ============================================================================
+# SAVE FILE FORMATS
+# ============================================================================
+
+# Binary layout (all little-endian):
+#   header      magic "QCS\x00", format version (uint16), the INT_SAVE_KEYS
+#               values (int64 each), string count, reference count (uint16)
+#               and string table length in bytes (uint32)
+#   references  name, class, then for each LIST_SAVE_KEYS list its length
+#               followed by one string-table index per entry (uint16 each)
+#   strings     the string table: UTF-8, entries separated by NUL bytes
+# Repeated ids (three health potions) are stored once in the string table,
+# and each section is packed/unpacked/decoded with a single call.
+BINARY_MAGIC = b"QCS\x00"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct(f"<4sH{len(INT_SAVE_KEYS)}qHHI")
+STRING_SEPARATOR = "\x00"
+
+def encode_text_save(character):
+    """
+    Build the KEY:value text save for a character
+    
+    Returns: Save file contents as a string
+    Raises: KeyError if a required key is missing
+    """
+    output_lines = []
+    for key in SAVE_KEYS:
+        try:
+            value = character[key]
+        except KeyError as e:
+            raise KeyError(f"Character data is missing the required key {e}. Cannot save.")
+        if isinstance(value, list):
+            string_list = [str(item) for item in value]
+            value_str = ",".join(string_list)
+        else:
+            value_str = str(value)
+        output_lines.append(f"{key.upper()}:{value_str}")
+    return '\n'.join(output_lines)
+
+def encode_binary_save(character):
+    """
+    Build the binary save for a character
+    
+    Returns: Save file contents as bytes
+    Raises: KeyError if a required key is missing,
+            InvalidSaveDataError if a value can't be stored
+    """
+    try:
+        stats = [character[key] for key in INT_SAVE_KEYS]
+        texts = [str(character["name"]), str(character["class"])]
+        lists = [map(str, character[key]) for key in LIST_SAVE_KEYS]
+    except KeyError as e:
+        raise KeyError(f"Character data is missing the required key {e}. Cannot save.")
+
+    # setdefault hands out the next table index the first time a string is seen
+    string_index = {}
+    references = [string_index.setdefault(text, len(string_index)) for text in texts]
+    for values in lists:
+        list_references = [string_index.setdefault(value, len(string_index)) for value in values]
+        references.append(len(list_references))
+        references += list_references
+    table = STRING_SEPARATOR.join(string_index)
+    if table.count(STRING_SEPARATOR) != len(string_index) - 1:
+        raise InvalidSaveDataError(f"Character {character['name']} has a NUL character in a saved string.")
+    table = table.encode('utf-8')
+    try:
+        header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, *stats, len(string_index), len(references), len(table))
+        references = struct.pack(f"<{len(references)}H", *references)
+    except struct.error as e:
+        raise InvalidSaveDataError(f"Character {character['name']} can't be stored in a binary save: {e}")
+    return header + references + table
+
+def encode_save(character, save_format=None):
+    """
+    Build a character's save file contents in save_format
+    
+    Returns: Save file contents as bytes
+    Raises: ValueError for an unknown format, KeyError if a required key
+            is missing
+    """
+    if save_format is None:
+        save_format = DEFAULT_SAVE_FORMAT
+    if save_format == "binary":
+        return encode_binary_save(character)
+    if save_format == "text":
+        return encode_text_save(character).encode('utf-8')
+    raise ValueError(f"Unknown save format '{save_format}'. Use one of: {', '.join(SAVE_FORMATS)}")
+
+def decode_save(data, character_name="character"):
+    """
+    Read a save from its bytes, whichever format it is in
+    
+    Returns: Character dictionary
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    if data.startswith(BINARY_MAGIC):
+        return decode_binary_save(data, character_name)
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise SaveFileCorruptedError(f"Error reading save file for {character_name}: {e}")
+    return decode_text_save(text, character_name)
+
+def decode_text_save(text, character_name="character"):
+    """
+    Read a KEY:value text save
+    
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError if data format is wrong
+    """
+    LIST_KEYS = {"INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"}
+    INT_KEYS = {"LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"}
+    char_data = {}
+    for line_num, line in enumerate(text.splitlines(), 1):
         line = line.strip()
         if not line:
             continue
@@ -182,57 +1405,413 @@ def load_character(character_name, save_directory="data/save_games"):
     if not all(key in char_data for key in needed_keys):
         raise InvalidSaveDataError(f"Missing essential data keys in file for {character_name}.")
 
+    try:
+        return Character(char_data)
+    except TypeError as e:
+        raise InvalidSaveDataError(f"Invalid save data for {character_name}: {e}")
+
+def decode_binary_save(data, character_name="character"):
+    """
+    Read a binary save
+    
+    Returns: Character dictionary (same shape as a text save)
+    Raises: InvalidSaveDataError if the data is truncated, malformed or
+            from an unknown format version
+    """
+    try:
+        header = BINARY_HEADER.unpack_from(data, 0)
+        version = header[1]
+        string_count, reference_count, table_length = header[-3:]
+        if version != BINARY_VERSION:
+            raise InvalidSaveDataError(f"Unsupported binary save version {version} for {character_name}.")
+        references = struct.unpack_from(f"<{reference_count}H", data, BINARY_HEADER.size)
+        offset = BINARY_HEADER.size + 2 * reference_count
+        if offset + table_length != len(data):
+            raise InvalidSaveDataError(f"String table doesn't match the file size in save file for {character_name}.")
+        strings = data[offset:].decode('utf-8').split(STRING_SEPARATOR)
+        if len(strings) != string_count:
+            raise InvalidSaveDataError(f"Expected {string_count} strings in save file for {character_name}, found {len(strings)}.")
+
+        char_data = Character({"name": strings[references[0]], "class": strings[references[1]]})
+        char_data.update(zip(INT_SAVE_KEYS, header[2:-3]))
+        position = 2
+        for key in LIST_SAVE_KEYS:
+            end = position + 1 + references[position]
+            if end > reference_count:
+                raise InvalidSaveDataError(f"Truncated {key} list in save file for {character_name}.")
+            char_data[key] = [strings[index] for index in references[position + 1:end]]
+            position = end
+        if position != reference_count:
+            raise InvalidSaveDataError(f"Unexpected trailing data in save file for {character_name}.")
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise InvalidSaveDataError(f"Corrupted binary save file for {character_name}: {e}")
     return char_data
-    pass
 
-def list_saved_characters(save_directory="data/save_games"):
+def _peek_file(file, fields, character_name="character"):
     """
-    Get list of all saved character names
+    Read fields from an open save file (either format), stopping early
     
-    Returns: List of character names (without _save.txt extension)
+    Returns: Dictionary of the fields that were found
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
     """
-    # TODO: Implement this function
-    # Return empty list if directory doesn't exist
-    # Extract character names from filenames
-    if not os.path.exists(save_directory):
-        return []
+    if file.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+        return _peek_binary(file, fields, character_name)
+    file.seek(0)
+    wanted = {field.upper(): field for field in fields}
+    values = {}
+    try:
+        for line in io.TextIOWrapper(file, encoding='utf-8'):
+            key_upper, separator, value_str = line.strip().partition(':')
+            field = wanted.pop(key_upper, None)
+            if field is None:
+                continue
+            value_str = value_str.strip()
+            if field in LIST_SAVE_KEYS:
+                values[field] = value_str.split(',') if value_str else []
+            elif field in INT_SAVE_KEYS:
+                try:
+                    values[field] = int(value_str)
+                except ValueError:
+                    raise InvalidSaveDataError(f"Data type error for key '{key_upper}' in save file. Expected integer, got: '{value_str}'")
+            else:
+                values[field] = value_str
+            if not wanted:
+                break
+    except UnicodeDecodeError as e:
+        raise SaveFileCorruptedError(f"Error reading save file for {character_name}: {e}")
+    return values
 
+def _peek_binary(file, fields, character_name):
+    """
+    _peek_file for a binary save (file is just past the magic)
+    
+    The stats are all in the header; name and class are the first strings
+    of the table, so only lists need the whole file.
+    """
+    data = BINARY_MAGIC + file.read(BINARY_HEADER.size - len(BINARY_MAGIC))
+    if any(field in LIST_SAVE_KEYS for field in fields):
+        character = decode_binary_save(data + file.read(), character_name)
+        return {field: character[field] for field in fields}
     try:
-        file_names = os.listdir(save_directory)
-    except Exception:
-        return []
-    character_names = []
-    for file_name in file_names:
-        if file_name.endswith("_save.txt"):
-            underscore_names = file_name[:-9]
-            space_names = underscore_names.replace("_", " ")
-            character_names.append(space_names.title())
-    return character_names
+        header = BINARY_HEADER.unpack(data)
+        if header[1] != BINARY_VERSION:
+            raise InvalidSaveDataError(f"Unsupported binary save version {header[1]} for {character_name}.")
+        values = {key: value for key, value in zip(INT_SAVE_KEYS, header[2:-3]) if key in fields}
+        text_fields = [field for field in ("name", "class") if field in fields]
+        if text_fields:
+            reference_count = header[-2]
+            name_reference, class_reference = struct.unpack("<2H", file.read(4))
+            file.seek(BINARY_HEADER.size + 2 * reference_count)
+            # Read just far enough into the string table to reach both strings
+            needed = max(name_reference, class_reference) + 1
+            table = b""
+            while table.count(b"\x00") < needed:
+                chunk = file.read(256)
+                if not chunk:
+                    break
+                table += chunk
+            strings = table.split(b"\x00", needed)
+            texts = {"name": strings[name_reference].decode('utf-8'), "class": strings[class_reference].decode('utf-8')}
+            for field in text_fields:
+                values[field] = texts[field]
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise InvalidSaveDataError(f"Corrupted binary save file for {character_name}: {e}")
+    return values
 
-def delete_character(character_name, save_directory="data/save_games"):
+def convert_save(character_name, save_directory="data/save_games", save_format="binary"):
     """
-    Delete a character's save file
+    Rewrite one character's save in save_format
     
-    Returns: True if deleted successfully
-    Raises: CharacterNotFoundError if character doesn't exist
+    Returns: True if converted
+    Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
     """
-    # TODO: Implement character deletion
-    # Verify file exists before attempting deletion
-    file_name = f"{character_name.lower().replace(" ", "_")}_save.txt"
-    full_path = os.path.join(save_directory, file_name)
-    if not os.path.exists(full_path):
-        raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+    character = load_character(character_name, save_directory)
+    return save_character(character, save_directory, save_format)
+
+def convert_saves(save_directory="data/save_games", save_format="binary"):
+    """
+    Rewrite every save in save_directory in save_format
+    
+    Returns: Number of saves converted
+    """
+    converted = 0
+    for character_name in list_saved_characters(save_directory):
+        convert_save(character_name, save_directory, save_format)
+        converted += 1
+    return converted
+
+# ============================================================================
+# CHARACTER JOURNAL
+# ============================================================================
+
+# A journaled character is saved once as a snapshot (its normal save file)
+# and after that each change only appends a line to {key}_save.journal:
+#   BASE<TAB>digest          first line; digest of the snapshot it applies to
+#   S<TAB>key<TAB>value      key was set to value
+#   A<TAB>key<TAB>value      value was appended to list key
+#   R<TAB>key<TAB>value      value was removed from list key
+# load_character replays the journal over the snapshot. Once a journal
+# passes compact_bytes it is folded into a new snapshot (by a background
+# thread unless background=False). A journal whose digest doesn't match
+# the snapshot is left over from before a full save and is ignored.
+# A character's journal lives in its journal slot, so it goes away with
+# the character. The save manifest is only updated by compactions (and
+# disable_journal), so list_character_summaries can lag behind a
+# journaled character's gold and level until the next one.
+JOURNAL_SUFFIX = "_save.journal"
+JOURNAL_COMPACT_BYTES = 16 * 1024
+
+_journals_lock = threading.Lock()
+
+def get_journal_path(save_path):
+    """Path of the journal belonging to the save at save_path"""
+    return save_path[:-len(SAVE_SUFFIX)] + JOURNAL_SUFFIX
+
+def _snapshot_digest(data):
+    """Digest tying a journal to the snapshot bytes it applies to"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def discard_journal(save_path):
+    """Delete the journal for a save, if it has one"""
     try:
-        os.remove(full_path)
-    except OSError as e:
-        raise OSError(f"Could not delete file at {full_path}. Details: {e}")
+        os.remove(get_journal_path(save_path))
+    except FileNotFoundError:
+        pass
+
+class CharacterJournal:
+    """Append-only change log for one character (see enable_journal)"""
+
+    def __init__(self, character, save_directory, save_format=None, compact_bytes=JOURNAL_COMPACT_BYTES, fsync=False, background=True):
+        """Write the first snapshot and open an empty journal"""
+        self.character = character
+        self.save_directory = save_directory
+        self.save_format = save_format
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self.background = background
+        self.size = 0
+        self.compactions = 0
+        self._file = None
+        self._lock = threading.RLock()
+        self.compact()
+
+    def _write(self, line):
+        """Append one record, then compact if the journal has grown too big"""
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.size += len(line)
+        if self.size >= self.compact_bytes:
+            if self.background:
+                _compactor.request(self)
+            else:
+                self.compact()
+
+    def record_set(self, keys):
+        """Record the current values of keys"""
+        with self._lock:
+            for key in keys:
+                self._write(f"S\t{key}\t{self.character[key]}\n")
+
+    def append(self, key, value):
+        """Append value to list key and record it"""
+        with self._lock:
+            self.character[key].append(value)
+            self._write(f"A\t{key}\t{value}\n")
+
+    def remove(self, key, value):
+        """Remove value from list key and record it"""
+        with self._lock:
+            self.character[key].remove(value)
+            self._write(f"R\t{key}\t{value}\n")
+
+    def compact(self):
+        """Write the character as a new snapshot and start an empty journal"""
+        # The save lock comes before self._lock so a character_session
+        # compacting on another thread can't deadlock with us
+        with lock_character(self.character["name"], self.save_directory), self._lock:
+            data = encode_save(self.character, self.save_format)
+            full_path = get_save_path(self.character["name"], self.save_directory)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            character_cache.invalidate((self.save_directory, get_save_key(self.character["name"])))
+            write_save_file(full_path, data, self.fsync)
+            journal_path = get_journal_path(full_path)
+            write_save_file(journal_path, f"BASE\t{_snapshot_digest(data)}\n".encode('utf-8'), self.fsync)
+            if self._file is not None:
+                self._file.close()
+            self._file = open(journal_path, 'a', encoding='utf-8')
+            self.size = 0
+            self.compactions += 1
+            record_saves(self.save_directory, [self.character])
+
+    def close(self):
+        """Fold the journal into the snapshot and stop journaling"""
+        with lock_character(self.character["name"], self.save_directory), self._lock:
+            self.compact()
+            self._file.close()
+            self._file = None
+            discard_journal(get_save_path(self.character["name"], self.save_directory))
+
+class JournalCompactor:
+    """Background thread that compacts journals that have grown too big"""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def request(self, journal):
+        """Queue journal for compaction (starting the thread if needed)"""
+        with self._lock:
+            self._pending[id(journal)] = journal
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="JournalCompactor", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        # The thread exits once the queue is empty; request() starts a new one
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+                    key, journal = self._pending.popitem()
+                try:
+                    # Same lock order as compact(): the save lock first
+                    with lock_character(journal.character["name"], journal.save_directory), journal._lock:
+                        if journal._file is not None and journal.size >= journal.compact_bytes:
+                            journal.compact()
+                except (OSError, KeyError, ValueError, GameError) as e:
+                    # Still over the limit, so the next append asks again
+                    print(f"Journal compaction failed for {journal.character.get('name')}: {e}")
+        finally:
+            # If the loop dies, let request() start a new thread
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def wait(self, timeout=5.0):
+        """Block until every queued journal is compacted (for tests and shutdown)"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+_compactor = JournalCompactor()
+
+def enable_journal(character, save_directory="data/save_games", save_format=None, compact_bytes=JOURNAL_COMPACT_BYTES, fsync=False, background=True):
+    """
+    Start journaling character's changes instead of rewriting its save
+    
+    Writes a fresh snapshot first. From then on add_gold, gain_experience,
+    heal_character, revive_character and the inventory and quest functions
+    each append one small record; save_character compacts.
+    
+    Returns: The CharacterJournal
+    Raises: TypeError if character isn't a Character
+    """
+    if not isinstance(character, Character):
+        raise TypeError("Only Character objects (from create_character or load_character) can be journaled")
+    with _journals_lock:
+        journal = getattr(character, "journal", None)
+        if journal is not None:
+            return journal
+        journal = character.journal = CharacterJournal(character, save_directory, save_format, compact_bytes, fsync, background)
+        return journal
+
+def disable_journal(character):
+    """
+    Stop journaling character, folding its journal into the save
+    
+    Returns: True if the character was being journaled
+    """
+    with _journals_lock:
+        journal = getattr(character, "journal", None)
+        if journal is None:
+            return False
+        character.journal = None
+    journal.close()
+    return True
+
+def get_journal(character):
+    """The character's CharacterJournal, or None if it isn't journaled"""
+    return getattr(character, "journal", None)
+
+def journal_set(character, *keys):
+    """Record new values of keys if character is journaled"""
+    journal = get_journal(character)
+    if journal is not None:
+        journal.record_set(keys)
+
+def journal_append(character, key, value):
+    """Append value to character[key], recording it if character is journaled"""
+    journal = get_journal(character)
+    if journal is None:
+        character[key].append(value)
+    else:
+        journal.append(key, value)
+
+def journal_remove(character, key, value):
+    """Remove value from character[key], recording it if character is journaled"""
+    journal = get_journal(character)
+    if journal is None:
+        character[key].remove(value)
+    else:
+        journal.remove(key, value)
+
+def replay_journal(character, snapshot_data, journal_path):
+    """
+    Apply a journal to a character loaded from snapshot_data
+    
+    A half-written last record (from a crash mid-append) is skipped.
+    
+    Returns: True if the journal applied to this snapshot
+    Raises: SaveFileCorruptedError if the journal can't be read,
+            InvalidSaveDataError for a malformed record
+    """
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as file:
+            lines = file.read().split("\n")
+    except FileNotFoundError:
+        return False
+    except (OSError, UnicodeDecodeError) as e:
+        raise SaveFileCorruptedError(f"Error reading journal {journal_path}: {e}")
+    # The last piece is '' after a complete record, or a torn record
+    lines.pop()
+    if not lines or lines[0] != f"BASE\t{_snapshot_digest(snapshot_data)}":
+        return False
+    for line_num, line in enumerate(lines[1:], 2):
+        try:
+            operation, key, value = line.split("\t", 2)
+            if operation == "S":
+                character[key] = int(value) if key in INT_SAVE_KEYS else value
+            elif operation == "A":
+                character[key].append(value)
+            elif operation == "R":
+                if value in character[key]:
+                    character[key].remove(value)
+            else:
+                raise ValueError(f"unknown record {operation}")
+        except (ValueError, KeyError, AttributeError) as e:
+            raise InvalidSaveDataError(f"Corrupted journal line {line_num} in {journal_path}: {e}")
     return True
 
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
 
-def gain_experience(character, xp_amount):
+# Experience needed per level (level L → L+1 at L * LEVEL_XP_STEP total XP)
+LEVEL_XP_STEP = 100
+# Stat increases for each level gained
+LEVEL_UP_GAINS = {"max_health": 10, "strength": 2, "magic": 2}
+# Called as listener(character, old_level, new_level) once per level-up event
+level_up_listeners = []
+
+def gain_experience(character, xp_amount, announce=True):
     """
     Add experience to character and handle level ups
     
@@ -244,6 +1823,10 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    Any number of levels is gained in one step (see level_for_experience),
+    with a single announcement for all of them. announce=False skips the
+    message (bulk imports); level_up_listeners are still told.
+    
     Raises: CharacterDeadError if character health is 0
     """
     # TODO: Implement experience gain and leveling
@@ -254,19 +1837,38 @@ def gain_experience(character, xp_amount):
     if character["health"] <= 0:
         raise CharacterDeadError(f"{character['name']} is dead and cannot gain experience.")
     character["experience"] += xp_amount
-    while True:
-        current_level = character["level"]
-        level_up_xp = current_level * 100
-        if character["experience"] < level_up_xp:
-            break
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
+    old_level = character["level"]
+    new_level = max(old_level, level_for_experience(character["experience"]))
+    if new_level > old_level:
+        levels_gained = new_level - old_level
+        character["level"] = new_level
+        for stat_name, gain in LEVEL_UP_GAINS.items():
+            character[stat_name] += gain * levels_gained
         character["health"] = character["max_health"]
-        print(f"{character["name"]} has reached level {character["level"]}!")
+        if announce:
+            if levels_gained == 1:
+                print(f"{character["name"]} has reached level {new_level}!")
+            else:
+                print(f"{character["name"]} has reached level {new_level}! (levels {old_level + 1}-{new_level})")
+        for listener in level_up_listeners:
+            listener(character, old_level, new_level)
+        journal_set(character, "experience", "level", "max_health", "strength", "magic", "health")
+    else:
+        journal_set(character, "experience")
     return character
 
+def level_for_experience(experience):
+    """
+    Level a character with this much total experience has earned
+    
+    Leveling from level L takes L * LEVEL_XP_STEP total experience, so the
+    thresholds are STEP, 2*STEP, 3*STEP, ... and the level is found by
+    division instead of stepping through the levels one at a time.
+    
+    Returns: Level (at least 1)
+    """
+    return max(experience, 0) // LEVEL_XP_STEP + 1
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -285,6 +1887,7 @@ def add_gold(character, amount):
     if new_total < 0:
         raise ValueError(f"{character['name']} doesn't have enough gold.")
     character["gold"] = new_total
+    journal_set(character, "gold")
     return new_total
 
 def heal_character(character, amount):
@@ -307,6 +1910,7 @@ def heal_character(character, amount):
         final_health = potential_health
         
     character["health"] = final_health
+    journal_set(character, "health")
     heal_amount = final_health - original_health
     return heal_amount
 
@@ -334,6 +1938,7 @@ def revive_character(character):
     max = character["max_health"]
     rev_health = max // 2
     character["health"] = rev_health
+    journal_set(character, "health")
     return True
 
 # ============================================================================
@@ -369,6 +1974,12 @@ def validate_character_data(character):
         "active_quests": list,
         "completed_quests": list
     }
+    if isinstance(character, Character):
+        # Types were checked when the fields were assigned
+        missing_keys = character.missing_keys()
+        if missing_keys:
+            raise InvalidSaveDataError(f"Missing required field: '{missing_keys[0]}'")
+        return True
     for key in required_keys:
         if key not in character:
             raise InvalidSaveDataError(f"Missing required field: '{key}'")
@@ -0,0 +1,309 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Pool Module
+
+This module runs character operations over a whole population at once.
+A CharacterPool copies the numeric stats of many characters into one
+column per stat (NumPy arrays when NumPy is installed, array.array
+otherwise), so server-wide events like "heal everyone at dawn" or
+"double XP weekend" are a few column operations instead of a loop over
+every character dictionary. sync() writes the changes back.
+
+Usage:
+    pool = CharacterPool(characters)
+    pool.heal_character(50)
+    pool.gain_experience(payouts)     # one amount per character
+    pool.sync()
+"""
+
+import numbers
+from array import array
+from itertools import repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from character_manager import LEVEL_XP_STEP, LEVEL_UP_GAINS, journal_set
+
+# Stats kept as columns (everything else stays on the characters)
+POOL_STATS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+POOL_BACKENDS = ("numpy", "array")
+
+def default_backend():
+    """'numpy' if NumPy is installed, otherwise 'array'"""
+    return "numpy" if numpy is not None else "array"
+
+class CharacterPool:
+    """
+    Column-per-stat view of a list of characters
+
+    Row i is self.characters[i]. Batch methods take rows= (a sequence of
+    distinct row indexes; None means every row) and amounts that are
+    either one number for everyone or one number per selected row.
+    Changes stay in the columns until sync() writes them to the characters;
+    only the rows an operation selected are written back.
+    """
+
+    def __init__(self, characters, backend=None):
+        """
+        Args:
+            characters: Character dictionaries (or Character objects)
+            backend: "numpy", "array", or None for default_backend()
+
+        Raises: ValueError for an unknown backend, or "numpy" without NumPy
+        """
+        if backend is None:
+            backend = default_backend()
+        if backend not in POOL_BACKENDS:
+            raise ValueError(f"Unknown pool backend '{backend}'. Use one of: {', '.join(POOL_BACKENDS)}")
+        if backend == "numpy" and numpy is None:
+            raise ValueError("The numpy pool backend needs NumPy installed.")
+        self.backend = backend
+        self.characters = list(characters)
+        self.columns = {}
+        # stat → set of changed rows, or None when every row changed
+        self._dirty = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-read every stat from the characters, dropping unsynced changes"""
+        for stat in POOL_STATS:
+            values = [character[stat] for character in self.characters]
+            if self.backend == "numpy":
+                self.columns[stat] = numpy.array(values, dtype=numpy.int64)
+            else:
+                self.columns[stat] = array('q', values)
+        self._dirty.clear()
+
+    def sync(self):
+        """
+        Write changed stats back into the characters
+
+        Only rows an operation selected are touched, and journaled
+        characters get just their changed stats journaled.
+
+        Returns: Names of the stats that were written
+        """
+        stats = [stat for stat in POOL_STATS if stat in self._dirty]
+        if not stats:
+            return stats
+        values = {stat: self.columns[stat].tolist() for stat in stats}
+        if all(self._dirty[stat] is None for stat in stats):
+            for row, character in enumerate(self.characters):
+                for stat in stats:
+                    character[stat] = values[stat][row]
+                journal_set(character, *stats)
+        else:
+            row_stats = {}
+            for stat in stats:
+                rows = self._dirty[stat]
+                for row in range(len(self.characters)) if rows is None else rows:
+                    row_stats.setdefault(row, []).append(stat)
+            for row in sorted(row_stats):
+                character = self.characters[row]
+                for stat in row_stats[row]:
+                    character[stat] = values[stat][row]
+                journal_set(character, *row_stats[row])
+        self._dirty.clear()
+        return stats
+
+    def _mark_dirty(self, stats, rows):
+        """Remember that stats changed in rows (None for every row)"""
+        if rows is not None:
+            rows = rows.tolist() if hasattr(rows, "tolist") else rows
+        for stat in stats:
+            if rows is None:
+                self._dirty[stat] = None
+            elif self._dirty.get(stat, ()) is not None:
+                self._dirty.setdefault(stat, set()).update(rows)
+
+    def __len__(self):
+        return len(self.characters)
+
+    def stats(self, row):
+        """Current stats of one row as a dictionary"""
+        return {stat: int(self.columns[stat][row]) for stat in POOL_STATS}
+
+    # ========================================================================
+    # ROW SELECTION
+    # ========================================================================
+
+    def _select(self, rows):
+        """NumPy index for rows (a slice for everyone)"""
+        if rows is None:
+            return slice(None)
+        return numpy.asarray(rows, dtype=numpy.intp)
+
+    def _row_list(self, rows):
+        """Row indexes for the array backend"""
+        return range(len(self.characters)) if rows is None else rows
+
+    def _selected_rows(self, rows, mask):
+        """Row numbers picked out by a NumPy mask over the selection"""
+        if rows is None:
+            return numpy.flatnonzero(mask).tolist()
+        return numpy.asarray(rows)[mask].tolist()
+
+    @staticmethod
+    def _amounts(amount, count):
+        """One amount per selected row, from a number or a sequence"""
+        if isinstance(amount, numbers.Integral):
+            return repeat(amount, count)
+        if len(amount) != count:
+            raise ValueError(f"Expected {count} amounts, got {len(amount)}")
+        return amount
+
+    # ========================================================================
+    # BATCH OPERATIONS
+    # ========================================================================
+
+    def is_character_dead(self, rows=None):
+        """
+        Batched character_manager.is_character_dead
+
+        Returns: One True/False per selected row (a NumPy bool array with
+                 the numpy backend)
+        """
+        health = self.columns["health"]
+        if self.backend == "numpy":
+            return health[self._select(rows)] <= 0
+        return [health[row] <= 0 for row in self._row_list(rows)]
+
+    def gain_experience(self, xp_amount, rows=None):
+        """
+        Batched character_manager.gain_experience
+
+        Dead characters are skipped instead of raising CharacterDeadError.
+        Level-ups follow the same rules (any number of levels at once,
+        health restored), but there are no announcements and
+        level_up_listeners aren't called.
+
+        Returns: Rows that leveled up
+        """
+        columns = self.columns
+        self._mark_dirty(("experience", "level", "health") + tuple(LEVEL_UP_GAINS), rows)
+        if self.backend == "numpy":
+            selection = self._select(rows)
+            health = columns["health"][selection]
+            alive = health > 0
+            experience = columns["experience"][selection] + numpy.where(alive, xp_amount, 0)
+            old_level = columns["level"][selection]
+            new_level = numpy.maximum(old_level, numpy.maximum(experience, 0) // LEVEL_XP_STEP + 1)
+            levels_gained = new_level - old_level
+            columns["experience"][selection] = experience
+            columns["level"][selection] = new_level
+            for stat_name, gain in LEVEL_UP_GAINS.items():
+                columns[stat_name][selection] += gain * levels_gained
+            leveled = levels_gained > 0
+            columns["health"][selection] = numpy.where(leveled, columns["max_health"][selection], health)
+            return self._selected_rows(rows, leveled)
+
+        row_list = self._row_list(rows)
+        health, experience, level, max_health = (columns[stat] for stat in ("health", "experience", "level", "max_health"))
+        gains = [(columns[stat_name], gain) for stat_name, gain in LEVEL_UP_GAINS.items()]
+        leveled = []
+        for row, xp in zip(row_list, self._amounts(xp_amount, len(row_list))):
+            if health[row] <= 0:
+                continue
+            experience[row] += xp
+            new_level = max(experience[row], 0) // LEVEL_XP_STEP + 1
+            if new_level > level[row]:
+                levels_gained = new_level - level[row]
+                level[row] = new_level
+                for column, gain in gains:
+                    column[row] += gain * levels_gained
+                health[row] = max_health[row]
+                leveled.append(row)
+        return leveled
+
+    def heal_character(self, amount, rows=None):
+        """
+        Batched character_manager.heal_character (health stops at max_health)
+
+        Returns: Amount each selected row was healed
+        """
+        health, max_health = self.columns["health"], self.columns["max_health"]
+        self._mark_dirty(("health",), rows)
+        if self.backend == "numpy":
+            selection = self._select(rows)
+            before = health[selection].copy()
+            after = numpy.minimum(before + amount, max_health[selection])
+            health[selection] = after
+            return after - before
+        row_list = self._row_list(rows)
+        healed = array('q')
+        for row, heal_amount in zip(row_list, self._amounts(amount, len(row_list))):
+            final_health = min(health[row] + heal_amount, max_health[row])
+            healed.append(final_health - health[row])
+            health[row] = final_health
+        return healed
+
+    def add_gold(self, amount, rows=None):
+        """
+        Batched character_manager.add_gold
+
+        Nothing changes unless every selected row can afford it.
+
+        Returns: New gold totals of the selected rows
+        Raises: ValueError if any total would be negative
+        """
+        gold = self.columns["gold"]
+        if self.backend == "numpy":
+            selection = self._select(rows)
+            new_totals = gold[selection] + amount
+            broke = numpy.flatnonzero(new_totals < 0)
+            if broke.size:
+                raise ValueError(f"{broke.size} character(s) don't have enough gold.")
+            gold[selection] = new_totals
+        else:
+            row_list = self._row_list(rows)
+            new_totals = array('q', (gold[row] + gold_amount for row, gold_amount in zip(row_list, self._amounts(amount, len(row_list)))))
+            broke = sum(1 for total in new_totals if total < 0)
+            if broke:
+                raise ValueError(f"{broke} character(s) don't have enough gold.")
+            for row, total in zip(row_list, new_totals):
+                gold[row] = total
+        self._mark_dirty(("gold",), rows)
+        return new_totals
+
+    def revive_character(self, rows=None):
+        """
+        Batched character_manager.revive_character (health = max_health // 2)
+
+        Args:
+            rows: Rows to revive; None means every dead row, so living
+                  characters aren't set back to half health
+
+        Returns: Number of rows revived
+        """
+        health, max_health = self.columns["health"], self.columns["max_health"]
+        if self.backend == "numpy":
+            selection = numpy.flatnonzero(health <= 0) if rows is None else self._select(rows)
+            health[selection] = max_health[selection] // 2
+            self._mark_dirty(("health",), selection)
+            return len(selection)
+        row_list = [row for row in range(len(health)) if health[row] <= 0] if rows is None else rows
+        for row in row_list:
+            health[row] = max_health[row] // 2
+        self._mark_dirty(("health",), row_list)
+        return len(row_list)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== CHARACTER POOL TEST ===")
+
+    import character_manager
+
+    heroes = [character_manager.create_character(f"Pool{number}", "Warrior") for number in range(5)]
+    heroes[0]["health"] = 0
+    pool = CharacterPool(heroes)
+    print(f"Backend: {pool.backend}, dead: {list(pool.is_character_dead())}")
+    print(f"Revived: {pool.revive_character()}")
+    print(f"Leveled up: {pool.gain_experience(250)}")
+    pool.sync()
+    print(f"{heroes[1]['name']}: level {heroes[1]['level']}, health {heroes[1]['health']}")
@@ -9,6 +9,7 @@ AI Usage: [Document any AI assistance used]
 Handles combat mechanics
 """
 import random
+from character_manager import journal_set
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -191,6 +192,7 @@ class SimpleBattle:
                 print(description)
             elif action == "healed":
                 self.character['health'] = value
+                journal_set(self.character, 'health')
                 print(description)
             else:
                 print(f"Error: Unknown special ability result: {action}")
@@ -256,6 +258,8 @@ class SimpleBattle:
             target['health'] = 0
         else:
             target['health'] = new_health
+        # Journaled characters record the hit (enemies are never journaled)
+        journal_set(target, 'health')
 
         if target['health'] == 0:
             print(f"{target['name']} has been defeated!")
@@ -374,7 +378,8 @@ def cleric_heal(character):
         final_health = max_health
     else:
         final_health = potential_health
-    character["health"] = final_health    
+    character["health"] = final_health
+    journal_set(character, "health")
     return final_health
     
 
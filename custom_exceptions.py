@@ -123,3 +123,6 @@ class InvalidSaveDataError(GameError):
     """Raised when save file contains invalid data"""
     pass
 
+class SaveLockTimeoutError(GameError):
+    """Raised when a save stays locked by another process past the timeout"""
+    pass
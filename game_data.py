@@ -10,17 +10,28 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import re
+import sys
+import mmap
+import pickle
+import hashlib
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from game_records import Quest, Item, Effect
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Bump this whenever the parsed record layout changes so old caches are rebuilt
+CACHE_VERSION = 2
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=True, lazy=False, workers=None):
     """
     Load quest data from file
     
@@ -33,7 +44,13 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    With use_cache=True the parsed quests are also stored in a compiled
+    cache next to the file and reused while the file is unchanged.
+    With lazy=True a LazyQuestDict is returned instead, which only parses
+    a quest the first time it is looked up. workers > 1 parses the file
+    in that many processes at once.
+    
+    Returns: Dictionary of quests {quest_id: Quest}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
@@ -41,56 +58,22 @@ def load_quests(filename="data/quests.txt"):
     # - FileNotFoundError → raise MissingDataFileError
     # - Invalid format → raise InvalidDataFormatError
     # - Corrupted/unreadable data → raise CorruptedDataError
-    required_keys = ["QUEST_ID", "TITLE", "DESCRIPTION", "REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL", "PREREQUISITE"]
+    if lazy:
+        return LazyQuestDict(filename)
+    if use_cache:
+        return _load_cached(filename, lambda path: load_quests(path, use_cache=False, workers=workers))
+    if workers and workers > 1:
+        quest_pairs = _iter_parallel(filename, QUEST_SCHEMA, workers)
+    else:
+        quest_pairs = iter_quests(filename)
     all_quests = {}
-    try:
-        with open(filename, 'r') as file:
-            file_content = file.read()
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Quest file not found at: {filename}")
-    except IOError as e:
-        raise CorruptedDataError(f"Could not read quest file: {e}")
-    quest_blocks = []
-    raw_blocks = file_content.split('\n\n')
-    for block in raw_blocks:
-        clean_block = block.strip()
-        if clean_block:
-            quest_blocks.append(clean_block)
-
-    for block in quest_blocks:
-        quest_data = {}
-        lines = block.split('\n')
-        for line in lines:
-            if ":" in line:
-                try:
-                    key, value_text = line.split(":", 1)
-                    key = key.strip()
-                    value = value_text.strip()
-                    quest_data[key] = value
-                except ValueError:
-                    raise InvalidDataFormatError(f"Corrupted key-value line in quest block: {line}")
-        # Following two lines suggested by Google Gemini due to my code being flawed and stopping on the first missing key. This goes through and collects all of them.
-        if not all(key in quest_data for key in required_keys):
-            missing_keys = [key for key in required_keys if key not in quest_data]
-            if missing_keys:
-                    raise InvalidDataFormatError(f"Missing required keys in a quest block: {','.join(missing_keys)}")
-        quest_id = quest_data['QUEST_ID']
+    for quest_id, quest_data in quest_pairs:
         if quest_id in all_quests:
             raise InvalidDataFormatError(f"Duplicate quest id found: {quest_id}")
-        try:
-            quest_data['REWARD_XP'] = int(quest_data['REWARD_XP'])
-            quest_data['REWARD_GOLD'] = int(quest_data['REWARD_GOLD'])
-            quest_data['REQUIRED_LEVEL'] = int(quest_data['REQUIRED_LEVEL'])
-        except ValueError:
-            raise InvalidDataFormatError(f"Non-integer value found for XP, GOLD, or LEVEL in quest: {quest_id}")
-        if quest_data['PREREQUISITE'].upper() == 'NONE':
-            quest_data['PREREQUISITE'] = None
-        # Google Gemini suggested for redundancy.
-        del quest_data['QUEST_ID']
         all_quests[quest_id] = quest_data
     return all_quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=True, lazy=False, workers=None):
     """
     Load item data from file
     
@@ -102,64 +85,74 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    use_cache, lazy and workers work the same way as in load_quests.
+    
+    Returns: Dictionary of items {item_id: Item}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
     # Must handle same exceptions as load_quests
-    required_keys = ["ITEM_ID", "NAME", "TYPE", "EFFECT", "COST", "DESCRIPTION"]
+    if lazy:
+        return LazyItemDict(filename)
+    if use_cache:
+        return _load_cached(filename, lambda path: load_items(path, use_cache=False, workers=workers))
+    if workers and workers > 1:
+        item_pairs = _iter_parallel(filename, ITEM_SCHEMA, workers)
+    else:
+        item_pairs = iter_items(filename)
     all_items = {}
+    for item_id, item_data in item_pairs:
+        if item_id in all_items:
+            raise InvalidDataFormatError(f"Duplicate item ID found: {item_id}")
+        all_items[item_id] = item_data
+    return all_items
 
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one block at a time
+    
+    Reads the file line by line and yields each quest as soon as its
+    block ends, so memory use does not grow with the size of the file.
+    Duplicate ids are not checked here (load_quests does that).
+    
+    Yields: (quest_id, Quest) tuples
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
     try:
-        with open(filename, 'r') as file:
-            file_content = file.read()
+        file = open(filename, 'r')
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Quest file not found at: {filename}")
+    except IOError as e:
+        raise CorruptedDataError(f"Could not read quest file: {e}")
+    with file:
+        try:
+            for block in iter_blocks(file):
+                yield QUEST_SCHEMA.build(block)
+        except IOError as e:
+            raise CorruptedDataError(f"Could not read quest file: {e}")
+
+def iter_items(filename="data/items.txt"):
+    """
+    Stream items from file one block at a time
+    
+    Works like iter_quests: each item is yielded as soon as its block
+    ends and duplicate ids are left to load_items.
+    
+    Yields: (item_id, Item) tuples
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    try:
+        file = open(filename, 'r')
     except FileNotFoundError:
         raise MissingDataFileError(f"Item file not found at: {filename}")
     except IOError as e:
         raise CorruptedDataError(f"Could not read item file: {e}")
-    item_blocks = []
-    raw_blocks = file_content.split('\n\n')
-    for block in raw_blocks:
-        clean_block = block.strip()
-        if clean_block:
-            item_blocks.append(clean_block)
-    for block in item_blocks:
-        item_data = {}
-        lines = block.split('\n')
-        for line in lines:
-            if ":" in line:
-                try:
-                    key, value_text = line.split(":", 1)
-                    key = key.strip()
-                    value = value_text.strip()
-                    item_data[key] = value
-                except ValueError:
-                    raise InvalidDataFormatError(f"Corrupted key-value line in item block: {line}")
-        missing_keys = [key for key in required_keys if key not in item_data]
-        if missing_keys:
-            raise InvalidDataFormatError(f"Missing required keys: {', '.join(missing_keys)}")
-        item_id = item_data['ITEM_ID']
-        if item_id in all_items:
-            raise InvalidDataFormatError(f"Duplicate item ID found: {item_id}")
-        
-        try: 
-            item_data['COST'] = int(item_data['COST'])
-        except ValueError:
-            raise InvalidDataFormatError(f"Non-integer value found for COST in item: {item_id}")
-        effect_string = item_data['EFFECT']
-        if ":" not in effect_string:
-            raise InvalidDataFormatError(f"Invalid EFFECT format in item {item_id}. Must be 'stat:value'.")
+    with file:
         try:
-            effect_stat, effect_value = effect_string.split(":", 1)
-            item_data['EFFECT'] = {
-                "stat": effect_stat.strip(),
-                "value": int(effect_value.strip())
-            }
-        except ValueError:
-            raise InvalidDataFormatError(f"Non-integer value found in EFFECT for item: {item_id}")
-        del item_data['ITEM_ID']
-        all_items[item_id] = item_data
-    return all_items
+            for block in iter_blocks(file):
+                yield ITEM_SCHEMA.build(block)
+        except IOError as e:
+            raise CorruptedDataError(f"Could not read item file: {e}")
 
 def validate_quest_data(quest_dict):
     """
@@ -168,30 +161,16 @@ def validate_quest_data(quest_dict):
     Required fields: quest_id, title, description, reward_xp, 
                     reward_gold, required_level, prerequisite
     
+    Numeric fields are converted to integers and a NONE prerequisite to
+    None, in place, following QUEST_SCHEMA.
+    
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields
     """
     # TODO: Implement validation
     # Check that all required keys exist
     # Check that numeric values are actually numbers
-    required_keys = ["QUEST_ID", "TITLE", "DESCRIPTION", "REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL", "PREREQUISITE"]
-    num_keys = ["REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL",]
-    missing_keys = [key for key in required_keys if key not in quest_dict]
-    if missing_keys:
-        raise InvalidDataFormatError(f"Missing required keys: {', '.join(missing_keys)}")
-    
-    for key in num_keys:
-        value = quest_dict[key]
-        try:
-            quest_dict[key] = int(value)
-        except ValueError:
-            raise InvalidDataFormatError(f"Value for '{key}' must be an integer, found '{value}'")
-    
-    prereq_value = quest_dict['PREREQUISITE']
-    if isinstance(prereq_value, str) and prereq_value.upper() == "NONE":
-        quest_dict['PREREQUISITE'] = None
-    
-    return True
+    return QUEST_SCHEMA.validate(quest_dict)
 
 def validate_item_data(item_dict):
     """
@@ -200,22 +179,13 @@ def validate_item_data(item_dict):
     Required fields: item_id, name, type, effect, cost, description
     Valid types: weapon, armor, consumable
     
+    Text values are converted in place following ITEM_SCHEMA.
+    
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
     # TODO: Implement validation
-    required_keys = ["ITEM_ID", "NAME", "TYPE", "EFFECT", "COST", "DESCRIPTION"]
-    valid_types = ["weapon", "armor", "consumable"]
-    
-    missing_keys = [key for key in required_keys if key not in item_dict]
-    if missing_keys:
-        raise InvalidDataFormatError(f"Missing required keys: {', '.join(missing_keys)}")
-    
-    item_type = item_dict['TYPE'].lower()
-    if item_type not in valid_types:
-        valid_options = ', '.join(valid_types)
-        raise InvalidDataFormatError(f"Invalid item TYPE '{item_dict['TYPE']}'. Must be one of: {valid_options}")
-    return True
+    return ITEM_SCHEMA.validate(item_dict)
 
 def create_default_data_files():
     """
@@ -303,39 +273,7 @@ def parse_quest_block(lines):
     # Split each line on ": " to get key-value pairs
     # Convert numeric strings to integers
     # Handle parsing errors gracefully
-    quest_data = {}
-    for line in lines:
-        clean_line = line.strip()
-        if not clean_line:
-            continue
-        if ":" in clean_line:
-            try:
-                key, value_text = line.split(":", 1)
-                key = key.strip()
-                value = value_text.strip()
-                if not key:
-                    raise InvalidDataFormatError(f"Found empty key in line: {clean_line}")
-                quest_data[key] = value
-
-            except ValueError:
-                raise InvalidDataFormatError(f"Could not parse key_value pair in line: {clean_line}")
-        else:
-            raise InvalidDataFormatError(f"Line does not contain a separator (':'): {clean_line}")
-        
-    num_keys = ["REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL",]
-    for key in num_keys:
-        if key in quest_data:
-            value_str = quest_data[key]
-            try:
-                quest_data[key] = int(value_str)
-            except ValueError:
-                raise InvalidDataFormatError(f"Value for '{key}' must be an integer: '{value_str}'")
-            
-    prereq_key = "PREREQUISITE"
-    if prereq_key in quest_data and isinstance(quest_data[prereq_key], str):
-        if quest_data[prereq_key].upper() == "NONE":
-            quest_data[prereq_key] = None
-    return quest_data
+    return QUEST_SCHEMA.parse_lines(lines)
 
 def parse_item_block(lines):
     """
@@ -348,47 +286,472 @@ def parse_item_block(lines):
     Raises: InvalidDataFormatError if parsing fails
     """
     # TODO: Implement parsing logic
-    item_data = {}
+    return ITEM_SCHEMA.parse_lines(lines)
+
+def iter_blocks(lines):
+    """
+    Group lines into blank-line separated blocks
+    
+    Args:
+        lines: Any iterable of lines (an open file works)
+    
+    Yields: List of stripped, non-empty lines for each block
+    """
+    block = []
     for line in lines:
         clean_line = line.strip()
-        if not clean_line:
-            continue
-        if ":" in clean_line:
+        if clean_line:
+            block.append(clean_line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def split_block_ranges(filename, parts):
+    """
+    Split a data file into byte ranges that only break between blocks
+    
+    Each cut point is moved forward to just after the next blank line, so
+    no block is shared by two ranges. Fewer ranges than asked for can be
+    returned for small files.
+    
+    Returns: List of (start, end) byte offsets covering the whole file
+    """
+    file_size = os.path.getsize(filename)
+    cut_points = [0]
+    with open(filename, 'rb') as file:
+        for part in range(1, parts):
+            target = file_size * part // parts
+            if target <= cut_points[-1]:
+                continue
+            file.seek(target)
+            # Finish the line we landed in, then look for a blank line
+            file.readline()
+            while True:
+                line = file.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    break
+            position = file.tell()
+            if cut_points[-1] < position < file_size:
+                cut_points.append(position)
+    cut_points.append(file_size)
+    return [(cut_points[i], cut_points[i + 1]) for i in range(len(cut_points) - 1)]
+
+def _parse_range(filename, start, end, record_name):
+    """
+    Parse the blocks inside one byte range of a data file
+    
+    Runs in a worker process, so it opens the file itself and looks the
+    schema up by name (compiled schemas can't be pickled).
+    
+    Returns: List of (record_id, record_data) pairs in file order
+    """
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        chunk = file.read(end - start).decode()
+    build = SCHEMAS[record_name].build
+    return [build(block) for block in iter_blocks(chunk.split('\n'))]
+
+def _iter_parallel(filename, schema, workers):
+    """
+    Parse a data file across a pool of worker processes
+    
+    The file is cut into a few ranges per worker so a slow range doesn't
+    hold up the rest. Results come back in file order.
+    
+    Yields: (record_id, record_data) pairs
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    record_name = schema.record_name
+    try:
+        ranges = split_block_ranges(filename, workers * 4)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{record_name.title()} file not found at: {filename}")
+    except IOError as e:
+        raise CorruptedDataError(f"Could not read {record_name} file: {e}")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_range, filename, start, end, record_name) for start, end in ranges]
+        for future in futures:
             try:
-                key, value_text = line.split(":", 1)
+                pairs = future.result()
+            except IOError as e:
+                raise CorruptedDataError(f"Could not read {record_name} file: {e}")
+            yield from pairs
+
+def get_cache_path(filename):
+    """
+    Get the path of the compiled cache for a data file
+    
+    Example: "data/quests.txt" → "data/.quests.txt.cache"
+    """
+    directory, base_name = os.path.split(filename)
+    return os.path.join(directory, f".{base_name}.cache")
+
+def _load_cached(filename, parse_file):
+    """
+    Return parsed data for filename, using the compiled cache when fresh
+    
+    The cache is fresh when the file size and mtime match what was stored.
+    If only the mtime changed (file touched or copied) the content hash is
+    checked before deciding to re-parse. Any problem reading or writing
+    the cache just falls back to parsing the text file.
+    """
+    try:
+        file_stat = os.stat(filename)
+    except OSError:
+        # Let the normal loader raise MissingDataFileError/CorruptedDataError
+        return parse_file(filename)
+    cache_path = get_cache_path(filename)
+    cached = _read_cache(cache_path)
+    if cached is not None and cached['size'] == file_stat.st_size:
+        if cached['mtime_ns'] == file_stat.st_mtime_ns:
+            return cached['data']
+        digest = _file_digest(filename)
+        if digest == cached['digest']:
+            _write_cache(cache_path, file_stat, digest, cached['data'])
+            return cached['data']
+    # Hash before parsing so an edit made mid-parse can't be cached as fresh
+    digest = _file_digest(filename)
+    data = parse_file(filename)
+    _write_cache(cache_path, file_stat, digest, data)
+    return data
+
+def _file_digest(filename):
+    """Hash a data file in chunks and return the hex digest"""
+    digest = hashlib.sha1()
+    try:
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except IOError as e:
+        raise CorruptedDataError(f"Could not read data file {filename}: {e}")
+    return digest.hexdigest()
+
+def _read_cache(cache_path):
+    """Load a cache file, returning None if it is missing, old or unreadable"""
+    try:
+        with open(cache_path, 'rb') as file:
+            cached = pickle.load(file)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+        return None
+    return cached
+
+def _write_cache(cache_path, file_stat, digest, data):
+    """Write a cache file atomically; a read-only data directory is not an error"""
+    cached = {
+        'version': CACHE_VERSION,
+        'size': file_stat.st_size,
+        'mtime_ns': file_stat.st_mtime_ns,
+        'digest': digest,
+        'data': data
+    }
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+# ============================================================================
+# RECORD SCHEMAS
+# ============================================================================
+
+def _convert_int(value):
+    """Field type 'int': a whole number"""
+    return int(value)
+
+def _convert_optional(value):
+    """Field type 'optional': text, where NONE means there is no value"""
+    if value.upper() == "NONE":
+        return None
+    return value
+
+def _convert_effect(value):
+    """Field type 'effect': "stat:value" → Effect(stat, int value)"""
+    stat_name, separator, amount = value.partition(":")
+    if not separator:
+        raise ValueError(f"No ':' in effect '{value}'")
+    return Effect(sys.intern(stat_name.strip()), int(amount.strip()))
+
+# field type → (converter, wording for error messages); plain text needs no converter
+FIELD_TYPES = {
+    "str": (None, "text"),
+    "int": (_convert_int, "an integer"),
+    "optional": (_convert_optional, "text or NONE"),
+    "effect": (_convert_effect, "'stat:value' with an integer value"),
+}
+
+class RecordSchema:
+    """
+    Declarative description of one kind of record in a data file
+    
+    fields is a list of (KEY, field_type) pairs using the names in
+    FIELD_TYPES. choices maps a KEY to its allowed values (checked in
+    lower case), and factory(record_id, fields) turns a parsed block into
+    the record object the loaders hand out (a plain dict if None).
+    Creating a schema compiles three functions for it:
+    - build(lines): strict parse used by the loaders → (record_id, record)
+    - parse_lines(lines): lenient parse used by parse_*_block → data
+    - validate(record): check a dictionary and convert its text values
+    
+    Adding a record type (enemies, for example) only needs a new schema
+    passed to register_schema.
+    """
+    
+    def __init__(self, record_name, id_key, fields, choices=None, factory=None):
+        """Check the field specs and compile the parse functions"""
+        self.record_name = record_name
+        self.id_key = id_key
+        self.factory = factory
+        self.fields = list(fields)
+        self.choices = {key: tuple(allowed) for key, allowed in (choices or {}).items()}
+        for key, field_type in self.fields:
+            if field_type not in FIELD_TYPES:
+                raise ValueError(f"Unknown field type '{field_type}' for {record_name} field {key}")
+        self.required_keys = [key for key, field_type in self.fields]
+        self._steps = []
+        for key, field_type in self.fields:
+            converter, wording = FIELD_TYPES[field_type]
+            if converter is not None and key != id_key:
+                self._steps.append((key, converter, wording))
+        self.build = self._compile_build()
+        self.parse_lines = self._compile_parse_lines()
+        self.validate = self._compile_validate()
+    
+    def _compile_convert(self, skip_missing, skip_converted):
+        """
+        Build convert(record, record_id) for this schema's typed fields
+        
+        skip_missing leaves absent keys alone; skip_converted leaves
+        values that are no longer strings alone.
+        """
+        record_name = self.record_name
+        steps = tuple(self._steps)
+        choices = tuple(self.choices.items())
+        
+        def convert(record, record_id):
+            for key, converter, wording in steps:
+                if skip_missing and key not in record:
+                    continue
+                value = record[key]
+                if skip_converted and not isinstance(value, str):
+                    continue
+                try:
+                    record[key] = converter(value)
+                except ValueError:
+                    raise InvalidDataFormatError(f"Value for '{key}' in {record_name} {record_id} must be {wording}, found '{value}'")
+            for key, allowed in choices:
+                value = record.get(key)
+                if isinstance(value, str) and value.lower() not in allowed:
+                    raise InvalidDataFormatError(f"Invalid {record_name} {key} '{value}'. Must be one of: {', '.join(allowed)}")
+        return convert
+    
+    def _missing_keys_error(self, record):
+        """Build the error listing every required key the record lacks"""
+        missing_keys = [key for key in self.required_keys if key not in record]
+        return InvalidDataFormatError(f"Missing required {self.record_name} keys: {', '.join(missing_keys)}")
+    
+    def _compile_build(self):
+        """Strict parse: lines without ':' are ignored, every field is required"""
+        id_key = self.id_key
+        required_set = frozenset(self.required_keys)
+        convert = self._compile_convert(skip_missing=False, skip_converted=False)
+        missing_keys_error = self._missing_keys_error
+        factory = self.factory
+        
+        def build(lines):
+            record = {}
+            for line in lines:
+                key, separator, value = line.partition(":")
+                if separator:
+                    record[key.strip()] = value.strip()
+            if not record.keys() >= required_set:
+                raise missing_keys_error(record)
+            record_id = sys.intern(record.pop(id_key))
+            convert(record, record_id)
+            if factory is not None:
+                return record_id, factory(record_id, record)
+            return record_id, record
+        return build
+    
+    def _compile_parse_lines(self):
+        """Lenient parse: every line needs a key, but fields may be missing"""
+        id_key = self.id_key
+        convert = self._compile_convert(skip_missing=True, skip_converted=False)
+        
+        def parse_lines(lines):
+            record = {}
+            for line in lines:
+                clean_line = line.strip()
+                if not clean_line:
+                    continue
+                key, separator, value = clean_line.partition(":")
+                if not separator:
+                    raise InvalidDataFormatError(f"Line does not contain a separator (':'): {clean_line}")
                 key = key.strip()
-                value = value_text.strip()
                 if not key:
                     raise InvalidDataFormatError(f"Found empty key in line: {clean_line}")
-                item_data[key] = value
-
-            except ValueError:
-                raise InvalidDataFormatError(f"Could not parse key_value pair in line: {clean_line}")
-        else:
-            raise InvalidDataFormatError(f"Line does not contain a separator (':'): {clean_line}")
+                record[key] = value.strip()
+            convert(record, record.get(id_key, "block"))
+            return record
+        return parse_lines
+    
+    def _compile_validate(self):
+        """Validate a dictionary in place, converting any text values"""
+        id_key = self.id_key
+        required_set = frozenset(self.required_keys)
+        convert = self._compile_convert(skip_missing=False, skip_converted=True)
+        missing_keys_error = self._missing_keys_error
         
-    cost_key = "COST"
-    if cost_key in item_data:
-            cost_str = item_data[cost_key]
-            try:
-                item_data[cost_key] = int(cost_str)
-            except ValueError:
-                raise InvalidDataFormatError(f"Value for '{cost_key}' must be an integer: '{cost_str}'")
-            
-    effect_key = "EFFECT"
-    if effect_key in item_data:
-        effect_str = item_data[effect_key]
-        if ":" not in effect_str:
-            raise InvalidDataFormatError(f"Invalid EFFECT format in item {effect_str}. Must be 'stat:value'.")
+        def validate(record):
+            if not record.keys() >= required_set:
+                raise missing_keys_error(record)
+            convert(record, record[id_key])
+            return True
+        return validate
+
+QUEST_SCHEMA = RecordSchema("quest", "QUEST_ID", [
+    ("QUEST_ID", "str"),
+    ("TITLE", "str"),
+    ("DESCRIPTION", "str"),
+    ("REWARD_XP", "int"),
+    ("REWARD_GOLD", "int"),
+    ("REQUIRED_LEVEL", "int"),
+    ("PREREQUISITE", "optional"),
+], factory=Quest.from_fields)
+
+ITEM_SCHEMA = RecordSchema("item", "ITEM_ID", [
+    ("ITEM_ID", "str"),
+    ("NAME", "str"),
+    ("TYPE", "str"),
+    ("EFFECT", "effect"),
+    ("COST", "int"),
+    ("DESCRIPTION", "str"),
+], choices={"TYPE": ["weapon", "armor", "consumable"]}, factory=Item.from_fields)
+
+# record_name → schema; worker processes look schemas up here by name
+SCHEMAS = {}
+
+def register_schema(schema):
+    """
+    Make a schema available to the parallel loader by its record name
+    
+    Returns: The schema, so it can be used as schema = register_schema(...)
+    """
+    SCHEMAS[schema.record_name] = schema
+    return schema
+
+register_schema(QUEST_SCHEMA)
+register_schema(ITEM_SCHEMA)
+
+# ============================================================================
+# LAZY CATALOGS
+# ============================================================================
+
+# One or more blank (or whitespace-only) lines between blocks
+BLOCK_SEPARATOR = re.compile(rb"\n(?:[ \t\r\f\v]*\n)+")
+
+class _LazyCatalog(Mapping):
+    """
+    Read-only mapping over a memory-mapped data file
+    
+    Opening the catalog scans the file once to record where each block
+    starts and ends. A record is only parsed the first time it is looked
+    up, and the parsed result is kept for later lookups.
+    """
+    schema = None
+    
+    def __init__(self, filename):
+        """Map the file and build the {id: (start, end)} block index"""
+        self.filename = filename
+        self.record_name = self.schema.record_name
+        self.id_key = self.schema.id_key.encode()
+        self._index = {}
+        self._parsed = {}
+        self._map = None
         try:
-            effect_stat, effect_value = effect_str.split(":", 1)
-            item_data['EFFECT'] = {
-                "stat": effect_stat.strip(),
-                "value": int(effect_value.strip())
-            }
-        except ValueError:
-            raise InvalidDataFormatError(f"Non-integer value found in EFFECT for item: {item_data['ITEM_ID']}")
-    return item_data
+            with open(filename, 'rb') as file:
+                if os.fstat(file.fileno()).st_size > 0:
+                    self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"{self.record_name.title()} file not found at: {filename}")
+        except (IOError, ValueError) as e:
+            raise CorruptedDataError(f"Could not read {self.record_name} file: {e}")
+        if self._map is not None:
+            self._build_index()
+    
+    def _build_index(self):
+        """Find every block and the id it declares"""
+        id_pattern = re.compile(rb"^[ \t]*" + self.id_key + rb"[ \t]*:[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+        position = 0
+        for separator in BLOCK_SEPARATOR.finditer(self._map):
+            self._index_block(id_pattern, position, separator.start())
+            position = separator.end()
+        self._index_block(id_pattern, position, len(self._map))
+    
+    def _index_block(self, id_pattern, start, end):
+        """Add one block to the index"""
+        match = id_pattern.search(self._map, start, end)
+        if match is None:
+            if self._map[start:end].strip():
+                raise InvalidDataFormatError(f"Missing required {self.record_name} keys: {self.id_key.decode()}")
+            return
+        record_id = match.group(1).decode()
+        if record_id in self._index:
+            raise InvalidDataFormatError(f"Duplicate {self.record_name} id found: {record_id}")
+        self._index[record_id] = (start, end)
+    
+    def __getitem__(self, record_id):
+        try:
+            return self._parsed[record_id]
+        except KeyError:
+            pass
+        start, end = self._index[record_id]
+        if self._map is None:
+            raise CorruptedDataError(f"Catalog for {self.filename} has been closed.")
+        block_text = self._map[start:end].decode()
+        lines = [line.strip() for line in block_text.split('\n') if line.strip()]
+        parsed_id, record_data = self.schema.build(lines)
+        self._parsed[record_id] = record_data
+        return record_data
+    
+    def __contains__(self, record_id):
+        return record_id in self._index
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def close(self):
+        """Unmap the data file; records parsed so far stay available"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class LazyQuestDict(_LazyCatalog):
+    """Quest catalog that parses each quest on first access"""
+    schema = QUEST_SCHEMA
+
+class LazyItemDict(_LazyCatalog):
+    """Item catalog that parses each item on first access"""
+    schema = ITEM_SCHEMA
 
 # ============================================================================
 # TESTING
@@ -0,0 +1,378 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Records Module
+
+This module defines the compact record types the data loaders produce.
+Quest and Item store their fields in __slots__ instead of a dictionary,
+but still support dictionary-style reads (quest['title'], item.get('cost'))
+so the rest of the game can use them like the old quest/item dictionaries.
+Character does the same for player characters, as a MutableMapping since
+characters change during play.
+"""
+
+import sys
+from collections import namedtuple
+from collections.abc import Mapping, MutableMapping
+
+# ============================================================================
+# EFFECTS
+# ============================================================================
+
+class Effect(namedtuple("Effect", ["stat", "value"])):
+    """
+    Parsed item effect, e.g. "strength:5" → Effect(stat='strength', value=5)
+
+    effect['stat'] and effect['value'] work as well as effect.stat, so code
+    written for the old {"stat": ..., "value": ...} dictionaries still works.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key == "stat":
+            return self.stat
+        if key == "value":
+            return self.value
+        if isinstance(key, str):
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """Dictionary-style get for 'stat' and 'value'"""
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+class _Record(Mapping):
+    """
+    Read-only record with a fixed set of fields
+
+    Subclasses list their field names in FIELDS (id first) and declare the
+    same names in __slots__. Keys are matched without regard to case, so
+    record['title'] and record['TITLE'] both work.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    # Text fields with few distinct values; interned so records share them
+    INTERNED = ()
+    _KEYS = {}
+
+    def __init__(self, *values):
+        """Set every field, in FIELDS order"""
+        if len(values) != len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes {len(self.FIELDS)} values, got {len(values)}")
+        for field, value in zip(self.FIELDS, values):
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_fields(cls, record_id, fields):
+        """
+        Build a record from a parsed block
+
+        Args:
+            record_id: The block's id
+            fields: Dictionary of the other fields keyed by upper-case name
+        """
+        values = [record_id]
+        for field in cls.FIELDS[1:]:
+            value = fields[field.upper()]
+            if field in cls.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            values.append(value)
+        return cls(*values)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = {}
+        for field in cls.FIELDS:
+            cls._KEYS[field] = field
+            cls._KEYS[field.upper()] = field
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __getitem__(self, key):
+        field = self._KEYS.get(key)
+        if field is None:
+            if not isinstance(key, str) or key.lower() not in self._KEYS:
+                raise KeyError(key)
+            field = key.lower()
+        return getattr(self, field)
+
+    def __contains__(self, key):
+        if key in self._KEYS:
+            return True
+        return isinstance(key, str) and key.lower() in self._KEYS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def values_tuple(self):
+        """All field values, in FIELDS order"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self.values_tuple() == other.values_tuple()
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash(self.values_tuple())
+
+    def __reduce__(self):
+        return (type(self), self.values_tuple())
+
+    def __repr__(self):
+        shown = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({shown})"
+
+class Quest(_Record):
+    """One quest from quests.txt"""
+    __slots__ = ("quest_id", "title", "description", "reward_xp", "reward_gold", "required_level", "prerequisite")
+    FIELDS = __slots__
+    INTERNED = ("prerequisite",)
+
+class Item(_Record):
+    """One item from items.txt; effect is an Effect"""
+    __slots__ = ("item_id", "name", "type", "effect", "cost", "description")
+    FIELDS = __slots__
+    INTERNED = ("type",)
+
+# ============================================================================
+# CHARACTERS
+# ============================================================================
+
+# Quest lists longer than this get a set-style index for "in" checks;
+# scanning a short list is as fast as hashing and needs no extra memory
+QUEST_INDEX_THRESHOLD = 8
+
+class QuestList(list):
+    """
+    List of quest ids with fast membership tests
+
+    Behaves exactly like a list (order, duplicates, isinstance(..., list)),
+    but once it grows past QUEST_INDEX_THRESHOLD ids, "quest_id in quests"
+    is answered from a count dictionary kept up to date by every change.
+    """
+    __slots__ = ("_index",)
+
+    def __init__(self, quest_ids=()):
+        list.__init__(self, quest_ids)
+        self._index = None
+
+    def _build_index(self):
+        index = {}
+        for quest_id in self:
+            index[quest_id] = index.get(quest_id, 0) + 1
+        self._index = index
+        return index
+
+    def _forget(self, quest_id):
+        count = self._index[quest_id]
+        if count == 1:
+            del self._index[quest_id]
+        else:
+            self._index[quest_id] = count - 1
+
+    def __contains__(self, quest_id):
+        index = self._index
+        if index is None:
+            if len(self) <= QUEST_INDEX_THRESHOLD:
+                return list.__contains__(self, quest_id)
+            index = self._build_index()
+        return quest_id in index
+
+    def append(self, quest_id):
+        list.append(self, quest_id)
+        if self._index is not None:
+            self._index[quest_id] = self._index.get(quest_id, 0) + 1
+
+    def extend(self, quest_ids):
+        list.extend(self, quest_ids)
+        self._index = None
+
+    def insert(self, position, quest_id):
+        list.insert(self, position, quest_id)
+        if self._index is not None:
+            self._index[quest_id] = self._index.get(quest_id, 0) + 1
+
+    def remove(self, quest_id):
+        list.remove(self, quest_id)
+        if self._index is not None:
+            self._forget(quest_id)
+
+    def pop(self, position=-1):
+        quest_id = list.pop(self, position)
+        if self._index is not None:
+            self._forget(quest_id)
+        return quest_id
+
+    def clear(self):
+        list.clear(self)
+        self._index = None
+
+    def __setitem__(self, position, value):
+        list.__setitem__(self, position, value)
+        self._index = None
+
+    def __delitem__(self, position):
+        list.__delitem__(self, position)
+        self._index = None
+
+    def __iadd__(self, quest_ids):
+        self.extend(quest_ids)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._index = None
+        return self
+
+    def copy(self):
+        return QuestList(self)
+
+    def __reduce__(self):
+        return (QuestList, (list(self),))
+
+class Character(MutableMapping):
+    """
+    A player character
+
+    The save fields live in __slots__ (character.gold, character.inventory,
+    ...; the class is character.character_class), so a character takes a
+    fraction of the memory of the old 12-key dictionary. It is also a
+    MutableMapping, so character['gold'] and every other dictionary-style
+    use keeps working. 'equipped' and 'combat_active' have slots too but
+    aren't saved; any other key goes in an extras dictionary made on first
+    use. The journal slot holds the character's CharacterJournal while it
+    is journaled (see character_manager.enable_journal); it isn't a key and
+    isn't copied.
+
+    Assigning through character[key] checks the value's type (int stats,
+    str name/class, lists) and turns quest lists into QuestLists,
+    so a Character can't hold a mistyped field that validation would have
+    to catch later. Attribute assignment skips the checks and is meant for
+    code that already has a value of the right type.
+    """
+    __slots__ = ("name", "character_class", "level", "gold", "health", "max_health", "strength", "magic",
+                 "experience", "inventory", "active_quests", "completed_quests",
+                 "equipped", "combat_active", "extras", "journal")
+    # Slots holding the character's data (everything but journal)
+    _DATA_SLOTS = __slots__[:-1]
+    # Mapping keys that are saved, in save file order
+    KEYS = ("name", "class", "level", "gold", "health", "max_health", "strength", "magic",
+            "experience", "inventory", "active_quests", "completed_quests")
+    # Every key with its own slot (saved or not) and the attribute behind it
+    FIELDS = dict(zip(KEYS + ("equipped", "combat_active"), __slots__))
+    TYPES = {"name": str, "class": str, "inventory": list, "active_quests": QuestList,
+             "completed_quests": QuestList, "equipped": object, "combat_active": object}
+    TYPES.update(dict.fromkeys(("level", "health", "max_health", "strength", "magic", "experience", "gold"), int))
+    # key → (attribute, type), so assignment needs one lookup
+    _SPECS = dict(zip(FIELDS, zip(FIELDS.values(), map(TYPES.get, FIELDS))))
+
+    def __init__(self, fields=(), **more_fields):
+        """Character(mapping_or_pairs, **fields), like dict()"""
+        self.extras = None
+        self.journal = None
+        if more_fields or (type(fields) is not dict and not isinstance(fields, Mapping)):
+            fields = dict(fields, **more_fields)
+        specs = self._SPECS
+        for key, value in fields.items():
+            spec = specs.get(key)
+            if spec is not None and type(value) is spec[1]:
+                setattr(self, spec[0], value)
+            else:
+                self[key] = value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.FIELDS[key])
+        except KeyError:
+            if self.extras is None:
+                raise
+            return self.extras[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        spec = self._SPECS.get(key)
+        if spec is None:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+            return
+        field, expected_type = spec
+        if type(value) is not expected_type:
+            if expected_type is QuestList and isinstance(value, list):
+                value = QuestList(value)
+            elif expected_type is QuestList or not isinstance(value, expected_type):
+                type_name = "list" if expected_type is QuestList else expected_type.__name__
+                raise TypeError(f"Character field '{key}' must be {type_name}, not {type(value).__name__}")
+        setattr(self, field, value)
+
+    def __delitem__(self, key):
+        field = self.FIELDS.get(key)
+        try:
+            if field is None:
+                if self.extras is None:
+                    raise KeyError(key)
+                del self.extras[key]
+            else:
+                delattr(self, field)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        field = self.FIELDS.get(key)
+        if field is None:
+            return self.extras is not None and key in self.extras
+        return hasattr(self, field)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        for key, field in self.FIELDS.items():
+            if hasattr(self, field):
+                yield key
+        if self.extras:
+            yield from list(self.extras)
+
+    def __len__(self):
+        return sum(1 for field in self.FIELDS.values() if hasattr(self, field)) + len(self.extras or ())
+
+    def missing_keys(self):
+        """Save fields that have no value (e.g. from a partial save file)"""
+        return [key for key in self.KEYS if not hasattr(self, self.FIELDS[key])]
+
+    def copy(self):
+        """Copy whose lists (and extras dictionary) can be changed safely"""
+        character = Character.__new__(Character)
+        for field in self._DATA_SLOTS:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+            if isinstance(value, (list, dict)):
+                value = value.copy()
+            setattr(character, field, value)
+        return character
+
+    def __reduce__(self):
+        return (Character, (dict(self),))
+
+    def __repr__(self):
+        return f"Character({dict(self)!r})"
@@ -9,6 +9,11 @@ AI Usage: [Document any AI assistance used]
 This module handles inventory management, item usage, and equipment.
 """
 
+from character_manager import (
+    journal_set,
+    journal_append,
+    journal_remove
+)
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -40,7 +45,7 @@ def add_item_to_inventory(character, item_id):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError(f"Your inventory is full (Max: {MAX_INVENTORY_SIZE}).")
     
-    character['inventory'].append(item_id)
+    journal_append(character, 'inventory', item_id)
     return True
 
 def remove_item_from_inventory(character, item_id):
@@ -58,7 +63,7 @@ def remove_item_from_inventory(character, item_id):
     # Check if item exists in inventory
     # Remove item from list
     if item_id in character['inventory']:
-        character['inventory'].remove(item_id)
+        journal_remove(character, 'inventory', item_id)
         return True
     else:
         raise ItemNotFoundError(f"{item_id} not found in your inventory")
@@ -145,6 +150,9 @@ def use_item(character, item_id, item_data):
         raise InvalidItemTypeError(f"Item '{item_id}' is of type '{item_type}' and cannot be used.")
 
     effect_str = item_data.get('effect')
+    # Items from game_data carry an already-parsed Effect instead of text
+    if effect_str and not isinstance(effect_str, str):
+        effect_str = f"{effect_str['stat']}:{effect_str['value']}"
     if not effect_str or ':' not in effect_str:
         return f"Item '{item_id}' consumed but had no recognizable effect."
 
@@ -167,11 +175,12 @@ def use_item(character, item_id, item_data):
             return_message = f"Used {item_id}. Restored {value} {stat_name}, healing up to max health ({character['max_health']})."
         else:
             return_message = f"Used {item_id}. Applied effect: +{value} to {stat_name}."
+        journal_set(character, stat_name)
     else:
         return_message = f"Used {item_id}. Effect targets unknown stat: {stat_name}."
 
 
-    character['inventory'].remove(item_id)
+    journal_remove(character, 'inventory', item_id)
     return return_message
 
 def equip_weapon(character, item_id, item_data):
@@ -227,11 +236,13 @@ def equip_weapon(character, item_id, item_data):
             pass
         if old_stat_value != 0 and old_stat_name in character:
             character[old_stat_name] -= old_stat_value
+            journal_set(character, old_stat_name)
             unequip_message = f"Unequipped {old_weapon}, removing {old_stat_value} {old_stat_name}."
         add_item_to_inventory(character, old_weapon)
     
     if stat_name in character:
         character[stat_name] += stat_value
+        journal_set(character, stat_name)
     if 'equipped' not in character:
         character['equipped'] = {}
     character['equipped'][slot_key] = item_id
@@ -290,11 +301,13 @@ def equip_armor(character, item_id, item_data):
             pass
         if old_stat_value != 0 and old_stat_name in character:
             character[old_stat_name] -= old_stat_value
+            journal_set(character, old_stat_name)
             unequip_message = f"Unequipped {old_armor}, removing {old_stat_value} {old_stat_name}."
         add_item_to_inventory(character, old_armor)
     
     if stat_name in character:
         character[stat_name] += stat_value
+        journal_set(character, stat_name)
     if 'equipped' not in character:
         character['equipped'] = {}
     character['equipped'][slot_key] = item_id
@@ -332,6 +345,7 @@ def unequip_weapon(character):
     if old_stat_value != 0:
         try:
             character[stat_name] -= old_stat_value
+            journal_set(character, stat_name)
         except KeyError:
             pass
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
@@ -369,6 +383,7 @@ def unequip_armor(character):
     if old_stat_value != 0:
         try:
             character[stat_name] -= old_stat_value
+            journal_set(character, stat_name)
         except KeyError:
             pass
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
@@ -421,6 +436,7 @@ def purchase_item(character, item_id, item_data):
         character['gold'] -= cost
     except KeyError:
         character['gold'] = 0 - cost
+    journal_set(character, 'gold')
     return True
 
 def sell_item(character, item_id, item_data):
@@ -450,6 +466,7 @@ def sell_item(character, item_id, item_data):
         character['gold'] = current_gold + sell_price
     except KeyError:
         character['gold'] = sell_price
+    journal_set(character, 'gold')
     return sell_price
 
 # ============================================================================
@@ -499,6 +516,7 @@ def apply_stat_effect(character, stat_name, value):
     if stat_name == 'health' and 'max_health' in character:
         if character['health'] > character['max_health']:
             character['health'] = character['max_health']
+    journal_set(character, stat_name)
     pass
 
 def display_inventory(character, item_data_dict):
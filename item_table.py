@@ -0,0 +1,189 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Item Table Module
+
+This module stores the item catalog column by column for fast shop queries.
+Costs and effect values live in parallel arrays, item types and effect stats
+are small integer codes, and each type/stat also has a bitmask of the rows
+that match it. Rows are sorted by cost, so "cost <= gold" is just a prefix of
+the table. A filter is then a couple of integer ANDs instead of a loop over
+every item dictionary.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from itertools import compress
+
+import game_data
+
+# Maps the characters '0'/'1' to bytes 0/1 so a bit string can drive compress()
+_BIT_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+class ItemTable(Mapping):
+    """
+    Column-oriented, read-only item catalog
+
+    Also works as a mapping of item_id → item record, so it can be passed
+    anywhere an item_data dictionary is expected (display_inventory, etc).
+    """
+
+    def __init__(self, items):
+        """
+        Build the columns from a loaded item dictionary
+
+        Args:
+            items: Dictionary {item_id: Item} from game_data.load_items
+        """
+        ordered = sorted(items.items(), key=lambda pair: (pair[1]['cost'], pair[0]))
+        self.item_ids = [item_id for item_id, item in ordered]
+        self.records = [item for item_id, item in ordered]
+        self.row_of = {item_id: row for row, item_id in enumerate(self.item_ids)}
+        self.cost = array('i', (item['cost'] for item in self.records))
+        self.value = array('i', (item['effect']['value'] for item in self.records))
+        self.type_names = []
+        self.stat_names = []
+        self.type_codes = array('h', (self._code(self.type_names, item['type']) for item in self.records))
+        self.stat_codes = array('h', (self._code(self.stat_names, item['effect']['stat']) for item in self.records))
+        self.all_rows = (1 << len(self.records)) - 1
+        self.type_masks = self._build_masks(self.type_codes, len(self.type_names))
+        self.stat_masks = self._build_masks(self.stat_codes, len(self.stat_names))
+
+    @classmethod
+    def from_file(cls, filename="data/items.txt", **load_options):
+        """Load items with game_data.load_items and build a table from them"""
+        return cls(game_data.load_items(filename, **load_options))
+
+    @staticmethod
+    def _code(names, name):
+        """Return the small-int code for name, adding it if it's new"""
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    @staticmethod
+    def _build_masks(codes, code_count):
+        """Turn a code column into one row bitmask per code (bit i = row i)"""
+        packed = [bytearray((len(codes) + 7) // 8) for code in range(code_count)]
+        for row, code in enumerate(codes):
+            packed[code][row >> 3] |= 1 << (row & 7)
+        return [int.from_bytes(code_bits, 'little') for code_bits in packed]
+
+    # ------------------------------------------------------------------
+    # Masks (combine with &, |)
+    # ------------------------------------------------------------------
+
+    def type_mask(self, item_type):
+        """Rows whose type is item_type (weapon, armor, consumable)"""
+        if item_type in self.type_names:
+            return self.type_masks[self.type_names.index(item_type)]
+        return 0
+
+    def stat_mask(self, stat_name):
+        """Rows whose effect changes stat_name"""
+        if stat_name in self.stat_names:
+            return self.stat_masks[self.stat_names.index(stat_name)]
+        return 0
+
+    def affordable_mask(self, gold):
+        """Rows that cost at most gold (a prefix, since rows are sorted by cost)"""
+        return (1 << bisect_right(self.cost, gold)) - 1
+
+    def rows(self, mask):
+        """Row numbers set in mask, in ascending cost order"""
+        row_count = len(self.records)
+        bit_string = format(mask & self.all_rows, f"0{row_count}b")[::-1]
+        return list(compress(range(row_count), bit_string.encode().translate(_BIT_BYTES)))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def filter(self, item_type=None, stat=None, max_cost=None):
+        """
+        Find items matching every given condition
+
+        Returns: List of item ids, cheapest first
+        """
+        mask = self.all_rows
+        if item_type is not None:
+            mask &= self.type_mask(item_type)
+        if stat is not None:
+            mask &= self.stat_mask(stat)
+        if max_cost is not None:
+            mask &= self.affordable_mask(max_cost)
+        return [self.item_ids[row] for row in self.rows(mask)]
+
+    def top_value_per_gold(self, count, mask=None):
+        """
+        Best effect value per gold spent
+
+        Free items count as infinitely good value.
+
+        Returns: Up to count item ids, best first
+        """
+        if mask is None:
+            mask = self.all_rows
+        cost = self.cost
+        value = self.value
+
+        def value_per_gold(row):
+            if cost[row] <= 0:
+                return float("inf")
+            return value[row] / cost[row]
+
+        best_rows = heapq.nlargest(count, self.rows(mask), key=value_per_gold)
+        return [self.item_ids[row] for row in best_rows]
+
+    def shop_view(self, character, item_type=None, stat=None, limit=None):
+        """
+        Items a character can afford right now
+
+        Args:
+            character: Character dictionary (uses 'gold')
+            item_type, stat: Optional filters
+            limit: If given, only the best limit items by value per gold
+
+        Returns: List of item records, cheapest first (or best first with limit)
+        """
+        mask = self.affordable_mask(character.get('gold', 0))
+        if item_type is not None:
+            mask &= self.type_mask(item_type)
+        if stat is not None:
+            mask &= self.stat_mask(stat)
+        if limit is not None:
+            item_ids = self.top_value_per_gold(limit, mask)
+        else:
+            item_ids = [self.item_ids[row] for row in self.rows(mask)]
+        return [self[item_id] for item_id in item_ids]
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, item_id):
+        return self.records[self.row_of[item_id]]
+
+    def __contains__(self, item_id):
+        return item_id in self.row_of
+
+    def __iter__(self):
+        return iter(self.item_ids)
+
+    def __len__(self):
+        return len(self.item_ids)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== ITEM TABLE TEST ===")
+
+    table = ItemTable.from_file()
+    print(f"Loaded {len(table)} items")
+    print(f"Weapons under 150 gold: {table.filter(item_type='weapon', max_cost=150)}")
+    print(f"Best value for a 100 gold character: {[item['name'] for item in table.shop_view({'gold': 100}, limit=3)]}")
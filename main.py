@@ -106,7 +106,8 @@ def game_loop():
     #   Display game menu
     #   Get player choice
     #   Execute chosen action
-    #   Save game after each action
+    #   Save game after each action (a save_writer.SaveWriter coalesces
+    #   these into one crash-safe write per window)
     pass
 
 def game_menu():
@@ -0,0 +1,28 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Migration Tool
+
+Moves a save directory between the flat and sharded layouts (see
+character_manager.migrate_save_layout). Safe to re-run if interrupted.
+
+Usage:
+    python migrate_saves.py --layout sharded data/save_games
+"""
+
+import argparse
+
+import character_manager
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Move Quest Chronicles saves between directory layouts.")
+    parser.add_argument("save_directory", nargs="?", default="data/save_games", help="save directory to migrate")
+    parser.add_argument("--layout", choices=character_manager.SAVE_LAYOUTS, default="sharded", help="layout to move the saves into")
+    args = parser.parse_args(argv)
+
+    before = character_manager.get_save_layout(args.save_directory)
+    moved = character_manager.migrate_save_layout(args.save_directory, args.layout)
+    print(f"Moved {moved} saves in {args.save_directory} from {before} to {args.layout} layout")
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ This module handles quest management, dependencies, and completion.
 """
 from character_manager import (
     gain_experience,
-    add_gold
+    add_gold,
+    journal_append,
+    journal_remove
 )
 from custom_exceptions import (
     QuestNotFoundError,
@@ -66,13 +68,14 @@ def accept_quest(character, quest_id, quest_data_dict):
     if character.get('level', 1) < required_level:
         raise InsufficientLevelError(f"Character level {character.get('level', 1)} is too low. Required level: {required_level}.")
     
-    prerequisite_id = quest_data.get('prerequisite', 'NONE')
+    # Loaded quests store a missing prerequisite as None rather than "NONE"
+    prerequisite_id = quest_data.get('prerequisite') or 'NONE'
     if prerequisite_id != 'NONE' and not is_quest_completed(character, prerequisite_id):
         if prerequisite_id not in quest_data_dict:
              raise QuestNotFoundError(f"Prerequisite Quest ID '{prerequisite_id}' not found in game data.")
         prereq_title = quest_data_dict[prerequisite_id].get('title', prerequisite_id)
         raise QuestRequirementsNotMetError(f"Prerequisite quest '{prereq_title}' must be completed first.")
-    character['active_quests'].append(quest_id)
+    journal_append(character, 'active_quests', quest_id)
     return True
 
 def complete_quest(character, quest_id, quest_data_dict):
@@ -106,8 +109,8 @@ def complete_quest(character, quest_id, quest_data_dict):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not an active quest")
     quest_data = quest_data_dict[quest_id]
 
-    character['active_quests'].remove(quest_id)
-    character['completed_quests'].append(quest_id)
+    journal_remove(character, 'active_quests', quest_id)
+    journal_append(character, 'completed_quests', quest_id)
     reward_xp = quest_data.get('reward_xp', 0)
     reward_gold = quest_data.get('reward_gold', 0)
     gain_experience(character, reward_xp)
@@ -129,7 +132,7 @@ def abandon_quest(character, quest_id):
     if quest_id not in character.get('active_quests', []):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not currently active and cannot be abandoned.")
     
-    character['active_quests'].remove(quest_id)
+    journal_remove(character, 'active_quests', quest_id)
     return True
 
 def get_active_quests(character, quest_data_dict):
@@ -221,7 +224,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     if character.get('level', 1) < required_level:
         return False
     
-    prerequisite_id = quest_data.get('prerequisite', 'NONE')
+    prerequisite_id = quest_data.get('prerequisite') or 'NONE'
     if prerequisite_id != 'NONE':
         if prerequisite_id not in quest_data_dict:
             return False
@@ -301,9 +304,14 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     """
     Get all quests within a level range
     
+    Catalogs that can answer this with an index (like
+    sqlite_catalog.SQLiteQuestCatalog) are asked directly.
+    
     Returns: List of quest dictionaries
     """
     # TODO: Implement level filtering
+    if hasattr(quest_data_dict, 'quests_by_level'):
+        return quest_data_dict.quests_by_level(min_level, max_level)
     filtered_quests = []
     for quest_id, quest_data in quest_data_dict.items():
         required_level = quest_data.get('required_level', 1)
@@ -327,7 +335,7 @@ def display_quest_info(quest_data):
     print(f"Description: {quest_data['description']}")
     # ... etc
     print(f"  Level: {quest_data.get('required_level', 1)}")
-    prereq = quest_data.get('prerequisite', 'NONE')
+    prereq = quest_data.get('prerequisite') or 'NONE'
     print(f"  Prerequisite: {prereq}")
     
     print("\n**Rewards:**")
@@ -395,7 +403,7 @@ def validate_quest_prerequisites(quest_data_dict):
     # Check each quest's prerequisite
     # Ensure prerequisite exists in quest_data_dict
     for quest_id, quest_data in quest_data_dict.items():
-        prereq_id = quest_data.get('prerequisite', 'NONE')
+        prereq_id = quest_data.get('prerequisite') or 'NONE'
         if prereq_id != 'NONE' and prereq_id not in quest_data_dict:
             raise QuestNotFoundError(f"Quest '{quest_id}' has an invalid prerequisite: '{prereq_id}' is not a known quest ID.")
             
@@ -0,0 +1,390 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Pack Module
+
+This module stores many characters' saves in one pack file, so a save
+directory can be backed up or moved as a single file instead of one tiny
+file per character. A pack file is:
+- a header: magic, format version, and where the index is
+- the records: encoded saves (text or binary), one after another
+- the index: one fixed-size entry per character, sorted by save key,
+  followed by the keys, names and classes the entries point to
+Readers mmap the file and binary-search the index, so loading one
+character reads just its index entries and its record.
+
+Changes are appended: put() writes the new record at the end of the file
+and flush() writes a new index after it, then points the header at it.
+Records that were deleted or replaced (and old indexes) stay in the file
+as dead space until repack() rewrites it.
+
+Usage:
+    python save_pack.py pack data/save_games data/save_games.pack
+    python save_pack.py unpack data/save_games.pack data/restored_saves
+    python save_pack.py repack data/save_games.pack
+"""
+
+import os
+import mmap
+import time
+import struct
+import argparse
+import threading
+
+import character_manager
+from save_storage import SaveStorage
+from custom_exceptions import SaveFileCorruptedError
+
+PACK_MAGIC = b"QCPK"
+PACK_VERSION = 1
+# magic, version, reserved, index offset, index length, entry count
+PACK_HEADER = struct.Struct("<4sHHQQI")
+# record offset, record length, strings offset, strings length, level, gold, mtime
+PACK_ENTRY = struct.Struct("<QIIIqqd")
+# Separates the key, name and class in an entry's strings
+PACK_STRING_SEPARATOR = b"\x00"
+
+class PackStorage(SaveStorage):
+    """
+    Saves kept in one pack file
+
+    Writes are only in the index once flush() (or close()) runs; until then
+    they are readable from this object but a crash loses them, leaving
+    their records as dead space. Only one PackStorage should write to a
+    pack at a time.
+    """
+
+    def __init__(self, pack_path="data/save_games.pack"):
+        """
+        Open (creating if needed) the pack at pack_path
+
+        Raises: SaveFileCorruptedError if the file isn't a readable pack
+        """
+        self.pack_path = pack_path
+        directory = os.path.dirname(pack_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(pack_path):
+            with open(pack_path, 'wb') as file:
+                file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, PACK_HEADER.size, 0, 0))
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._map = None
+        self._file = open(pack_path, 'r+b')
+        try:
+            self._open_index()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _open_index(self):
+        """(Re)map the file and read the header"""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, reserved, index_offset, index_length, count = PACK_HEADER.unpack_from(self._map, 0)
+        except struct.error as e:
+            raise SaveFileCorruptedError(f"Pack file {self.pack_path} is truncated: {e}")
+        if magic != PACK_MAGIC:
+            raise SaveFileCorruptedError(f"{self.pack_path} is not a save pack.")
+        if version != PACK_VERSION:
+            raise SaveFileCorruptedError(f"Unsupported save pack version {version} in {self.pack_path}.")
+        if index_offset + index_length > len(self._map) or count * PACK_ENTRY.size > index_length:
+            raise SaveFileCorruptedError(f"Index of pack file {self.pack_path} runs past the end of the file.")
+        self._index_offset = index_offset
+        self._strings_offset = index_offset + count * PACK_ENTRY.size
+        self._count = count
+        self._end = len(self._map)
+
+    # ========================================================================
+    # INDEX
+    # ========================================================================
+
+    def _entry(self, position):
+        """
+        Index entry at position
+
+        Returns: (key, (record offset, record length, summary))
+        """
+        (record_offset, record_length, strings_offset, strings_length,
+         level, gold, mtime) = PACK_ENTRY.unpack_from(self._map, self._index_offset + position * PACK_ENTRY.size)
+        start = self._strings_offset + strings_offset
+        key, name, character_class = self._map[start:start + strings_length].decode('utf-8').split("\x00")
+        summary = {"name": name, "class": character_class, "level": level, "gold": gold, "mtime": mtime}
+        return key, (record_offset, record_length, summary)
+
+    def _entry_key(self, position):
+        """Save key (as UTF-8 bytes) of the index entry at position"""
+        strings_offset, strings_length = struct.unpack_from(
+            "<II", self._map, self._index_offset + position * PACK_ENTRY.size + 12
+        )
+        start = self._strings_offset + strings_offset
+        return self._map[start:self._map.find(PACK_STRING_SEPARATOR, start, start + strings_length)]
+
+    def _find(self, key):
+        """
+        Binary-search the index for key
+
+        Returns: (record offset, record length, summary), or None
+        """
+        wanted = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry_key(middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            entry_key, location = self._entry(low)
+            if entry_key == key:
+                return location
+        return None
+
+    def _lookup(self, key):
+        """Location of key's record, checking unflushed changes first"""
+        if key in self._pending:
+            return self._pending[key]
+        return self._find(key)
+
+    def _live_entries(self):
+        """Every live key → location, in key order, including unflushed changes"""
+        entries = dict(self._entry(position) for position in range(self._count))
+        for key, location in self._pending.items():
+            if location is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = location
+        return dict(sorted(entries.items(), key=lambda pair: pair[0].encode('utf-8')))
+
+    def _read(self, location):
+        """Bytes of the record at location"""
+        record_offset, record_length, summary = location
+        if record_offset + record_length <= len(self._map):
+            return self._map[record_offset:record_offset + record_length]
+        # An unflushed record may still be in the file object's buffer
+        self._file.flush()
+        return os.pread(self._file.fileno(), record_length, record_offset)
+
+    # ========================================================================
+    # STORAGE INTERFACE
+    # ========================================================================
+
+    def get(self, key):
+        with self._lock:
+            location = self._lookup(key)
+            if location is None:
+                raise KeyError(key)
+            return self._read(location)
+
+    def put(self, key, data, summary):
+        summary = {summary_key: summary[summary_key] for summary_key in character_manager.SUMMARY_KEYS}
+        summary["mtime"] = time.time()
+        with self._lock:
+            self._file.seek(self._end)
+            self._file.write(data)
+            self._pending[key] = (self._end, len(data), summary)
+            self._end += len(data)
+
+    def delete(self, key):
+        with self._lock:
+            if self._lookup(key) is None:
+                return False
+            self._pending[key] = None
+            return True
+
+    def scan(self):
+        with self._lock:
+            for key, location in self._live_entries().items():
+                yield key, self._read(location)
+
+    def summaries(self):
+        with self._lock:
+            return [dict(summary) for offset, length, summary in self._live_entries().values()]
+
+    def exists(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            if not self._pending:
+                return self._count
+            return len(self._live_entries())
+
+    def flush(self, fsync=True):
+        """
+        Write an index covering every change so far and switch to it
+
+        The new index is written (and fsynced) before the header points at
+        it, so a crash leaves the pack at either the old or the new index.
+
+        Returns: Number of changes committed
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            changes = len(self._pending)
+            live = self._live_entries()
+            index_offset = self._end
+            index = _build_index(live.items(), lambda offset: offset)
+            self._file.seek(index_offset)
+            self._file.write(index)
+            self._commit_header(index_offset, len(index), len(live), fsync)
+            self._pending.clear()
+            self._open_index()
+            return changes
+
+    def _commit_header(self, index_offset, index_length, count, fsync):
+        """Point the header at a newly written index"""
+        if fsync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._file.seek(0)
+        self._file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, index_offset, index_length, count))
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self.flush()
+            self._map.close()
+            self._file.close()
+
+    # ========================================================================
+    # REPACKING
+    # ========================================================================
+
+    def dead_bytes(self):
+        """Bytes of the file holding replaced/deleted records and old indexes"""
+        with self._lock:
+            live = self._live_entries()
+            live_bytes = sum(length for offset, length, summary in live.values())
+            return self._end - PACK_HEADER.size - live_bytes - len(_build_index(live.items(), lambda offset: offset))
+
+    def repack(self, fsync=True):
+        """
+        Rewrite the pack with only its live records, in key order
+
+        The new pack is written next to the old one and renamed over it.
+
+        Returns: Bytes reclaimed
+        """
+        with self._lock:
+            live = self._live_entries()
+            temp_path = f"{self.pack_path}.{os.getpid()}.tmp"
+            new_offsets = {}
+            try:
+                with open(temp_path, 'wb') as new_file:
+                    new_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, 0, 0, 0))
+                    for key, location in live.items():
+                        new_offsets[location[0]] = new_file.tell()
+                        new_file.write(self._read(location))
+                    index_offset = new_file.tell()
+                    index = _build_index(live.items(), new_offsets.__getitem__)
+                    new_file.write(index)
+                    new_file.seek(0)
+                    new_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, index_offset, len(index), len(live)))
+                    new_file.flush()
+                    if fsync:
+                        os.fsync(new_file.fileno())
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            old_size = self._end
+            self._map.close()
+            self._map = None
+            self._file.close()
+            os.replace(temp_path, self.pack_path)
+            if fsync:
+                character_manager.sync_directory(os.path.dirname(os.path.abspath(self.pack_path)))
+            self._file = open(self.pack_path, 'r+b')
+            self._pending.clear()
+            self._open_index()
+            return old_size - self._end
+
+def _build_index(entries, relocate):
+    """
+    Index bytes for (key, location) pairs already in key order
+
+    relocate maps each record's current offset to its offset in the file
+    the index is for.
+    """
+    table = bytearray()
+    strings = bytearray()
+    for key, (record_offset, record_length, summary) in entries:
+        entry_strings = PACK_STRING_SEPARATOR.join(
+            text.encode('utf-8') for text in (key, summary["name"], summary["class"])
+        )
+        table += PACK_ENTRY.pack(relocate(record_offset), record_length, len(strings), len(entry_strings),
+                                 summary["level"], summary["gold"], summary["mtime"])
+        strings += entry_strings
+    return bytes(table + strings)
+
+# ============================================================================
+# PACKING A SAVE DIRECTORY
+# ============================================================================
+
+def pack_save_directory(save_directory, pack_path, save_format=None):
+    """
+    Add every character in save_directory to the pack at pack_path
+
+    Characters are loaded (journals replayed) and re-encoded in
+    save_format; saves that can't be loaded are skipped.
+
+    Returns: character_manager.BatchResult (failed holds the skipped saves)
+    """
+    result = character_manager.BatchResult()
+    with PackStorage(pack_path) as pack:
+        for key, character in character_manager.iter_all_characters(save_directory, result=result):
+            pack.put(key, character_manager.encode_save(character, save_format), character)
+            result.succeeded[key] = True
+    return result
+
+def unpack_save_directory(pack_path, save_directory, save_format=None):
+    """
+    Write every character in the pack at pack_path out as save files
+
+    Returns: character_manager.BatchResult from save_characters
+    """
+    with PackStorage(pack_path) as pack:
+        characters = [character_manager.decode_save(data, key) for key, data in pack.scan()]
+    return character_manager.save_characters(characters, save_directory, save_format)
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Pack Quest Chronicles saves into a single file and back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="add a save directory's characters to a pack")
+    pack_parser.add_argument("save_directory")
+    pack_parser.add_argument("pack_path")
+    pack_parser.add_argument("--format", choices=character_manager.SAVE_FORMATS, default=None)
+    unpack_parser = commands.add_parser("unpack", help="write a pack's characters out as save files")
+    unpack_parser.add_argument("pack_path")
+    unpack_parser.add_argument("save_directory")
+    repack_parser = commands.add_parser("repack", help="reclaim space from replaced and deleted records")
+    repack_parser.add_argument("pack_path")
+    list_parser = commands.add_parser("list", help="list the characters in a pack")
+    list_parser.add_argument("pack_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        result = pack_save_directory(args.save_directory, args.pack_path, args.format)
+        print(f"Packed {len(result.succeeded)} characters into {args.pack_path} ({len(result.failed)} skipped)")
+    elif args.command == "unpack":
+        result = unpack_save_directory(args.pack_path, args.save_directory)
+        print(f"Wrote {len(result.succeeded)} characters to {args.save_directory} ({len(result.failed)} failed)")
+    elif args.command == "repack":
+        with PackStorage(args.pack_path) as pack:
+            print(f"Reclaimed {pack.repack()} bytes from {args.pack_path}")
+    else:
+        with PackStorage(args.pack_path) as pack:
+            for summary in pack.summaries():
+                print(f"{summary['name']:20} {summary['class']:8} level {summary['level']:<4} gold {summary['gold']}")
+
+if __name__ == "__main__":
+    main()
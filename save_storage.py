@@ -0,0 +1,316 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Storage Module
+
+This module holds the storage backends character_manager can save
+characters to. Every backend stores encoded save files (bytes) by save key
+(see character_manager.get_save_key) along with a small summary
+(character_manager.SUMMARY_KEYS) for listing and queries:
+- FileSystemStorage: the save directory, exactly as character_manager uses it
+- MemoryStorage: a dictionary; no disk I/O at all (tests, bot load tests)
+- SQLiteStorage: one SQLite file with indexed class/level/gold columns
+
+Pass one as storage= to save_character, load_character, delete_character,
+list_saved_characters or list_character_summaries, or make it the default
+for every call with character_manager.set_default_storage().
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+import character_manager
+from custom_exceptions import SaveFileCorruptedError
+
+class SaveStorage(ABC):
+    """
+    Interface every storage backend provides
+
+    Subclasses implement get, put, delete, scan and summaries (a backend
+    missing one can't be instantiated); list and exists are built on those
+    but can be overridden with faster versions.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Encoded save stored under key
+
+        Returns: bytes
+        Raises: KeyError if there is no such save
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key, data, summary):
+        """Store data (an encoded save) and its summary under key, replacing any old one"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key):
+        """
+        Remove the save stored under key
+
+        Returns: True if there was one to remove
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def scan(self):
+        """Yields (key, data) for every save"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def summaries(self):
+        """Summary dictionaries for every save (mtime included where known)"""
+        raise NotImplementedError
+
+    def list(self):
+        """Names of every saved character"""
+        return [summary["name"] for summary in self.summaries()]
+
+    def exists(self, key):
+        """True if a save is stored under key"""
+        try:
+            self.get(key)
+        except KeyError:
+            return False
+        return True
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# FILE SYSTEM
+# ============================================================================
+
+class FileSystemStorage(SaveStorage):
+    """
+    A save directory, with its layout, manifest and cache kept up to date
+
+    get() and scan() return what load_character would load: a save with a
+    journal (see character_manager.enable_journal) has the journal replayed
+    into the returned bytes. Reads and writes take the same save locks as
+    character_manager (see lock_character).
+    """
+
+    def __init__(self, save_directory="data/save_games"):
+        self.save_directory = save_directory
+
+    def get(self, key):
+        try:
+            return self._read(key, character_manager.find_save_path(key, self.save_directory))
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def _read(self, key, full_path):
+        """Bytes of the save at full_path with its journal (if any) replayed"""
+        with character_manager.lock_character(key, self.save_directory, exclusive=False):
+            with open(full_path, 'rb') as file:
+                data = file.read()
+            journal_path = character_manager.get_journal_path(full_path)
+            if not os.path.exists(journal_path):
+                return data
+            character = character_manager.decode_save(data, key)
+            if not character_manager.replay_journal(character, data, journal_path):
+                return data
+        save_format = "binary" if data.startswith(character_manager.BINARY_MAGIC) else "text"
+        return character_manager.encode_save(character, save_format)
+
+    def put(self, key, data, summary):
+        with character_manager.lock_character(key, self.save_directory):
+            full_path = character_manager.get_save_path(key, self.save_directory)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            character_manager.character_cache.invalidate((self.save_directory, key))
+            character_manager.write_save_file(full_path, data)
+            character_manager.discard_journal(full_path)
+            character_manager.record_keyed_saves(self.save_directory, [(key, summary)])
+
+    def delete(self, key):
+        with character_manager.lock_character(key, self.save_directory):
+            full_path = character_manager.find_save_path(key, self.save_directory)
+            character_manager.character_cache.invalidate((self.save_directory, key))
+            try:
+                os.remove(full_path)
+            except FileNotFoundError:
+                return False
+            character_manager.discard_journal(full_path)
+            character_manager.discard_lock_file(key, self.save_directory)
+            character_manager.record_deletes(self.save_directory, [key])
+        return True
+
+    def scan(self):
+        for key, full_path in character_manager.iter_save_files(self.save_directory):
+            yield key, self._read(key, full_path)
+
+    def summaries(self):
+        return list(character_manager.read_manifest(self.save_directory).values())
+
+    def exists(self, key):
+        return os.path.exists(character_manager.find_save_path(key, self.save_directory))
+
+# ============================================================================
+# MEMORY
+# ============================================================================
+
+class MemoryStorage(SaveStorage):
+    """Saves kept in a dictionary for the life of the object"""
+
+    def __init__(self):
+        self._saves = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._saves[key][0]
+
+    def put(self, key, data, summary):
+        summary = dict(summary, mtime=time.time())
+        with self._lock:
+            self._saves[key] = (bytes(data), summary)
+
+    def delete(self, key):
+        with self._lock:
+            return self._saves.pop(key, None) is not None
+
+    def scan(self):
+        with self._lock:
+            saves = list(self._saves.items())
+        for key, (data, summary) in saves:
+            yield key, data
+
+    def summaries(self):
+        with self._lock:
+            return [dict(summary) for data, summary in self._saves.values()]
+
+    def exists(self, key):
+        return key in self._saves
+
+    def __len__(self):
+        return len(self._saves)
+
+# ============================================================================
+# SQLITE
+# ============================================================================
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    save_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    gold INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_class_level ON characters (class, level);
+CREATE INDEX IF NOT EXISTS characters_level ON characters (level);
+CREATE INDEX IF NOT EXISTS characters_gold ON characters (gold);
+"""
+
+class SQLiteStorage(SaveStorage):
+    """Saves kept in one SQLite database, with indexed summary columns"""
+
+    def __init__(self, db_path="data/characters.db"):
+        """Open (creating if needed) the database at db_path"""
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SQLITE_SCHEMA)
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not open character database {db_path}: {e}")
+        self._lock = threading.Lock()
+
+    def _execute(self, sql, parameters=()):
+        """Run one statement, committing and turning errors into SaveFileCorruptedError"""
+        try:
+            with self._lock, self.connection:
+                return self.connection.execute(sql, parameters).fetchall()
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Error using character database {self.db_path}: {e}")
+
+    def get(self, key):
+        rows = self._execute("SELECT data FROM characters WHERE save_key = ?", (key,))
+        if not rows:
+            raise KeyError(key)
+        return rows[0][0]
+
+    def put(self, key, data, summary):
+        self._execute(
+            "INSERT OR REPLACE INTO characters (save_key, name, class, level, gold, mtime, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, summary["name"], summary["class"], summary["level"], summary["gold"], time.time(), bytes(data))
+        )
+
+    def delete(self, key):
+        with self._lock:
+            try:
+                with self.connection:
+                    return self.connection.execute("DELETE FROM characters WHERE save_key = ?", (key,)).rowcount > 0
+            except sqlite3.Error as e:
+                raise SaveFileCorruptedError(f"Error using character database {self.db_path}: {e}")
+
+    def scan(self):
+        for key, data in self._execute("SELECT save_key, data FROM characters ORDER BY save_key"):
+            yield key, data
+
+    def summaries(self):
+        return self.query()
+
+    def list(self):
+        return [name for (name,) in self._execute("SELECT name FROM characters ORDER BY save_key")]
+
+    def exists(self, key):
+        return bool(self._execute("SELECT 1 FROM characters WHERE save_key = ?", (key,)))
+
+    def query(self, character_class=None, min_level=None, max_level=None, min_gold=None):
+        """
+        Summaries of characters matching every given filter (indexed)
+
+        Returns: List of summary dictionaries, ordered by level then name
+        """
+        conditions = []
+        parameters = []
+        for column, operator, value in (("class", "=", character_class), ("level", ">=", min_level),
+                                        ("level", "<=", max_level), ("gold", ">=", min_gold)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        sql = "SELECT name, class, level, gold, mtime FROM characters"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY level, name"
+        return [
+            {"name": name, "class": character_class, "level": level, "gold": gold, "mtime": mtime}
+            for name, character_class, level, gold, mtime in self._execute(sql, parameters)
+        ]
+
+    def __len__(self):
+        return self._execute("SELECT COUNT(*) FROM characters")[0][0]
+
+    def close(self):
+        self.connection.close()
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SAVE STORAGE TEST ===")
+
+    hero = character_manager.create_character("StorageTest", "Cleric")
+    for storage in (MemoryStorage(), SQLiteStorage(":memory:")):
+        character_manager.save_character(hero, storage=storage)
+        loaded = character_manager.load_character("StorageTest", storage=storage)
+        print(f"{type(storage).__name__}: loaded {loaded['name']}, saved characters: {storage.list()}")
@@ -0,0 +1,248 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Writer Module
+
+This module batches autosaves. The game loop saves after every action;
+SaveWriter remembers which characters changed and writes each of them
+once per window, with one group commit for the whole batch:
+- every dirty save is written to a temp file
+- the temp files are fsynced together, then renamed over the old saves
+- the save directory is fsynced once for all of the renames
+- the save manifest gets one append for the whole batch
+A crash at any point leaves each save either old or new, never half written.
+"""
+
+import os
+import time
+import threading
+from contextlib import ExitStack
+
+import character_manager
+from custom_exceptions import GameError
+
+class SaveWriter:
+    """
+    Coalescing, crash-safe autosave writer
+
+    Usage:
+        writer = SaveWriter("data/save_games", window=1.0)
+        writer.save(character)      # after every action; cheap
+        ...
+        writer.close()              # writes anything still pending
+    """
+
+    def __init__(self, save_directory="data/save_games", window=1.0, save_format=None, fsync=True, clock=time.monotonic):
+        """
+        Args:
+            save_directory: Where saves are written
+            window: Seconds to collect saves before writing them together
+                    (0 writes on every save() call)
+            save_format: "text", "binary", or None for the default format
+            fsync: Flush saves to disk on each group commit
+            clock: Time source; tests can pass a fake one
+        """
+        self.save_directory = save_directory
+        self.window = window
+        self.save_format = save_format
+        self.fsync = fsync
+        self.clock = clock
+        self.saves_requested = 0
+        self.files_written = 0
+        self.commits = 0
+        self._dirty = {}
+        self._dirty_since = None
+        self._lock = threading.RLock()
+        self._stop_event = None
+        self._thread = None
+
+    def mark_dirty(self, character):
+        """
+        Note that character changed without writing anything yet
+
+        Later changes to the same character are included, since the save is
+        built from the character as it is when the batch is written.
+        """
+        with self._lock:
+            if not self._dirty:
+                self._dirty_since = self.clock()
+            # Keyed like the save files, so "Hero" and "hero" share one entry
+            self._dirty[character_manager.get_save_key(character["name"])] = character
+            self.saves_requested += 1
+
+    def save(self, character):
+        """
+        Request a save of character
+
+        Returns: True if this call wrote a batch, False if it was deferred
+        """
+        self.mark_dirty(character)
+        return self.flush_if_due()
+
+    def pending(self):
+        """Names of characters with unwritten changes"""
+        with self._lock:
+            return [character["name"] for character in self._dirty.values()]
+
+    def flush_if_due(self):
+        """
+        Write the pending batch if its window has passed
+
+        Returns: True if a batch was written
+        """
+        with self._lock:
+            if not self._dirty or self.clock() - self._dirty_since < self.window:
+                return False
+            self.flush()
+            return True
+
+    def flush(self):
+        """
+        Write every pending save in one group commit
+
+        If anything fails, the batch stays pending so the next flush retries it.
+
+        Returns: Number of saves written
+        Raises: KeyError for a character missing required data, OSError for
+                disk errors, SaveLockTimeoutError if another process holds
+                a save's lock too long
+        """
+        with self._lock:
+            if not self._dirty:
+                return 0
+            # Journaled characters are already on disk; saving them just compacts
+            characters = []
+            for character in self._dirty.values():
+                journal = character_manager.get_journal(character)
+                if journal is not None and journal.save_directory == self.save_directory:
+                    journal.compact()
+                else:
+                    characters.append(character)
+            encoded = [character_manager.encode_save(character, self.save_format) for character in characters]
+            # Lock in name order so two writers with overlapping batches can't deadlock
+            with ExitStack() as locks:
+                for name in sorted(character_manager.get_save_key(character["name"]) for character in characters):
+                    locks.enter_context(character_manager.lock_character(name, self.save_directory))
+                # Paths are worked out under the locks (see migrate_save_layout)
+                batch = [
+                    (character_manager.get_save_path(character["name"], self.save_directory), data)
+                    for character, data in zip(characters, encoded)
+                ]
+                for directory in {os.path.dirname(full_path) for full_path, data in batch}:
+                    os.makedirs(directory, exist_ok=True)
+                for character in characters:
+                    character_manager.character_cache.invalidate((self.save_directory, character_manager.get_save_key(character["name"])))
+                write_group(batch, self.fsync)
+                for full_path, data in batch:
+                    character_manager.discard_journal(full_path)
+                character_manager.record_saves(self.save_directory, characters)
+            written = len(self._dirty)
+            self._dirty.clear()
+            self._dirty_since = None
+            self.files_written += written
+            self.commits += 1
+            return written
+
+    # ========================================================================
+    # BACKGROUND FLUSHING
+    # ========================================================================
+
+    def start(self, interval=None, on_error=None):
+        """
+        Flush due batches from a background thread
+
+        Without this, batches are only written by save() and flush() calls.
+        on_error(error) is called when a flush fails; the batch stays
+        pending and the thread retries it on the next tick.
+        """
+        if self._thread is not None:
+            return
+        if interval is None:
+            interval = max(self.window / 2, 0.01)
+        stop_event = self._stop_event = threading.Event()
+
+        def run():
+            try:
+                while not stop_event.wait(interval):
+                    try:
+                        self.flush_if_due()
+                    except (OSError, KeyError, GameError) as e:
+                        if on_error:
+                            on_error(e)
+            finally:
+                # Let start() run a new thread if this one dies
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+        self._thread = threading.Thread(target=run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread (pending saves stay pending)"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join()
+        self._thread = None
+
+    def close(self):
+        """Stop background flushing and write everything still pending"""
+        self.stop()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def write_group(batch, fsync=True):
+    """
+    Atomically replace several files with one group commit
+
+    Args:
+        batch: List of (path, bytes) pairs
+        fsync: fsync the data and the directories before returning
+
+    Raises: OSError; temp files are cleaned up and no save is replaced
+            unless every temp file was written
+    """
+    temp_paths = []
+    try:
+        for full_path, data in batch:
+            temp_path = f"{full_path}.{os.getpid()}.tmp"
+            temp_paths.append(temp_path)
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+        if fsync:
+            for temp_path in temp_paths:
+                descriptor = os.open(temp_path, os.O_RDONLY)
+                try:
+                    os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+    except BaseException:
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    for temp_path, (full_path, data) in zip(temp_paths, batch):
+        os.replace(temp_path, full_path)
+    if fsync:
+        for directory in {os.path.dirname(full_path) for full_path, data in batch}:
+            character_manager.sync_directory(directory)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SAVE WRITER TEST ===")
+
+    hero = character_manager.create_character("WriterTest", "Warrior")
+    with SaveWriter(window=5.0) as writer:
+        for action in range(10):
+            hero["gold"] += 10
+            writer.save(hero)
+        print(f"Pending after 10 actions: {writer.pending()}")
+    print(f"Saves requested: {writer.saves_requested}, files written: {writer.files_written}, commits: {writer.commits}")
@@ -0,0 +1,258 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+SQLite Catalog Module
+
+This module is an optional backend that keeps quests and items in a local
+SQLite file instead of in memory. import_catalog() copies quests.txt and
+items.txt into the database, and SQLiteQuestCatalog / SQLiteItemCatalog
+read it back through the same mapping interface quest_handler and
+inventory_system already use, plus indexed query helpers.
+"""
+
+import os
+import sqlite3
+from collections.abc import Mapping, ItemsView, ValuesView
+
+import game_data
+from game_records import Quest, Item, Effect
+from custom_exceptions import (
+    InvalidDataFormatError,
+    MissingDataFileError,
+    CorruptedDataError
+)
+
+SCHEMA_SQL = """
+CREATE TABLE quests (
+    quest_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    reward_xp INTEGER NOT NULL,
+    reward_gold INTEGER NOT NULL,
+    required_level INTEGER NOT NULL,
+    prerequisite TEXT
+);
+CREATE INDEX quests_required_level ON quests (required_level);
+CREATE INDEX quests_prerequisite ON quests (prerequisite);
+
+CREATE TABLE items (
+    item_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    effect_stat TEXT NOT NULL,
+    effect_value INTEGER NOT NULL,
+    cost INTEGER NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX items_type_cost ON items (type, cost);
+CREATE INDEX items_cost ON items (cost);
+"""
+
+QUEST_COLUMNS = "quest_id, title, description, reward_xp, reward_gold, required_level, prerequisite"
+ITEM_COLUMNS = "item_id, name, type, effect_stat, effect_value, cost, description"
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def import_catalog(db_path="data/catalog.db", quests_file="data/quests.txt", items_file="data/items.txt"):
+    """
+    Build (or rebuild) the SQLite catalog from the text data files
+
+    The files are streamed with game_data.iter_quests/iter_items, and the
+    new tables only replace the old ones once both files imported cleanly.
+
+    Returns: Tuple (quest_count, item_count)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        connection = sqlite3.connect(temp_path)
+    except sqlite3.Error as e:
+        raise CorruptedDataError(f"Could not create catalog database {db_path}: {e}")
+    try:
+        with connection:
+            connection.executescript(SCHEMA_SQL)
+            quest_count = _insert_rows(connection, "quests", QUEST_COLUMNS, "quest", (
+                (quest_id, quest.title, quest.description, quest.reward_xp,
+                 quest.reward_gold, quest.required_level, quest.prerequisite)
+                for quest_id, quest in game_data.iter_quests(quests_file)
+            ))
+            item_count = _insert_rows(connection, "items", ITEM_COLUMNS, "item", (
+                (item_id, item.name, item.type, item.effect.stat,
+                 item.effect.value, item.cost, item.description)
+                for item_id, item in game_data.iter_items(items_file)
+            ))
+        connection.close()
+        os.replace(temp_path, db_path)
+    except BaseException:
+        connection.close()
+        os.remove(temp_path)
+        raise
+    return quest_count, item_count
+
+def _insert_rows(connection, table, columns, record_name, rows):
+    """Insert rows one at a time so a duplicate id can be reported by name"""
+    placeholders = ", ".join("?" for column in columns.split(","))
+    statement = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    count = 0
+    for row in rows:
+        try:
+            connection.execute(statement, row)
+        except sqlite3.IntegrityError:
+            raise InvalidDataFormatError(f"Duplicate {record_name} id found: {row[0]}")
+        count += 1
+    return count
+
+def _connect(db_path):
+    """Open an existing catalog database"""
+    if not os.path.exists(db_path):
+        raise MissingDataFileError(f"Catalog database not found at: {db_path}")
+    try:
+        return sqlite3.connect(db_path)
+    except sqlite3.Error as e:
+        raise CorruptedDataError(f"Could not open catalog database {db_path}: {e}")
+
+# ============================================================================
+# CATALOG MAPPINGS
+# ============================================================================
+
+class _SQLiteCatalog(Mapping):
+    """
+    Read-only mapping backed by one table of the catalog database
+
+    Subclasses set table, id_column, columns and _make_record.
+    """
+    table = None
+    id_column = None
+    columns = None
+
+    def __init__(self, db_path="data/catalog.db"):
+        """Open the database; nothing is loaded into memory"""
+        self.db_path = db_path
+        self.connection = _connect(db_path)
+
+    def _query(self, sql, parameters=()):
+        """Run a query, turning database errors into CorruptedDataError"""
+        try:
+            return self.connection.execute(sql, parameters)
+        except sqlite3.DatabaseError as e:
+            raise CorruptedDataError(f"Error reading catalog database {self.db_path}: {e}")
+
+    def _select(self, where="", parameters=(), order_by=None):
+        """Return records for every row matching a WHERE clause"""
+        return list(self._iter_select(where, parameters, order_by))
+
+    def _iter_select(self, where="", parameters=(), order_by=None):
+        """Yield records for matching rows one at a time, straight off the cursor"""
+        sql = f"SELECT {self.columns} FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        for row in self._query(sql, parameters):
+            yield self._make_record(row)
+
+    def __getitem__(self, record_id):
+        row = self._query(f"SELECT {self.columns} FROM {self.table} WHERE {self.id_column} = ?", (record_id,)).fetchone()
+        if row is None:
+            raise KeyError(record_id)
+        return self._make_record(row)
+
+    def __contains__(self, record_id):
+        return self._query(f"SELECT 1 FROM {self.table} WHERE {self.id_column} = ?", (record_id,)).fetchone() is not None
+
+    def __iter__(self):
+        for (record_id,) in self._query(f"SELECT {self.id_column} FROM {self.table} ORDER BY rowid"):
+            yield record_id
+
+    def __len__(self):
+        return self._query(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def items(self):
+        """View of (id, record) pairs, streamed from one query instead of one lookup per id"""
+        return _CatalogItemsView(self)
+
+    def values(self):
+        """View of all records, streamed from one query"""
+        return _CatalogValuesView(self)
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class _CatalogItemsView(ItemsView):
+    """items() view of a catalog that streams one query's rows"""
+
+    def __iter__(self):
+        catalog = self._mapping
+        for record in catalog._iter_select(order_by="rowid"):
+            yield record[catalog.id_column], record
+
+class _CatalogValuesView(ValuesView):
+    """values() view of a catalog that streams one query's rows"""
+
+    def __iter__(self):
+        return self._mapping._iter_select(order_by="rowid")
+
+class SQLiteQuestCatalog(_SQLiteCatalog):
+    """Quest catalog read from SQLite; values are Quest records"""
+    table = "quests"
+    id_column = "quest_id"
+    columns = QUEST_COLUMNS
+
+    def _make_record(self, row):
+        return Quest(*row)
+
+    def quests_by_level(self, min_level, max_level):
+        """Quests whose required level is in [min_level, max_level], in catalog order (indexed)"""
+        return self._select("required_level BETWEEN ? AND ?", (min_level, max_level), "rowid")
+
+    def quests_after(self, prerequisite_id):
+        """Quests that list prerequisite_id as their prerequisite (indexed)"""
+        return self._select("prerequisite = ?", (prerequisite_id,), "rowid")
+
+    def starting_quests(self, max_level):
+        """Quests with no prerequisite that a character of max_level can take"""
+        return self._select("prerequisite IS NULL AND required_level <= ?", (max_level,), "required_level, rowid")
+
+class SQLiteItemCatalog(_SQLiteCatalog):
+    """Item catalog read from SQLite; values are Item records"""
+    table = "items"
+    id_column = "item_id"
+    columns = ITEM_COLUMNS
+
+    def _make_record(self, row):
+        item_id, name, item_type, effect_stat, effect_value, cost, description = row
+        return Item(item_id, name, item_type, Effect(effect_stat, effect_value), cost, description)
+
+    def items_by_type(self, item_type):
+        """Items of one type, cheapest first (indexed)"""
+        return self._select("type = ?", (item_type,), "cost, item_id")
+
+    def affordable(self, gold, item_type=None):
+        """Items costing at most gold, optionally of one type, cheapest first (indexed)"""
+        if item_type is None:
+            return self._select("cost <= ?", (gold,), "cost, item_id")
+        return self._select("type = ? AND cost <= ?", (item_type, gold), "cost, item_id")
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SQLITE CATALOG TEST ===")
+
+    quest_count, item_count = import_catalog()
+    print(f"Imported {quest_count} quests and {item_count} items")
+    with SQLiteQuestCatalog() as quests:
+        print(f"Level 1-3 quests: {[quest['title'] for quest in quests.quests_by_level(1, 3)]}")
+    with SQLiteItemCatalog() as items:
+        print(f"Affordable with 100 gold: {[item['name'] for item in items.affordable(100)]}")
@@ -0,0 +1,40 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Harness Tests
+
+Checks the measurement and regression comparison used by benchmarks/runner.py.
+"""
+
+import pytest
+
+from benchmarks.harness import measure, percentile
+from benchmarks.runner import compare_results, run_benchmarks
+
+def results_with(ops_per_sec, p99_ms):
+    return {"meta": {}, "results": {"bench": {"ops_per_sec": ops_per_sec, "p99_ms": p99_ms}}}
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+
+def test_measure_reports_all_metrics():
+    result = measure(lambda: sum(range(100)), iterations=20)
+    assert result["iterations"] == 20
+    assert result["ops_per_sec"] > 0
+    assert result["p50_ms"] <= result["p99_ms"]
+    assert "peak_memory_kb" in result
+
+def test_compare_flags_regressions_only_past_threshold():
+    baseline = results_with(1000, 1.0)
+    assert compare_results(baseline, results_with(950, 1.05), threshold=0.10) == []
+    regressions = compare_results(baseline, results_with(800, 1.5), threshold=0.10)
+    assert [metric for name, metric, before, after in regressions] == ["ops_per_sec", "p99_ms"]
+
+def test_run_benchmarks_tiny_world(tmp_path):
+    results = run_benchmarks("tiny", only=["quest_handler.get_available_quests"], world_directory=str(tmp_path))
+    assert list(results["results"]) == ["quest_handler.get_available_quests"]
+    assert results["meta"]["scale"] == "tiny"
+    with pytest.raises(ValueError):
+        run_benchmarks("tiny", only=["no_such_benchmark"])
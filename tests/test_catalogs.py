@@ -0,0 +1,140 @@
+"""
+Test Catalog Views
+Tests the alternative ways of storing and querying quest and item catalogs
+"""
+
+import pytest
+import sys
+import os
+import types
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import inventory_system
+from item_table import ItemTable
+
+# ============================================================================
+# ITEM TABLE TESTS
+# ============================================================================
+
+def test_item_table_filters_match_dict_scan():
+    """Test that column filters give the same items as scanning the dict"""
+    items = game_data.load_items("data/items.txt", use_cache=False)
+    table = ItemTable(items)
+    
+    expected = sorted(
+        (item_id for item_id, item in items.items() if item['type'] == 'weapon' and item['cost'] <= 150),
+        key=lambda item_id: (items[item_id]['cost'], item_id)
+    )
+    assert table.filter(item_type='weapon', max_cost=150) == expected
+    assert set(table.filter(stat='health')) == {item_id for item_id, item in items.items() if item['effect']['stat'] == 'health'}
+    assert table.filter(item_type='shield') == []
+
+def test_item_table_shop_view_and_value():
+    """Test the shop view for a character and value-per-gold ranking"""
+    table = ItemTable.from_file("data/items.txt", use_cache=False)
+    character = {'gold': 100}
+    
+    shop = table.shop_view(character)
+    assert shop and all(item['cost'] <= 100 for item in shop)
+    assert [item['cost'] for item in shop] == sorted(item['cost'] for item in shop)
+    
+    best = table.top_value_per_gold(2)
+    ratios = sorted((item['effect']['value'] / item['cost'] for item in table.values()), reverse=True)
+    assert [table[item_id]['effect']['value'] / table[item_id]['cost'] for item_id in best] == ratios[:2]
+    assert len(table.shop_view(character, limit=1)) == 1
+
+def test_item_table_is_item_mapping(capsys):
+    """Test that the table can stand in for the item dictionary"""
+    table = ItemTable.from_file("data/items.txt", use_cache=False)
+    character = {'inventory': ['health_potion', 'health_potion']}
+    inventory_system.display_inventory(character, table)
+    
+    assert "Health Potion (x2)" in capsys.readouterr().out
+    assert 'health_potion' in table and 'nothing' not in table
+
+# ============================================================================
+# SQLITE CATALOG TESTS
+# ============================================================================
+
+def test_sqlite_catalog_matches_text_files(tmp_path):
+    """Test that the SQLite catalog returns the same records as load_*"""
+    import sqlite_catalog
+    db_path = str(tmp_path / "catalog.db")
+    counts = sqlite_catalog.import_catalog(db_path, "data/quests.txt", "data/items.txt")
+    quests = game_data.load_quests("data/quests.txt", use_cache=False)
+    items = game_data.load_items("data/items.txt", use_cache=False)
+    
+    assert counts == (len(quests), len(items))
+    with sqlite_catalog.SQLiteQuestCatalog(db_path) as quest_catalog:
+        assert dict(quest_catalog.items()) == quests
+        assert quest_catalog.items() == quests.items()
+        assert list(quest_catalog.values()) == list(quests.values())
+        assert ('first_steps', quests['first_steps']) in quest_catalog.items()
+        # The views stream rows instead of building a list of the table
+        values = iter(quest_catalog.values())
+        assert next(values) == next(iter(quests.values()))
+        assert isinstance(values, types.GeneratorType)
+        assert 'first_steps' in quest_catalog and 'nope' not in quest_catalog
+    with sqlite_catalog.SQLiteItemCatalog(db_path) as item_catalog:
+        assert item_catalog['iron_sword'] == items['iron_sword']
+        assert len(item_catalog) == len(items)
+
+def test_sqlite_catalog_indexed_queries(tmp_path):
+    """Test the indexed helpers, including through quest_handler"""
+    import sqlite_catalog
+    import quest_handler
+    db_path = str(tmp_path / "catalog.db")
+    sqlite_catalog.import_catalog(db_path, "data/quests.txt", "data/items.txt")
+    quests = game_data.load_quests("data/quests.txt", use_cache=False)
+    
+    with sqlite_catalog.SQLiteQuestCatalog(db_path) as quest_catalog:
+        by_level = quest_handler.get_quests_by_level(quest_catalog, 1, 3)
+        assert by_level == quest_handler.get_quests_by_level(quests, 1, 3)
+        assert [quest['quest_id'] for quest in quest_catalog.quests_after('first_steps')] == [
+            quest_id for quest_id, quest in quests.items() if quest['prerequisite'] == 'first_steps'
+        ]
+    with sqlite_catalog.SQLiteItemCatalog(db_path) as item_catalog:
+        assert all(item['type'] == 'weapon' and item['cost'] <= 150 for item in item_catalog.affordable(150, 'weapon'))
+
+def test_sqlite_import_rejects_duplicates(tmp_path):
+    """Test that a duplicate id fails the import and leaves no database"""
+    import sqlite_catalog
+    from custom_exceptions import InvalidDataFormatError
+    quests_path = tmp_path / "quests.txt"
+    with open("data/quests.txt") as file:
+        quest_text = file.read()
+    quests_path.write_text(quest_text + "\n\n" + quest_text)
+    db_path = str(tmp_path / "catalog.db")
+    
+    with pytest.raises(InvalidDataFormatError):
+        sqlite_catalog.import_catalog(db_path, str(quests_path), "data/items.txt")
+    assert os.listdir(tmp_path) == ["quests.txt"]
+
+# ============================================================================
+# WORLD GENERATOR TESTS
+# ============================================================================
+
+def test_generated_world_is_valid_and_seeded(tmp_path):
+    """Test that a generated world loads and is the same for the same seed"""
+    import world_generator
+    import quest_handler
+    import character_manager
+    paths = world_generator.generate_world(str(tmp_path / "a"), 700, 30, 5, seed=7)
+    quests = game_data.load_quests(paths["quests"], use_cache=False)
+    items = game_data.load_items(paths["items"], use_cache=False)
+    
+    assert len(quests) == 700 and len(items) == 30
+    assert quest_handler.validate_quest_prerequisites(quests)
+    chain = quest_handler.get_quest_prerequisite_chain(world_generator.quest_id_for(650), quests)
+    assert quests[chain[0]]['prerequisite'] is None
+    
+    hero = character_manager.load_character("Hero000003", paths["save_games"])
+    assert all(item_id in items for item_id in hero['inventory'])
+    assert all(quest_id in quests for quest_id in hero['completed_quests'])
+    
+    other_paths = world_generator.generate_world(str(tmp_path / "b"), 700, 30, 0, seed=7)
+    with open(paths["quests"]) as first, open(other_paths["quests"]) as second:
+        assert first.read() == second.read()
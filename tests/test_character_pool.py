@@ -0,0 +1,109 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Pool Tests
+
+Checks that the batched pool operations match the one-character versions,
+for each available backend.
+"""
+
+import pytest
+
+import character_manager
+from character_pool import CharacterPool, numpy
+
+BACKENDS = ["array", pytest.param("numpy", marks=pytest.mark.skipif(numpy is None, reason="NumPy not installed"))]
+
+def make_heroes():
+    heroes = [character_manager.create_character(f"Pool {number}", "Mage") for number in range(6)]
+    for number, hero in enumerate(heroes):
+        hero["experience"] = number * 90
+        hero["level"] = character_manager.level_for_experience(hero["experience"])
+        hero["health"] = number * 15
+    return heroes
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batch_matches_single_operations(backend):
+    heroes, expected = make_heroes(), make_heroes()
+    pool = CharacterPool(heroes, backend)
+    assert list(pool.is_character_dead()) == [character_manager.is_character_dead(hero) for hero in expected]
+
+    leveled = pool.gain_experience(150)
+    for hero in expected[1:]:
+        character_manager.gain_experience(hero, 150, announce=False)
+    assert leveled == [1, 2, 3, 4, 5]
+
+    healed = pool.heal_character([5, 10, 15, 20, 25, 30])
+    assert list(healed) == [character_manager.heal_character(hero, amount) for hero, amount in zip(expected, [5, 10, 15, 20, 25, 30])]
+    pool.add_gold(-100, rows=[2, 4])
+    for hero in (expected[2], expected[4]):
+        character_manager.add_gold(hero, -100)
+
+    assert heroes[1]["level"] == 1
+    assert pool.sync()
+    assert heroes == expected
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_revive_and_all_or_nothing_gold(backend):
+    heroes = make_heroes()
+    heroes[3]["health"] = -5
+    pool = CharacterPool(heroes, backend)
+    assert pool.revive_character() == 2
+    assert pool.stats(0)["health"] == pool.stats(3)["health"] == heroes[0]["max_health"] // 2
+    assert pool.stats(1)["health"] == 15
+
+    with pytest.raises(ValueError):
+        pool.add_gold([-50, -150], rows=[0, 1])
+    assert [pool.stats(row)["gold"] for row in (0, 1)] == [100, 100]
+    pool.refresh()
+    assert pool.stats(0)["health"] == 0
+
+def test_array_backend_matches_per_character_operations():
+    import random
+    rng = random.Random(163)
+    heroes = [character_manager.create_character(f"Crowd {number}", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"])) for number in range(200)]
+    for hero in heroes:
+        hero["experience"] = rng.randrange(0, 2000)
+        hero["level"] = character_manager.level_for_experience(hero["experience"])
+        hero["max_health"] += hero["level"] * 10
+        hero["health"] = rng.randrange(0, hero["max_health"] + 1)
+    expected = [hero.copy() for hero in heroes]
+    pool = CharacterPool(heroes, "array")
+
+    for round_number in range(5):
+        rows = sorted(rng.sample(range(len(heroes)), 50))
+        xp = [rng.randrange(0, 400) for row in rows]
+        heal = [rng.randrange(0, 60) for row in rows]
+        pool.gain_experience(xp, rows)
+        pool.heal_character(heal, rows)
+        for row, xp_amount, heal_amount in zip(rows, xp, heal):
+            hero = expected[row]
+            if hero["health"] > 0:
+                character_manager.gain_experience(hero, xp_amount, announce=False)
+            character_manager.heal_character(hero, heal_amount)
+    pool.sync()
+    assert heroes == expected
+
+def test_sync_writes_only_selected_rows(monkeypatch):
+    import character_pool
+    journaled = []
+    monkeypatch.setattr(character_pool, "journal_set", lambda character, *stats: journaled.append((character["name"], stats)))
+    heroes = make_heroes()
+    pool = CharacterPool(heroes, "array")
+    pool.add_gold(5, rows=[1, 3])
+    pool.heal_character(1, rows=[3])
+    heroes[0]["gold"] = 7
+    assert pool.sync() == ["health", "gold"]
+    assert journaled == [("Pool 1", ("gold",)), ("Pool 3", ("health", "gold"))]
+    assert heroes[0]["gold"] == 7
+
+@pytest.mark.skipif(numpy is None, reason="NumPy not installed")
+@pytest.mark.parametrize("backend", ["array", "numpy"])
+def test_numpy_integer_amounts(backend):
+    pool = CharacterPool(make_heroes(), backend)
+    pool.add_gold(numpy.int64(5))
+    pool.heal_character(numpy.int64(5), rows=[1])
+    assert pool.stats(0)["gold"] == 105 and pool.stats(1)["health"] == 20
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        CharacterPool([], "gpu")
@@ -0,0 +1,38 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Progression Tests
+
+Covers leveling up from experience in one step.
+"""
+
+import character_manager
+
+def test_large_grant_levels_up_in_one_step(capsys):
+    hero = character_manager.create_character("Leveler", "Warrior")
+    character_manager.gain_experience(hero, 1_000_000)
+    assert hero["level"] == 10001
+    assert hero["max_health"] == 120 + 10 * 10000
+    assert hero["strength"] == 15 + 2 * 10000
+    assert hero["health"] == hero["max_health"]
+    assert capsys.readouterr().out.strip() == "Leveler has reached level 10001! (levels 2-10001)"
+
+def test_level_thresholds_match_formula():
+    assert [character_manager.level_for_experience(xp) for xp in (0, 99, 100, 199, 200, 550)] == [1, 1, 2, 2, 3, 6]
+
+def test_no_level_up_and_quiet_mode(capsys):
+    hero = character_manager.create_character("Quiet", "Mage")
+    character_manager.gain_experience(hero, 99)
+    assert hero["level"] == 1
+    character_manager.gain_experience(hero, 1, announce=False)
+    assert hero["level"] == 2
+    assert capsys.readouterr().out == ""
+
+def test_level_up_listeners_get_one_event():
+    events = []
+    character_manager.level_up_listeners.append(lambda character, old, new: events.append((old, new)))
+    try:
+        hero = character_manager.create_character("Listener", "Rogue")
+        character_manager.gain_experience(hero, 450, announce=False)
+    finally:
+        character_manager.level_up_listeners.clear()
+    assert events == [(1, 5)]
@@ -0,0 +1,82 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Record Tests
+
+Covers the slotted Character and its dictionary-style view.
+"""
+
+import pickle
+import pytest
+
+import character_manager
+from game_records import Character, QuestList, QUEST_INDEX_THRESHOLD
+from custom_exceptions import InvalidSaveDataError
+
+def test_character_acts_like_a_dictionary():
+    hero = character_manager.create_character("Slotted", "Rogue")
+    assert isinstance(hero, Character)
+    assert hero["class"] == hero.character_class == "Rogue"
+    hero["gold"] += 5
+    assert hero.gold == 105
+    assert list(hero) == list(Character.KEYS)
+    assert "combat_active" not in hero and hero.get("combat_active", False) is False
+
+    hero["combat_active"] = True
+    hero["equipped"] = {"weapon": "iron_sword"}
+    hero["title"] = "the Quick"
+    assert hero.combat_active is True and hero.extras == {"title": "the Quick"}
+    assert len(hero) == len(Character.KEYS) + 3
+    assert dict(hero)["equipped"]["weapon"] == "iron_sword"
+    del hero["combat_active"]
+    assert "combat_active" not in hero
+    with pytest.raises(KeyError):
+        del hero["combat_active"]
+
+def test_fields_are_type_checked():
+    hero = character_manager.create_character("Typed", "Mage")
+    with pytest.raises(TypeError):
+        hero["gold"] = "lots"
+    with pytest.raises(TypeError):
+        hero["inventory"] = "iron_sword"
+    hero["completed_quests"] = ["first_quest"]
+    assert type(hero.completed_quests) is QuestList
+    assert character_manager.validate_character_data(hero)
+    del hero["level"]
+    assert hero.missing_keys() == ["level"]
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.validate_character_data(hero)
+
+def test_copies_pickles_and_compares_with_dicts():
+    hero = character_manager.create_character("Copied", "Cleric")
+    hero["active_quests"].append("first_quest")
+    assert hero == dict(hero)
+    copy = hero.copy()
+    copy["active_quests"].append("second_quest")
+    copy["inventory"].append("health_potion")
+    assert hero["active_quests"] == ["first_quest"] and hero["inventory"] == []
+    restored = pickle.loads(pickle.dumps(hero))
+    assert restored == hero and type(restored.active_quests) is QuestList
+
+def test_quest_list_index_stays_in_sync():
+    quests = QuestList(f"quest_{number}" for number in range(QUEST_INDEX_THRESHOLD + 5))
+    assert "quest_3" in quests and "missing" not in quests
+    quests.remove("quest_3")
+    quests.append("quest_3")
+    quests.append("quest_3")
+    quests.remove("quest_3")
+    assert "quest_3" in quests
+    quests.pop()
+    assert "quest_3" not in quests
+    quests[0] = "replaced"
+    assert "replaced" in quests and "quest_0" not in quests
+    quests.clear()
+    assert "replaced" not in quests and quests == []
+
+def test_saved_characters_load_as_characters(tmp_path):
+    hero = character_manager.create_character("Loaded", "Warrior")
+    hero["completed_quests"] = [f"quest_{number}" for number in range(20)]
+    for save_format in character_manager.SAVE_FORMATS:
+        character_manager.save_character(hero, str(tmp_path), save_format)
+        loaded = character_manager.load_character("Loaded", str(tmp_path))
+        assert isinstance(loaded, Character) and loaded == hero
+        assert "quest_19" in loaded.completed_quests
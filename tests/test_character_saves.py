@@ -0,0 +1,557 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Save Tests
+
+Covers the text and binary save formats and converting between them.
+"""
+
+import os
+import time
+import pytest
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError, InvalidSaveDataError, SaveFileCorruptedError
+
+def make_hero(name="Save Tester"):
+    hero = character_manager.create_character(name, "Mage")
+    hero["gold"] = 2 ** 40
+    hero["inventory"] = ["health_potion", "health_potion", "iron_sword", "épée"]
+    hero["active_quests"] = ["first_quest"]
+    hero["completed_quests"] = []
+    return hero
+
+def save_file(directory, name="Save Tester"):
+    return os.path.join(directory, f"{name.lower().replace(' ', '_')}_save.txt")
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_round_trip(tmp_path, save_format):
+    hero = make_hero()
+    character_manager.save_character(hero, str(tmp_path), save_format)
+    assert character_manager.load_character("Save Tester", str(tmp_path)) == hero
+
+def test_binary_is_detected_and_smaller(tmp_path):
+    hero = make_hero()
+    hero["inventory"] = ["health_potion"] * 20
+    text_dir, binary_dir = tmp_path / "text", tmp_path / "binary"
+    character_manager.save_character(hero, str(text_dir), "text")
+    character_manager.save_character(hero, str(binary_dir), "binary")
+    binary_bytes = open(save_file(binary_dir), 'rb').read()
+    assert binary_bytes.startswith(character_manager.BINARY_MAGIC)
+    assert len(binary_bytes) < os.path.getsize(save_file(text_dir))
+
+def test_convert_saves_both_ways(tmp_path):
+    hero = make_hero()
+    character_manager.save_character(hero, str(tmp_path), "text")
+    assert character_manager.convert_saves(str(tmp_path), "binary") == 1
+    assert open(save_file(tmp_path), 'rb').read().startswith(character_manager.BINARY_MAGIC)
+    character_manager.convert_save("Save Tester", str(tmp_path), "text")
+    assert open(save_file(tmp_path)).read().startswith("NAME:Save Tester")
+    assert character_manager.load_character("Save Tester", str(tmp_path)) == hero
+
+def test_corrupt_binary_saves_are_rejected(tmp_path):
+    data = character_manager.encode_binary_save(make_hero())
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_save(data[:-3])
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.decode_save(data[:4] + b"\x09\x00" + data[6:])
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.decode_save(b"NAME:\xff\xfe")
+
+def test_unknown_save_format(tmp_path):
+    with pytest.raises(ValueError):
+        character_manager.save_character(make_hero(), str(tmp_path), "yaml")
+
+def test_binary_rejects_nul_in_strings():
+    hero = make_hero()
+    hero["inventory"] = ["bad\x00id"]
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.encode_binary_save(hero)
+
+# ============================================================================
+# ATOMIC SAVES AND SaveWriter
+# ============================================================================
+
+from save_writer import SaveWriter, write_group
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_save_character_leaves_no_temp_files(tmp_path):
+    character_manager.save_character(make_hero(), str(tmp_path), fsync=True)
+    assert sorted(os.listdir(tmp_path)) == [".locks", ".manifest", "save_tester_save.txt"]
+
+def test_writer_coalesces_saves_within_window(tmp_path):
+    clock = FakeClock()
+    writer = SaveWriter(str(tmp_path), window=1.0, clock=clock)
+    hero, other = make_hero(), make_hero("Other Hero")
+    for gold in range(5):
+        hero["gold"] = gold
+        assert writer.save(hero) is False
+    writer.save(other)
+    assert sorted(writer.pending()) == ["Other Hero", "Save Tester"]
+    assert os.listdir(tmp_path) == []
+
+    clock.now = 1.5
+    hero["gold"] = 99
+    assert writer.save(hero) is True
+    assert writer.commits == 1 and writer.files_written == 2 and writer.saves_requested == 7
+    assert character_manager.load_character("Save Tester", str(tmp_path))["gold"] == 99
+    assert writer.pending() == []
+
+def test_writer_close_flushes_pending(tmp_path):
+    with SaveWriter(str(tmp_path), window=60, save_format="binary", fsync=False) as writer:
+        writer.save(make_hero())
+    assert character_manager.load_character("Save Tester", str(tmp_path)) == make_hero()
+
+def test_failed_group_keeps_old_saves(tmp_path):
+    character_manager.save_character(make_hero(), str(tmp_path))
+    good = (character_manager.get_save_path("Save Tester", str(tmp_path)), b"NAME:broken")
+    bad = (os.path.join(str(tmp_path), "missing_dir", "x_save.txt"), b"")
+    with pytest.raises(OSError):
+        write_group([good, bad])
+    assert character_manager.load_character("Save Tester", str(tmp_path)) == make_hero()
+    assert sorted(os.listdir(tmp_path)) == [".locks", ".manifest", "save_tester_save.txt"]
+
+def test_writer_background_thread(tmp_path):
+    writer = SaveWriter(str(tmp_path), window=0.01, fsync=False)
+    writer.start()
+    writer.mark_dirty(make_hero())
+    for attempt in range(200):
+        if not writer.pending():
+            break
+        time.sleep(0.01)
+    writer.close()
+    assert os.path.exists(character_manager.get_save_path("Save Tester", str(tmp_path)))
+
+def test_writer_merges_names_for_the_same_save(tmp_path):
+    writer = SaveWriter(str(tmp_path), window=60, fsync=False)
+    writer.save(make_hero("Hero"))
+    late = make_hero("hero")
+    late["gold"] = 7
+    writer.save(late)
+    assert writer.pending() == ["hero"]
+    assert writer.flush() == 1
+    assert character_manager.load_character("Hero", str(tmp_path))["gold"] == 7
+
+def test_writer_background_thread_survives_lock_timeout(tmp_path, monkeypatch):
+    import threading
+    from custom_exceptions import SaveLockTimeoutError
+    monkeypatch.setattr(character_manager, "SAVE_LOCK_TIMEOUT", 0.02)
+    acquired, release = threading.Event(), threading.Event()
+    def hold():
+        with character_manager.lock_character("Save Tester", str(tmp_path)):
+            acquired.set()
+            release.wait(5)
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert acquired.wait(5)
+
+    errors = []
+    writer = SaveWriter(str(tmp_path), window=0.01, fsync=False)
+    writer.start(on_error=errors.append)
+    writer.mark_dirty(make_hero())
+    for attempt in range(200):
+        if errors:
+            break
+        time.sleep(0.01)
+    release.set()
+    holder.join()
+    for attempt in range(200):
+        if not writer.pending():
+            break
+        time.sleep(0.01)
+    assert isinstance(errors[0], SaveLockTimeoutError)
+    assert writer._thread.is_alive() and writer.pending() == []
+    writer.close()
+
+# ============================================================================
+# SAVE MANIFEST
+# ============================================================================
+
+def test_manifest_tracks_saves_and_deletes(tmp_path):
+    directory = str(tmp_path)
+    for number, character_class in enumerate(["Mage", "Rogue", "Mage"]):
+        hero = character_manager.create_character(f"Hero {number}", character_class)
+        hero["level"] = number + 1
+        character_manager.save_character(hero, directory)
+    character_manager.delete_character("Hero 1", directory)
+
+    assert sorted(character_manager.list_saved_characters(directory)) == ["Hero 0", "Hero 2"]
+    mages = character_manager.list_character_summaries(directory, character_class="Mage", min_level=2)
+    assert [(summary["name"], summary["level"], summary["gold"]) for summary in mages] == [("Hero 2", 3, 100)]
+    assert mages[0]["mtime"] > 0
+
+def test_manifest_built_from_existing_saves(tmp_path):
+    directory = str(tmp_path)
+    character_manager.save_character(make_hero("Old Save"), directory)
+    os.remove(character_manager.get_manifest_path(directory))
+    with open(os.path.join(directory, "broken_save.txt"), 'w') as file:
+        file.write("garbage")
+
+    character_manager.save_character(make_hero("New Save"), directory)
+    assert sorted(character_manager.list_saved_characters(directory)) == ["New Save", "Old Save"]
+
+def test_manifest_compacts_and_writer_updates_it(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    for gold in range(character_manager.MANIFEST_COMPACT_RATIO * 256 + 1):
+        hero["gold"] = gold
+        character_manager.save_character(hero, directory)
+    assert character_manager.read_manifest(directory)["save_tester"]["gold"] == hero["gold"]
+    with open(character_manager.get_manifest_path(directory)) as file:
+        assert len(file.readlines()) == 1
+
+    with SaveWriter(directory, window=60, fsync=False) as writer:
+        writer.save(make_hero("Writer Hero"))
+    assert "Writer Hero" in character_manager.list_saved_characters(directory)
+
+def test_appends_alone_keep_manifest_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(character_manager, "MANIFEST_CHECK_BYTES", 1024)
+    directory = str(tmp_path)
+    hero = make_hero()
+    character_manager.save_character(hero, directory)
+    for save in range(3000):
+        character_manager.record_saves(directory, [hero])
+    with open(character_manager.get_manifest_path(directory)) as file:
+        assert len(file.readlines()) <= character_manager.MANIFEST_COMPACT_RATIO * 256 * 2
+    character_manager._manifest_cache.clear()
+    assert list(character_manager.read_manifest(directory)) == ["save_tester"]
+
+def test_listing_without_manifest_keeps_saved_names(tmp_path):
+    directory = str(tmp_path)
+    character_manager.save_character(make_hero("McDuff the Bold"), directory)
+    with_manifest = character_manager.list_saved_characters(directory)
+    os.remove(character_manager.get_manifest_path(directory))
+    assert character_manager.list_saved_characters(directory) == with_manifest == ["McDuff the Bold"]
+
+def test_manifest_appends_survive_concurrent_compaction(tmp_path, monkeypatch):
+    import threading
+    directory = str(tmp_path)
+    monkeypatch.setattr(character_manager, "MANIFEST_COMPACT_RATIO", 0)
+    character_manager.save_character(make_hero("Seed"), directory)
+    names = [f"Racer {number}" for number in range(40)]
+
+    def save_all(batch):
+        for name in batch:
+            character_manager.save_character(make_hero(name), directory)
+
+    def read_all():
+        for attempt in range(40):
+            character_manager._manifest_cache.clear()
+            character_manager.read_manifest(directory)
+
+    threads = [threading.Thread(target=save_all, args=(names[start::2],)) for start in range(2)]
+    threads.append(threading.Thread(target=read_all))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    character_manager._manifest_cache.clear()
+    assert sorted(character_manager.list_saved_characters(directory)) == sorted(names + ["Seed"])
+
+# ============================================================================
+# SHARDED LAYOUT
+# ============================================================================
+
+def test_sharded_layout_round_trip(tmp_path):
+    directory = str(tmp_path)
+    character_manager.migrate_save_layout(directory, "sharded")
+    character_manager.save_character(make_hero(), directory)
+    path = character_manager.get_save_path("Save Tester", directory)
+    assert os.path.relpath(path, directory).count(os.sep) == 2 and os.path.exists(path)
+    assert character_manager.load_character("Save Tester", directory) == make_hero()
+    character_manager.delete_character("Save Tester", directory)
+    assert character_manager.list_saved_characters(directory) == []
+
+def test_migrate_flat_to_sharded_and_back(tmp_path):
+    directory = str(tmp_path)
+    names = [f"Hero {number}" for number in range(20)]
+    for name in names:
+        character_manager.save_character(make_hero(name), directory)
+    os.remove(character_manager.get_manifest_path(directory))
+
+    assert character_manager.migrate_save_layout(directory, "sharded") == 20
+    assert character_manager.get_save_layout(directory) == "sharded"
+    assert not [name for name in os.listdir(directory) if name.endswith("_save.txt")]
+    # Listing rebuilds the manifest that was removed above
+    assert sorted(character_manager.list_saved_characters(directory)) == sorted(names)
+    assert character_manager.load_character("Hero 7", directory)["name"] == "Hero 7"
+
+    assert character_manager.migrate_save_layout(directory, "flat") == 20
+    assert sorted(os.listdir(directory)) == sorted([".layout", ".locks", ".manifest"] + [f"hero_{number}_save.txt" for number in range(20)])
+
+def test_migration_waits_for_locked_saves(tmp_path):
+    import threading
+    directory = str(tmp_path)
+    for name in ("Busy Hero", "Idle Hero"):
+        character_manager.save_character(make_hero(name), directory)
+    flat_path = character_manager.get_save_path("Busy Hero", directory)
+    acquired, release = threading.Event(), threading.Event()
+
+    def hold():
+        with character_manager.lock_character("Busy Hero", directory):
+            acquired.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert acquired.wait(5)
+    migration = threading.Thread(target=character_manager.migrate_save_layout, args=(directory, "sharded"))
+    migration.start()
+    migration.join(0.2)
+    try:
+        assert migration.is_alive() and os.path.exists(flat_path)
+    finally:
+        release.set()
+        holder.join()
+        migration.join()
+    assert not os.path.exists(flat_path)
+    assert character_manager.load_character("Busy Hero", directory)["name"] == "Busy Hero"
+
+def test_interrupted_migration_still_loads(tmp_path):
+    directory = str(tmp_path)
+    character_manager.save_character(make_hero("Flat Hero"), directory)
+    with open(os.path.join(directory, character_manager.LAYOUT_FILE), 'w') as file:
+        file.write("sharded")
+    assert character_manager.load_character("Flat Hero", directory)["name"] == "Flat Hero"
+    character_manager.save_character(make_hero("Flat Hero"), directory)
+    assert character_manager.migrate_save_layout(directory, "sharded") == 0
+    assert character_manager.list_saved_characters(directory) == ["Flat Hero"]
+
+# ============================================================================
+# LOADED CHARACTER CACHE
+# ============================================================================
+
+def test_cache_hits_and_returns_copies(tmp_path):
+    directory = str(tmp_path)
+    cache = character_manager.character_cache
+    cache.clear()
+    character_manager.save_character(make_hero(), directory)
+    first = character_manager.load_character("Save Tester", directory)
+    first["inventory"].append("stolen")
+    second = character_manager.load_character("save tester", directory)
+    assert second == make_hero()
+    assert cache.info()["hits"] == 1 and cache.info()["misses"] == 1
+
+def test_cache_invalidated_by_save_delete_and_outside_edits(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    character_manager.save_character(hero, directory)
+    character_manager.load_character("Save Tester", directory)
+    hero["gold"] = 5
+    character_manager.save_character(hero, directory)
+    assert character_manager.load_character("Save Tester", directory)["gold"] == 5
+
+    path = character_manager.get_save_path("Save Tester", directory)
+    with open(path, 'w') as file:
+        file.write(character_manager.encode_text_save(dict(hero, gold=123456)))
+    assert character_manager.load_character("Save Tester", directory)["gold"] == 123456
+
+    character_manager.delete_character("Save Tester", directory)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Save Tester", directory)
+
+def test_cache_capacity_and_eviction():
+    cache = character_manager.CharacterCache(capacity=2)
+    for name in "abc":
+        cache.put(("dir", name), (1, 1), {"name": name})
+    assert cache.get(("dir", "a"), (1, 1)) is None
+    assert cache.get(("dir", "c"), (1, 1)) == {"name": "c"}
+    assert cache.get(("dir", "c"), (2, 1)) is None
+    cache.resize(1)
+    assert len(cache) == 1
+    cache.resize(0)
+    cache.put(("dir", "d"), (1, 1), {"name": "d"})
+    assert len(cache) == 0
+
+# ============================================================================
+# CHARACTER JOURNAL
+# ============================================================================
+
+import inventory_system
+import quest_handler
+
+QUESTS = {
+    "first_quest": {"title": "First", "reward_xp": 250, "reward_gold": 40, "required_level": 1, "prerequisite": "NONE"}
+}
+
+def journal_file(directory, name="Save Tester"):
+    return character_manager.get_journal_path(character_manager.get_save_path(name, directory))
+
+def test_journal_records_mutations_and_replays(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    hero["active_quests"] = []
+    character_manager.enable_journal(hero, directory, background=False)
+    snapshot = open(character_manager.get_save_path("Save Tester", directory), 'rb').read()
+
+    character_manager.add_gold(hero, -(2 ** 40) + 10)
+    inventory_system.add_item_to_inventory(hero, "iron_sword")
+    inventory_system.remove_item_from_inventory(hero, "health_potion")
+    quest_handler.accept_quest(hero, "first_quest", QUESTS)
+    quest_handler.complete_quest(hero, "first_quest", QUESTS)
+    character_manager.heal_character(hero, 5)
+
+    # The snapshot is untouched; only the journal grew
+    assert open(character_manager.get_save_path("Save Tester", directory), 'rb').read() == snapshot
+    assert open(journal_file(directory)).read().count("\n") > 5
+    assert character_manager.load_character("Save Tester", directory) == hero
+
+def test_journal_compacts_past_threshold(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    journal = character_manager.enable_journal(hero, directory, compact_bytes=200, background=False)
+    for gold in range(50):
+        character_manager.add_gold(hero, 1)
+    assert journal.compactions > 1
+    assert os.path.getsize(journal_file(directory)) < 250
+    assert character_manager.load_character("Save Tester", directory)["gold"] == hero["gold"]
+
+def test_background_compaction_and_disable(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    journal = character_manager.enable_journal(hero, directory, compact_bytes=100)
+    for gold in range(20):
+        character_manager.add_gold(hero, 1)
+    assert character_manager._compactor.wait()
+    assert journal.compactions > 1
+    assert character_manager.disable_journal(hero) is True
+    assert not os.path.exists(journal_file(directory))
+    assert character_manager.load_character("Save Tester", directory)["gold"] == hero["gold"]
+    assert character_manager.get_journal(hero) is None
+
+def test_background_compaction_survives_lock_timeout(tmp_path, monkeypatch, capsys):
+    import threading
+    monkeypatch.setattr(character_manager, "SAVE_LOCK_TIMEOUT", 0.02)
+    directory = str(tmp_path)
+    hero = make_hero()
+    journal = character_manager.enable_journal(hero, directory, compact_bytes=100)
+    acquired, release = threading.Event(), threading.Event()
+    def hold():
+        with character_manager.lock_character("Save Tester", directory):
+            acquired.set()
+            release.wait(5)
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert acquired.wait(5)
+    try:
+        for gold in range(10):
+            character_manager.add_gold(hero, 1)
+        assert character_manager._compactor.wait()
+        assert journal.compactions == 1
+        assert "Journal compaction failed" in capsys.readouterr().out
+    finally:
+        release.set()
+        holder.join()
+    character_manager.add_gold(hero, 1)
+    assert character_manager._compactor.wait()
+    assert journal.compactions == 2
+    character_manager.disable_journal(hero)
+
+def test_journal_goes_away_with_its_character(tmp_path):
+    import gc
+    import weakref
+    hero = make_hero()
+    journal = weakref.ref(character_manager.enable_journal(hero, str(tmp_path), background=False))
+    assert character_manager.get_journal(hero.copy()) is None
+    del hero
+    gc.collect()
+    assert journal() is None
+    with pytest.raises(TypeError):
+        character_manager.enable_journal(dict(make_hero()), str(tmp_path))
+
+def test_combat_health_changes_are_journaled(tmp_path):
+    import combat_system
+    directory = str(tmp_path)
+    hero = character_manager.create_character("Journal Fighter", "Cleric")
+    character_manager.save_character(hero, directory)
+    character_manager.enable_journal(hero, directory, background=False)
+    battle = combat_system.SimpleBattle(hero, combat_system.create_enemy("goblin"))
+    battle.apply_damage(hero, 50)
+    character_manager.add_gold(hero, 5)
+    reloaded = character_manager.load_character("Journal Fighter", directory)
+    assert reloaded["health"] == hero["health"] == hero["max_health"] - 50
+    assert reloaded["gold"] == hero["gold"]
+
+    combat_system.cleric_heal(hero)
+    assert character_manager.load_character("Journal Fighter", directory)["health"] == hero["max_health"] - 20
+    character_manager.disable_journal(hero)
+
+def test_torn_and_stale_journals(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    character_manager.enable_journal(hero, directory, background=False)
+    character_manager.add_gold(hero, 7)
+    with open(journal_file(directory), 'a') as file:
+        file.write("S\tgold\t99")
+    assert character_manager.load_character("Save Tester", directory)["gold"] == 2 ** 40 + 7
+
+    # A full save of a different character object replaces the snapshot
+    character_manager.save_character(make_hero(), directory)
+    assert not os.path.exists(journal_file(directory))
+    assert character_manager.load_character("Save Tester", directory)["gold"] == 2 ** 40
+    character_manager.disable_journal(hero)
+
+def test_bulk_save_load_collects_errors(tmp_path):
+    directory = str(tmp_path)
+    heroes = [make_hero(f"Bulk {number}") for number in range(12)]
+    broken = make_hero("Broken")
+    del broken["level"]
+    result = character_manager.save_characters(heroes + [broken], directory, workers=4)
+    assert len(result.succeeded) == 12 and list(result.failed) == ["Broken"]
+    assert len(character_manager.read_manifest(directory)) == 12
+
+    with open(save_file(directory, "Bulk 3"), 'w') as file:
+        file.write("NAME: Bulk 3\nLEVEL: lots\n")
+    names = [hero["name"] for hero in heroes] + ["Nobody"]
+    result = character_manager.load_characters(names, directory, workers=4)
+    assert not result.ok
+    assert isinstance(result.failed["Nobody"], CharacterNotFoundError)
+    assert isinstance(result.failed["Bulk 3"], InvalidSaveDataError)
+    assert result.succeeded["Bulk 7"] == heroes[7]
+    assert len(result.succeeded) == 11
+
+    errors = character_manager.BatchResult()
+    loaded = dict(character_manager.iter_all_characters(directory, workers=4, result=errors, chunk_size=5))
+    assert len(loaded) == 11 and loaded["bulk_0"] == heroes[0]
+    assert list(errors.failed) == ["bulk_3"]
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_peek_reads_only_requested_fields(tmp_path, save_format):
+    directory = str(tmp_path)
+    hero = make_hero()
+    hero["completed_quests"] = [f"quest_{number}" for number in range(5000)]
+    character_manager.save_character(hero, directory, save_format)
+    assert character_manager.peek_character("Save Tester", directory) == {
+        "name": "Save Tester", "class": "Mage", "level": 1, "gold": 2 ** 40
+    }
+    assert character_manager.peek_character("Save Tester", directory, fields=["health", "active_quests"]) == {
+        "health": hero["health"], "active_quests": ["first_quest"]
+    }
+    with pytest.raises(ValueError):
+        character_manager.peek_character("Save Tester", directory, fields=["shoe_size"])
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.peek_character("Nobody", directory)
+
+def test_peek_stops_before_lists_and_sees_journals(tmp_path):
+    directory = str(tmp_path)
+    hero = make_hero()
+    character_manager.save_character(hero, directory, "text")
+    text = open(save_file(directory)).read()
+    assert text.index("GOLD:") < text.index("INVENTORY:")
+    with open(save_file(directory), 'a') as file:
+        file.write("\nNOT A VALID LINE \xff")
+    assert character_manager.peek_character("Save Tester", directory)["gold"] == 2 ** 40
+    with open(save_file(directory), 'w') as file:
+        file.write("NAME:Save Tester\nCLASS:Mage\n")
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.peek_character("Save Tester", directory)
+
+    character_manager.save_character(hero, directory)
+    character_manager.enable_journal(hero, directory, background=False)
+    character_manager.add_gold(hero, 5)
+    assert character_manager.peek_character("Save Tester", directory, fields=["gold"]) == {"gold": 2 ** 40 + 5}
+    character_manager.disable_journal(hero)
@@ -0,0 +1,333 @@
+"""
+Test Game Data Loading
+Tests the streaming loaders and other catalog loading options
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+QUEST_TEXT = """QUEST_ID: first_steps
+TITLE: First Steps
+DESCRIPTION: Begin your adventure
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: goblin_hunter
+TITLE: Goblin Hunter
+DESCRIPTION: Defeat 3 goblins
+REWARD_XP: 100
+REWARD_GOLD: 75
+REQUIRED_LEVEL: 2
+PREREQUISITE: first_steps
+"""
+
+ITEM_TEXT = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+def write_file(directory, name, text):
+    """Write a data file into a pytest tmp_path and return its path"""
+    path = directory / name
+    path.write_text(text)
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_each_block(tmp_path):
+    """Test that iter_quests yields parsed quests in file order"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = list(game_data.iter_quests(path))
+    
+    assert [quest_id for quest_id, quest in quests] == ["first_steps", "goblin_hunter"]
+    assert quests[0][1]['REWARD_XP'] == 50
+    assert quests[0][1]['PREREQUISITE'] is None
+
+def test_iter_items_matches_load_items(tmp_path):
+    """Test that streaming and dict loading give the same items"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    
+    assert dict(game_data.iter_items(path)) == game_data.load_items(path)
+
+def test_iter_quests_missing_file():
+    """Test that iter_quests raises MissingDataFileError on first use"""
+    with pytest.raises(MissingDataFileError):
+        next(game_data.iter_quests("nonexistent_file.txt"))
+
+def test_iter_quests_stops_on_bad_block(tmp_path):
+    """Test that a bad block raises once the stream reaches it"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT + "\nQUEST_ID: broken\nTITLE: Broken\n")
+    stream = game_data.iter_quests(path)
+    next(stream)
+    next(stream)
+    with pytest.raises(InvalidDataFormatError):
+        next(stream)
+
+def test_load_quests_duplicate_id(tmp_path):
+    """Test that duplicate quest ids are still rejected"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT + "\n" + QUEST_TEXT)
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(path)
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_written_and_reused(tmp_path):
+    """Test that loading writes a cache that later loads read from"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(path)
+    cache_path = game_data.get_cache_path(path)
+    
+    assert os.path.exists(cache_path)
+    assert game_data._read_cache(cache_path)['data'] == quests
+    assert game_data.load_quests(path) == quests
+
+def test_cache_rebuilt_when_file_changes(tmp_path):
+    """Test that a stale cache is ignored and rebuilt"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    game_data.load_items(path)
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: 30"))
+    
+    assert game_data.load_items(path)['health_potion']['COST'] == 30
+
+def test_cache_survives_touch(tmp_path):
+    """Test that a new mtime with the same content keeps the cache"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    game_data.load_quests(path)
+    os.utime(path, ns=(1, 1))
+    
+    assert len(game_data.load_quests(path)) == 2
+    assert game_data._read_cache(game_data.get_cache_path(path))['mtime_ns'] == 1
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_quests_parse_on_access(tmp_path):
+    """Test that the lazy catalog indexes everything but parses on demand"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    with game_data.load_quests(path, lazy=True) as quests:
+        assert len(quests) == 2
+        assert "goblin_hunter" in quests
+        assert quests._parsed == {}
+        
+        assert quests["goblin_hunter"]['PREREQUISITE'] == "first_steps"
+        assert list(quests._parsed) == ["goblin_hunter"]
+        assert dict(quests) == game_data.load_quests(path, use_cache=False)
+
+def test_lazy_items_extra_blank_lines(tmp_path):
+    """Test that runs of blank lines between items are handled"""
+    path = write_file(tmp_path, "items.txt", "\n\n" + ITEM_TEXT + "\n\n")
+    with game_data.LazyItemDict(path) as items:
+        assert list(items) == ["health_potion", "iron_sword"]
+        assert items["iron_sword"]['EFFECT'] == ("strength", 5)
+
+def test_lazy_catalog_duplicate_and_missing(tmp_path):
+    """Test that indexing rejects duplicates and reports missing files"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT + "\n" + QUEST_TEXT)
+    with pytest.raises(InvalidDataFormatError):
+        game_data.LazyQuestDict(path)
+    with pytest.raises(MissingDataFileError):
+        game_data.LazyQuestDict(str(tmp_path / "missing.txt"))
+
+# ============================================================================
+# PARALLEL LOADING TESTS
+# ============================================================================
+
+def make_quest_text(count):
+    """Build a quest file with count chained quests"""
+    blocks = []
+    for number in range(count):
+        prerequisite = f"quest_{number - 1}" if number else "NONE"
+        blocks.append(
+            f"QUEST_ID: quest_{number}\nTITLE: Quest {number}\nDESCRIPTION: Quest number {number}\n"
+            f"REWARD_XP: {number * 10}\nREWARD_GOLD: {number}\nREQUIRED_LEVEL: 1\nPREREQUISITE: {prerequisite}\n"
+        )
+    return "\n".join(blocks)
+
+def test_split_block_ranges_cut_between_blocks(tmp_path):
+    """Test that every range starts at the beginning of a block"""
+    path = write_file(tmp_path, "quests.txt", make_quest_text(40))
+    ranges = game_data.split_block_ranges(path, 8)
+    
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(path)
+    with open(path, 'rb') as file:
+        data = file.read()
+    for start, end in ranges[1:]:
+        assert data[start:].startswith(b"QUEST_ID:")
+
+def test_parallel_load_matches_serial(tmp_path):
+    """Test that workers=2 gives the same quests as a serial load"""
+    path = write_file(tmp_path, "quests.txt", make_quest_text(40))
+    
+    assert game_data.load_quests(path, use_cache=False, workers=2) == game_data.load_quests(path, use_cache=False)
+
+def test_parallel_load_duplicate_across_chunks(tmp_path):
+    """Test that a duplicate id in a different chunk is still caught"""
+    text = make_quest_text(40) + "\n" + make_quest_text(1)
+    path = write_file(tmp_path, "quests.txt", text)
+    with pytest.raises(InvalidDataFormatError, match="Duplicate quest id found"):
+        game_data.load_quests(path, use_cache=False, workers=2)
+
+# ============================================================================
+# RECORD SCHEMA TESTS
+# ============================================================================
+
+def test_parse_quest_block_converts_present_fields():
+    """Test that parse_quest_block keeps the id and converts typed fields"""
+    quest = game_data.parse_quest_block(["QUEST_ID: q1", "REWARD_XP: 40", "PREREQUISITE: none", ""])
+    
+    assert quest == {"QUEST_ID": "q1", "REWARD_XP": 40, "PREREQUISITE": None}
+
+def test_parse_item_block_rejects_line_without_separator():
+    """Test that the lenient parser still needs a key on every line"""
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block(["ITEM_ID: sword", "just some text"])
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block(["EFFECT: strength"])
+
+def test_validate_item_data_type_and_conversion():
+    """Test that item validation checks TYPE and converts text values"""
+    item = {"ITEM_ID": "x", "NAME": "X", "TYPE": "Weapon", "EFFECT": "strength:2", "COST": "10", "DESCRIPTION": "d"}
+    
+    assert game_data.validate_item_data(item) == True
+    assert item["COST"] == 10
+    assert item["EFFECT"] == ("strength", 2)
+    
+    item["TYPE"] = "shield"
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data(item)
+
+def test_new_record_type_schema():
+    """Test that a new record type only needs a schema"""
+    enemy_schema = game_data.RecordSchema("enemy", "ENEMY_ID", [
+        ("ENEMY_ID", "str"),
+        ("HEALTH", "int"),
+        ("LOOT", "optional"),
+    ])
+    
+    assert enemy_schema.build(["ENEMY_ID: goblin", "HEALTH: 50", "LOOT: NONE"]) == ("goblin", {"HEALTH": 50, "LOOT": None})
+    with pytest.raises(InvalidDataFormatError):
+        enemy_schema.build(["ENEMY_ID: goblin", "HEALTH: lots", "LOOT: NONE"])
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_catalog_watcher_reports_block_changes(tmp_path):
+    """Test that a reload updates the live dicts and reports what changed"""
+    import catalog_watcher
+    quests_path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    live_quests = {}
+    watcher = catalog_watcher.CatalogWatcher(quests_path, items_path, all_quests=live_quests)
+    first_steps = live_quests["first_steps"]
+    
+    assert watcher.poll() == {}
+    
+    new_text = QUEST_TEXT.replace("REWARD_GOLD: 75", "REWARD_GOLD: 80").replace("QUEST_ID: first_steps", "QUEST_ID: new_start")
+    write_file(tmp_path, "quests.txt", new_text)
+    os.utime(quests_path, ns=(1, 1))
+    changes = watcher.poll()
+    
+    assert changes["quests"] == catalog_watcher.CatalogChanges(["new_start"], ["first_steps"], ["goblin_hunter"])
+    assert watcher.all_quests is live_quests
+    assert live_quests["goblin_hunter"]["REWARD_GOLD"] == 80
+    assert "first_steps" not in live_quests
+
+def test_catalog_watcher_keeps_data_on_bad_edit(tmp_path):
+    """Test that a broken edit raises without touching the live data"""
+    import catalog_watcher
+    quests_path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    watcher = catalog_watcher.CatalogWatcher(quests_path, items_path)
+    
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: cheap"))
+    os.utime(items_path, ns=(1, 1))
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert watcher.all_items["health_potion"]["COST"] == 25
+
+def test_catalog_watcher_survives_vanished_file(tmp_path):
+    """Test that the polling thread keeps going when a file disappears mid-poll"""
+    import threading
+    import catalog_watcher
+    quests_path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    watcher = catalog_watcher.CatalogWatcher(quests_path, items_path)
+    errors = []
+    failed, reloaded = threading.Event(), threading.Event()
+    
+    # Deleted between has_changed() and reload()
+    os.remove(quests_path)
+    watcher.watched["quests"].has_changed = lambda: True
+    watcher.start(interval=0.01, on_change=lambda changes: reloaded.set(), on_error=lambda error: (errors.append(error), failed.set()))
+    try:
+        assert failed.wait(5)
+        assert isinstance(errors[0], MissingDataFileError)
+        write_file(tmp_path, "quests.txt", QUEST_TEXT)
+        assert reloaded.wait(5)
+        assert watcher._thread.is_alive()
+    finally:
+        watcher.stop()
+
+# ============================================================================
+# RECORD CLASS TESTS
+# ============================================================================
+
+def test_loaded_records_support_dict_access(tmp_path):
+    """Test that Quest and Item records read like the old dictionaries"""
+    quests_path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    quest = game_data.load_quests(quests_path)["goblin_hunter"]
+    item = game_data.load_items(items_path)["iron_sword"]
+    
+    assert quest['title'] == quest['TITLE'] == quest.title == "Goblin Hunter"
+    assert quest.get('prerequisite') == "first_steps"
+    assert quest.get('missing', 'default') == 'default'
+    assert 'quest_id' in quest and 'reward_xp' in quest
+    assert item['effect']['stat'] == item.effect.stat == "strength"
+    assert item['cost'] == 100
+    with pytest.raises(AttributeError):
+        item.cost = 1
+
+def test_records_share_interned_strings(tmp_path):
+    """Test that repeated values like item types are shared"""
+    items_path = write_file(tmp_path, "items.txt", ITEM_TEXT + "\n" + ITEM_TEXT.replace("ITEM_ID: ", "ITEM_ID: x_"))
+    items = game_data.load_items(items_path, use_cache=False)
+    
+    assert items["health_potion"].type is items["x_health_potion"].type
+    assert items["iron_sword"].effect.stat is items["x_iron_sword"].effect.stat
+
+def test_records_round_trip_through_cache(tmp_path):
+    """Test that records come back from the compiled cache unchanged"""
+    quests_path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    first_load = game_data.load_quests(quests_path)
+    second_load = game_data.load_quests(quests_path)
+    
+    assert second_load == first_load
+    assert type(second_load["first_steps"]).__name__ == "Quest"
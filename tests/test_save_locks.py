@@ -0,0 +1,196 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Lock Tests
+
+Covers lock_character and character_session, including several processes
+updating the same save at once.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import subprocess
+import pytest
+
+import character_manager
+from custom_exceptions import SaveLockTimeoutError
+from save_storage import FileSystemStorage
+
+pytestmark = pytest.mark.skipif(character_manager.fcntl is None, reason="save locks need fcntl")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def hold_lock(save_directory, exclusive, acquired, release):
+    """Hold a character's lock on another thread until release is set"""
+    # Shared locks use the lock file a writer made, so make it first
+    with character_manager.lock_character("Locked", save_directory):
+        pass
+    def run():
+        with character_manager.lock_character("Locked", save_directory, exclusive=exclusive):
+            acquired.set()
+            release.wait(5)
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert acquired.wait(5)
+    return thread
+
+@pytest.mark.parametrize("holder_exclusive, exclusive", [(True, True), (True, False), (False, True)])
+def test_conflicting_lock_times_out(tmp_path, holder_exclusive, exclusive):
+    acquired, release = threading.Event(), threading.Event()
+    thread = hold_lock(str(tmp_path), holder_exclusive, acquired, release)
+    try:
+        with pytest.raises(SaveLockTimeoutError):
+            with character_manager.lock_character("Locked", str(tmp_path), exclusive=exclusive, timeout=0.05):
+                pass
+    finally:
+        release.set()
+        thread.join()
+    with character_manager.lock_character("Locked", str(tmp_path), exclusive=exclusive, timeout=0.05):
+        pass
+
+def test_shared_lock_without_a_lock_file_creates_nothing(tmp_path):
+    with character_manager.lock_character("Locked", str(tmp_path), exclusive=False):
+        pass
+    assert os.listdir(tmp_path) == []
+
+def test_shared_locks_coexist(tmp_path):
+    acquired, release = threading.Event(), threading.Event()
+    thread = hold_lock(str(tmp_path), False, acquired, release)
+    try:
+        with character_manager.lock_character("Locked", str(tmp_path), exclusive=False, timeout=0.05):
+            pass
+    finally:
+        release.set()
+        thread.join()
+
+def test_lock_files_live_in_the_lock_folder(tmp_path):
+    hero = character_manager.create_character("Locked", "Mage")
+    character_manager.save_character(hero, str(tmp_path))
+    lock_path = character_manager.get_lock_path("Locked", str(tmp_path))
+    assert os.path.dirname(lock_path) == character_manager._shard_directory("locked", os.path.join(str(tmp_path), character_manager.LOCK_DIRECTORY))
+    assert os.path.basename(lock_path) == "locked.lock"
+    assert os.path.exists(lock_path)
+    assert sorted(os.listdir(tmp_path)) == [".locks", ".manifest", "locked_save.txt"]
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Locked"]
+    # Another spelling of the directory reaches the same lock, so nesting works
+    other_spelling = os.path.join(str(tmp_path), "..", tmp_path.name)
+    with character_manager.lock_character("Locked", str(tmp_path)):
+        with character_manager.lock_character("locked", other_spelling, timeout=0.05):
+            pass
+
+def test_deleting_saves_removes_their_lock_files(tmp_path):
+    directory = str(tmp_path)
+    storage = FileSystemStorage(directory)
+    for number in range(300):
+        hero = character_manager.create_character(f"Hero {number}", "Mage")
+        character_manager.save_character(hero, directory)
+        if number % 2:
+            character_manager.delete_character(hero["name"], directory)
+        else:
+            storage.delete(character_manager.get_save_key(hero["name"]))
+    lock_files = [name for _, _, names in os.walk(os.path.join(directory, character_manager.LOCK_DIRECTORY)) for name in names]
+    # Only the manifest's lock is left
+    assert lock_files == [os.path.basename(character_manager.get_lock_path(character_manager.MANIFEST_FILE, directory))]
+
+def test_waiter_relocks_after_the_lock_file_is_removed(tmp_path):
+    directory = str(tmp_path)
+    acquired, release = threading.Event(), threading.Event()
+    def wait_for_lock():
+        with character_manager.lock_character("Locked", directory):
+            acquired.set()
+            release.wait(5)
+    with character_manager.lock_character("Locked", directory):
+        thread = threading.Thread(target=wait_for_lock)
+        thread.start()
+        # Give the waiter time to open the old lock file
+        time.sleep(0.2)
+        character_manager.discard_lock_file("Locked", directory)
+    try:
+        assert acquired.wait(5)
+        # The waiter holds the lock at the current path, not the removed file
+        with pytest.raises(SaveLockTimeoutError):
+            with character_manager.lock_character("Locked", directory, timeout=0.05):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+def test_bulk_operations_report_locked_saves(tmp_path, monkeypatch):
+    monkeypatch.setattr(character_manager, "SAVE_LOCK_TIMEOUT", 0.05)
+    directory = str(tmp_path)
+    for name in ("Locked", "Free"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"), directory)
+    character_manager.character_cache.clear()
+    acquired, release = threading.Event(), threading.Event()
+    thread = hold_lock(directory, True, acquired, release)
+    try:
+        result = character_manager.load_characters(["Locked", "Free"], directory)
+    finally:
+        release.set()
+        thread.join()
+    assert list(result.succeeded) == ["Free"]
+    assert isinstance(result.failed["Locked"], SaveLockTimeoutError)
+
+def test_session_saves_on_exit(tmp_path):
+    character_manager.save_character(character_manager.create_character("Session Hero", "Warrior"), str(tmp_path))
+    with character_manager.character_session("Session Hero", str(tmp_path)) as hero:
+        character_manager.add_gold(hero, 40)
+        # Loads and saves inside the session reuse its lock
+        assert character_manager.load_character("Session Hero", str(tmp_path))["gold"] == 100
+        character_manager.save_character(hero, str(tmp_path))
+        hero["gold"] += 1
+    assert character_manager.load_character("Session Hero", str(tmp_path))["gold"] == 141
+
+def test_session_skips_save_on_error(tmp_path):
+    character_manager.save_character(character_manager.create_character("Session Hero", "Warrior"), str(tmp_path))
+    with pytest.raises(ValueError):
+        with character_manager.character_session("Session Hero", str(tmp_path)) as hero:
+            hero["gold"] = 999
+            raise ValueError("quest failed")
+    assert character_manager.load_character("Session Hero", str(tmp_path))["gold"] == 100
+    # The lock was released
+    with character_manager.lock_character("Session Hero", str(tmp_path), timeout=0.05):
+        pass
+
+def test_sessions_in_several_processes_keep_every_update(tmp_path):
+    character_manager.save_character(character_manager.create_character("Shared Hero", "Rogue"), str(tmp_path))
+    script = (
+        "import sys, character_manager\n"
+        "for _ in range(25):\n"
+        "    with character_manager.character_session('Shared Hero', sys.argv[1]) as hero:\n"
+        "        hero['gold'] += 1\n"
+    )
+    workers = [
+        subprocess.Popen([sys.executable, "-c", script, str(tmp_path)], cwd=REPO_ROOT)
+        for _ in range(4)
+    ]
+    assert [worker.wait(60) for worker in workers] == [0] * 4
+    character_manager.character_cache.clear()
+    assert character_manager.load_character("Shared Hero", str(tmp_path))["gold"] == 100 + 4 * 25
+
+def test_reads_work_in_a_read_only_save_directory():
+    # A directory saved to before lock files and the manifest existed,
+    # then made read-only; root ignores permissions, so read as nobody
+    directory = tempfile.mkdtemp()
+    try:
+        character_manager.save_character(character_manager.create_character("Reader", "Cleric"), directory)
+        shutil.rmtree(os.path.join(directory, character_manager.LOCK_DIRECTORY))
+        os.remove(character_manager.get_manifest_path(directory))
+        os.chmod(directory, 0o555)
+        script = (
+            "import sys, character_manager\n"
+            "print(character_manager.load_character('Reader', sys.argv[1])['name'])\n"
+            "print(character_manager.list_saved_characters(sys.argv[1]))\n"
+        )
+        user = "nobody" if os.geteuid() == 0 else None
+        result = subprocess.run([sys.executable, "-c", script, directory], cwd=REPO_ROOT,
+                                user=user, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split("\n")[:2] == ["Reader", "['Reader']"]
+        assert sorted(os.listdir(directory)) == ["reader_save.txt"]
+    finally:
+        os.chmod(directory, 0o755)
+        shutil.rmtree(directory)
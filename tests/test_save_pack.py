@@ -0,0 +1,90 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Pack Tests
+
+Covers the single-file pack format: the on-disk index, repacking, and
+packing/unpacking a save directory.
+"""
+
+import os
+import pytest
+
+import character_manager
+import save_pack
+from save_pack import PackStorage
+from custom_exceptions import SaveFileCorruptedError
+
+def make_heroes(count=30):
+    heroes = []
+    for number in range(count):
+        hero = character_manager.create_character(f"Packed {number:03d}", ["Warrior", "Mage"][number % 2])
+        hero["gold"] = number
+        heroes.append(hero)
+    return heroes
+
+def test_index_survives_reopen_and_binary_search(tmp_path):
+    pack_path = str(tmp_path / "saves.pack")
+    heroes = make_heroes()
+    with PackStorage(pack_path) as pack:
+        for hero in reversed(heroes):
+            character_manager.save_character(hero, storage=pack)
+    with PackStorage(pack_path) as pack:
+        assert len(pack) == 30
+        assert [key for key, data in pack.scan()] == sorted(character_manager.get_save_key(hero["name"]) for hero in heroes)
+        for hero in heroes:
+            assert character_manager.load_character(hero["name"], storage=pack) == hero
+        assert not pack.exists("packed_999")
+
+def test_unflushed_changes_are_lost_on_crash(tmp_path):
+    pack_path = str(tmp_path / "saves.pack")
+    heroes = make_heroes(3)
+    with PackStorage(pack_path) as pack:
+        character_manager.save_character(heroes[0], storage=pack)
+    pack = PackStorage(pack_path)
+    character_manager.save_character(heroes[1], storage=pack)
+    assert pack.exists("packed_001")
+    pack._file.flush()
+    # Simulate a crash: reopen without flush()/close()
+    with PackStorage(pack_path) as reopened:
+        assert reopened.list() == ["Packed 000"]
+    pack._map.close()
+    pack._file.close()
+
+def test_repack_reclaims_replaced_and_deleted_records(tmp_path):
+    pack_path = str(tmp_path / "saves.pack")
+    heroes = make_heroes(10)
+    with PackStorage(pack_path) as pack:
+        for round_number in range(5):
+            for hero in heroes:
+                hero["gold"] += 1
+                character_manager.save_character(hero, storage=pack)
+            pack.flush()
+        for hero in heroes[5:]:
+            character_manager.delete_character(hero["name"], storage=pack)
+        pack.flush()
+        dead_bytes = pack.dead_bytes()
+        size_before = os.path.getsize(pack_path)
+        assert pack.repack() == dead_bytes > 0
+        assert os.path.getsize(pack_path) == size_before - dead_bytes
+        assert pack.dead_bytes() == 0
+    with PackStorage(pack_path) as pack:
+        assert len(pack) == 5
+        assert character_manager.load_character("Packed 004", storage=pack) == heroes[4]
+
+def test_pack_and_unpack_save_directory(tmp_path):
+    source, restored, pack_path = str(tmp_path / "source"), str(tmp_path / "restored"), str(tmp_path / "saves.pack")
+    heroes = make_heroes(12)
+    character_manager.save_characters(heroes, source)
+    with open(os.path.join(source, "broken_save.txt"), 'w') as file:
+        file.write("not a save")
+    result = save_pack.pack_save_directory(source, pack_path, "binary")
+    assert len(result.succeeded) == 12 and list(result.failed) == ["broken"]
+    assert save_pack.unpack_save_directory(pack_path, restored).ok
+    assert sorted(character_manager.list_saved_characters(restored)) == sorted(hero["name"] for hero in heroes)
+    assert character_manager.load_character("Packed 011", restored) == heroes[11]
+
+def test_not_a_pack(tmp_path):
+    bogus = tmp_path / "bogus.pack"
+    bogus.write_bytes(b"definitely not a pack file at all")
+    with pytest.raises(SaveFileCorruptedError):
+        PackStorage(str(bogus))
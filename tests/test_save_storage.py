@@ -0,0 +1,109 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Storage Tests
+
+Runs the same save/load/list/delete checks against every storage backend.
+"""
+
+import os
+import pytest
+
+import character_manager
+import quest_handler
+from save_storage import FileSystemStorage, MemoryStorage, SQLiteStorage
+from save_pack import PackStorage
+from custom_exceptions import CharacterNotFoundError
+
+@pytest.fixture(params=["filesystem", "memory", "sqlite", "pack"])
+def storage(request, tmp_path):
+    if request.param == "filesystem":
+        backend = FileSystemStorage(str(tmp_path / "saves"))
+    elif request.param == "memory":
+        backend = MemoryStorage()
+    elif request.param == "sqlite":
+        backend = SQLiteStorage(str(tmp_path / "characters.db"))
+    else:
+        backend = PackStorage(str(tmp_path / "saves.pack"))
+    yield backend
+    backend.close()
+
+def make_party():
+    party = []
+    for number, character_class in enumerate(["Warrior", "Mage", "Mage", "Rogue"]):
+        hero = character_manager.create_character(f"Hero {number}", character_class)
+        hero["level"] = number * 5 + 1
+        hero["inventory"] = ["health_potion"] * number
+        party.append(hero)
+    return party
+
+def test_round_trip_list_and_delete(storage):
+    party = make_party()
+    for hero in party:
+        character_manager.save_character(hero, storage=storage, save_format="binary")
+    assert character_manager.load_character("hero 2", storage=storage) == party[2]
+    assert sorted(character_manager.list_saved_characters(storage=storage)) == [hero["name"] for hero in party]
+    assert sorted(key for key, data in storage.scan()) == ["hero_0", "hero_1", "hero_2", "hero_3"]
+
+    character_manager.delete_character("Hero 1", storage=storage)
+    assert not storage.exists("hero_1")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Hero 1", storage=storage)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Hero 1", storage=storage)
+
+def test_summaries_filter(storage):
+    for hero in make_party():
+        character_manager.save_character(hero, storage=storage)
+    mages = character_manager.list_character_summaries(character_class="Mage", min_level=10, storage=storage)
+    assert [(summary["name"], summary["level"]) for summary in mages] == [("Hero 2", 11)]
+
+def test_default_storage_keeps_game_flow_off_disk(tmp_path):
+    storage = MemoryStorage()
+    previous = character_manager.set_default_storage(storage)
+    try:
+        hero = character_manager.create_character("Memory Hero", "Cleric")
+        quests = {"q1": {"title": "Q", "reward_xp": 150, "reward_gold": 10, "required_level": 1, "prerequisite": "NONE"}}
+        quest_handler.accept_quest(hero, "q1", quests)
+        quest_handler.complete_quest(hero, "q1", quests)
+        character_manager.save_character(hero, str(tmp_path))
+        assert character_manager.load_character("Memory Hero", str(tmp_path))["level"] == 2
+        assert os.listdir(tmp_path) == []
+    finally:
+        character_manager.set_default_storage(previous)
+    assert character_manager.get_default_storage() is previous
+
+def test_filesystem_storage_matches_save_directory(tmp_path):
+    directory = str(tmp_path)
+    hero = make_party()[1]
+    FileSystemStorage(directory).put("hero_1", character_manager.encode_save(hero), hero)
+    assert character_manager.load_character("Hero 1", directory) == hero
+    assert character_manager.list_saved_characters(directory) == ["Hero 1"]
+
+def test_filesystem_storage_replays_journals(tmp_path):
+    directory = str(tmp_path)
+    hero = make_party()[1]
+    character_manager.enable_journal(hero, directory, save_format="binary", background=False)
+    character_manager.add_gold(hero, 25)
+    character_manager.journal_append(hero, "inventory", "iron_sword")
+    storage = FileSystemStorage(directory)
+    assert character_manager.load_character("Hero 1", storage=storage) == character_manager.load_character("Hero 1", directory) == hero
+    assert storage.get("hero_1").startswith(character_manager.BINARY_MAGIC)
+    assert dict(storage.scan())["hero_1"] == storage.get("hero_1")
+    character_manager.disable_journal(hero)
+
+def test_incomplete_backend_cannot_be_created():
+    from save_storage import SaveStorage
+
+    class GetOnlyStorage(SaveStorage):
+        def get(self, key):
+            raise KeyError(key)
+
+    with pytest.raises(TypeError):
+        GetOnlyStorage()
+
+def test_filesystem_storage_manifest_uses_the_given_key(tmp_path):
+    directory = str(tmp_path)
+    hero = make_party()[1]
+    FileSystemStorage(directory).put("renamed_hero", character_manager.encode_save(hero), hero)
+    assert list(character_manager.read_manifest(directory)) == ["renamed_hero"]
+    assert os.path.exists(character_manager.get_save_path("renamed_hero", directory))
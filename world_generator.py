@@ -0,0 +1,226 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+World Generator Module
+
+This module writes large, valid game worlds for scale testing:
+- quests.txt with prerequisite chains, wide fan-outs and deep trees
+- items.txt with weapons, armor and consumables
+- character save files in the character_manager.save_character format
+
+Everything is driven by a seed, so the same arguments always produce the
+same files and benchmark runs can be compared.
+
+Usage:
+    python world_generator.py --quests 100000 --items 5000 --characters 1000 --output build/world
+"""
+
+import os
+import random
+import argparse
+from array import array
+
+import character_manager
+from inventory_system import MAX_INVENTORY_SIZE
+
+QUEST_SHAPES = ["chain", "fan", "tree"]
+CHARACTER_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+# item type → stats its effect can change
+ITEM_STATS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health"],
+    "consumable": ["health", "magic"]
+}
+MAX_QUEST_LEVEL = 50
+# Quests per prerequisite group before a new chain/fan/tree is started
+GROUP_SIZE = 200
+
+# ============================================================================
+# QUESTS
+# ============================================================================
+
+def quest_id_for(number):
+    """Quest id used for the quest at position number"""
+    return f"quest_{number:07d}"
+
+def item_id_for(number):
+    """Item id used for the item at position number"""
+    return f"item_{number:06d}"
+
+def generate_quest_parents(count, seed=163, shape="mixed"):
+    """
+    Decide each quest's prerequisite
+
+    Quests are made in groups of GROUP_SIZE. The first quest of a group
+    has no prerequisite and the rest hang off it as:
+    - chain: each quest needs the one before it
+    - fan: every quest needs the group's first quest
+    - tree: each quest needs a random recent quest (deep, branching)
+    shape="mixed" rotates through all three.
+
+    Returns: array of parent positions (-1 for no prerequisite)
+    """
+    rng = random.Random(f"{seed}-quest-parents")
+    parents = array('l')
+    for number in range(count):
+        group_start = number - number % GROUP_SIZE
+        if shape == "mixed":
+            group_shape = QUEST_SHAPES[(number // GROUP_SIZE) % len(QUEST_SHAPES)]
+        else:
+            group_shape = shape
+        if number == group_start:
+            parents.append(-1)
+        elif group_shape == "chain":
+            parents.append(number - 1)
+        elif group_shape == "fan":
+            parents.append(group_start)
+        else:
+            # Favour recent quests so trees grow deep, not just wide
+            back = min(int(rng.expovariate(0.5)), number - group_start - 1)
+            parents.append(number - 1 - back)
+    return parents
+
+def write_quests(filename, count, seed=163, shape="mixed"):
+    """
+    Write count quests in the quests.txt format
+
+    Returns: array of parent positions (see generate_quest_parents)
+    """
+    rng = random.Random(f"{seed}-quests")
+    parents = generate_quest_parents(count, seed, shape)
+    levels = array('l')
+    with open(filename, 'w') as file:
+        for number in range(count):
+            parent = parents[number]
+            if parent < 0:
+                level = rng.randint(1, 5)
+                prerequisite = "NONE"
+            else:
+                level = min(levels[parent] + rng.randint(0, 1), MAX_QUEST_LEVEL)
+                prerequisite = quest_id_for(parent)
+            levels.append(level)
+            if number:
+                file.write("\n")
+            file.write(
+                f"QUEST_ID: {quest_id_for(number)}\n"
+                f"TITLE: Quest {number}\n"
+                f"DESCRIPTION: Generated quest {number} for level {level} adventurers.\n"
+                f"REWARD_XP: {level * rng.randint(20, 60)}\n"
+                f"REWARD_GOLD: {level * rng.randint(5, 30)}\n"
+                f"REQUIRED_LEVEL: {level}\n"
+                f"PREREQUISITE: {prerequisite}\n"
+            )
+    return parents
+
+# ============================================================================
+# ITEMS
+# ============================================================================
+
+def write_items(filename, count, seed=163):
+    """Write count items in the items.txt format"""
+    rng = random.Random(f"{seed}-items")
+    item_types = list(ITEM_STATS)
+    with open(filename, 'w') as file:
+        for number in range(count):
+            item_type = item_types[number % len(item_types)]
+            stat_name = rng.choice(ITEM_STATS[item_type])
+            value = rng.randint(1, 50)
+            if number:
+                file.write("\n")
+            file.write(
+                f"ITEM_ID: {item_id_for(number)}\n"
+                f"NAME: Generated {item_type.title()} {number}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {stat_name}:{value}\n"
+                f"COST: {value * rng.randint(2, 10)}\n"
+                f"DESCRIPTION: A generated {item_type} that adds {value} {stat_name}.\n"
+            )
+
+# ============================================================================
+# CHARACTERS
+# ============================================================================
+
+def generate_character(number, rng, quest_parents, item_count):
+    """
+    Build one random but valid character
+
+    Completed quests follow a real prerequisite chain, and the active quest
+    (if any) is the next quest on it.
+    """
+    character = character_manager.create_character(f"Hero{number:06d}", rng.choice(CHARACTER_CLASSES))
+    level = rng.randint(1, MAX_QUEST_LEVEL)
+    character["level"] = level
+    character["experience"] = (level - 1) * 100 + rng.randint(0, 99)
+    character["max_health"] += (level - 1) * 10
+    character["health"] = rng.randint(1, character["max_health"])
+    character["strength"] += (level - 1) * 2
+    character["magic"] += (level - 1) * 2
+    character["gold"] = rng.randint(0, 5000)
+    if item_count:
+        inventory_size = rng.randint(0, MAX_INVENTORY_SIZE)
+        character["inventory"] = [item_id_for(rng.randrange(item_count)) for slot in range(inventory_size)]
+    if quest_parents:
+        chain = []
+        quest_number = rng.randrange(len(quest_parents))
+        while quest_number >= 0:
+            chain.append(quest_id_for(quest_number))
+            quest_number = quest_parents[quest_number]
+        chain.reverse()
+        done = rng.randint(0, len(chain))
+        character["completed_quests"] = chain[:done]
+        character["active_quests"] = chain[done:done + 1]
+    return character
+
+def write_characters(save_directory, count, quest_parents, item_count, seed=163, save_layout="flat"):
+    """Save count generated characters with character_manager.save_character"""
+    rng = random.Random(f"{seed}-characters")
+    if save_layout != "flat":
+        character_manager.migrate_save_layout(save_directory, save_layout)
+    for number in range(count):
+        character = generate_character(number, rng, quest_parents, item_count)
+        character_manager.save_character(character, save_directory)
+
+# ============================================================================
+# WORLD
+# ============================================================================
+
+def generate_world(output_directory, quest_count, item_count, character_count=0, seed=163, shape="mixed", save_layout="flat"):
+    """
+    Write a complete world into output_directory
+
+    Creates quests.txt, items.txt and (if character_count) save_games/,
+    using save_layout ("flat" or "sharded") for the saves.
+
+    Returns: Dictionary of the paths written
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    paths = {
+        "quests": os.path.join(output_directory, "quests.txt"),
+        "items": os.path.join(output_directory, "items.txt"),
+        "save_games": os.path.join(output_directory, "save_games")
+    }
+    quest_parents = write_quests(paths["quests"], quest_count, seed, shape)
+    write_items(paths["items"], item_count, seed)
+    if character_count:
+        write_characters(paths["save_games"], character_count, quest_parents, item_count, seed, save_layout)
+    return paths
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a large Quest Chronicles world for scale testing.")
+    parser.add_argument("--quests", type=int, default=10000, help="number of quests to write")
+    parser.add_argument("--items", type=int, default=1000, help="number of items to write")
+    parser.add_argument("--characters", type=int, default=0, help="number of character saves to write")
+    parser.add_argument("--seed", type=int, default=163, help="random seed (same seed, same world)")
+    parser.add_argument("--shape", choices=["mixed"] + QUEST_SHAPES, default="mixed", help="prerequisite graph shape")
+    parser.add_argument("--save-layout", choices=character_manager.SAVE_LAYOUTS, default="flat", help="save directory layout")
+    parser.add_argument("--output", default="build/world", help="directory to write the world into")
+    args = parser.parse_args(argv)
+
+    paths = generate_world(args.output, args.quests, args.items, args.characters, args.seed, args.shape, args.save_layout)
+    print(f"Wrote {args.quests} quests to {paths['quests']}")
+    print(f"Wrote {args.items} items to {paths['items']}")
+    if args.characters:
+        print(f"Wrote {args.characters} characters to {paths['save_games']}")
+
+if __name__ == "__main__":
+    main()